@@ -1,11 +1,12 @@
 """Azure OpenAI agent with tool calling support."""
 
 import json
-from typing import Optional, Generator, Callable
+from typing import Any, Optional, Generator, Callable
 
 from openai import AzureOpenAI
 from rich.console import Console
 
+from .history import SUMMARY_PROMPT, HistoryManager, format_transcript
 from .models import ChatMessage, TokenResult
 from .mcp_client import MCPManager
 
@@ -13,6 +14,94 @@ from .mcp_client import MCPManager
 console = Console()
 
 
+def tool_call_dicts(tool_calls: list) -> list[dict]:
+    """Convert the tool calls of a completion message to conversation dicts."""
+    return [
+        {
+            "id": tc.id,
+            "type": "function",
+            "function": {
+                "name": tc.function.name,
+                "arguments": tc.function.arguments
+            }
+        }
+        for tc in tool_calls
+    ]
+
+
+def merge_tool_call_deltas(tool_calls: dict[int, dict], deltas: Optional[list]) -> None:
+    """Accumulate streamed ``delta.tool_calls`` fragments into complete tool calls.
+    
+    Args:
+        tool_calls: Tool calls assembled so far, keyed by index (updated in place)
+        deltas: Tool call fragments of one stream chunk
+    """
+    # Arguments (and occasionally names) arrive in fragments
+    for fragment in deltas or []:
+        tool_call = tool_calls.setdefault(fragment.index, {
+            "id": "",
+            "type": "function",
+            "function": {"name": "", "arguments": ""}
+        })
+        if fragment.id:
+            tool_call["id"] = fragment.id
+        if fragment.function:
+            if fragment.function.name:
+                tool_call["function"]["name"] += fragment.function.name
+            if fragment.function.arguments:
+                tool_call["function"]["arguments"] += fragment.function.arguments
+
+
+def parse_tool_calls(tool_calls: list[dict]) -> tuple[list[Any], list[tuple[int, str, dict]]]:
+    """Decode the arguments of an assistant message's tool calls.
+    
+    Args:
+        tool_calls: Tool calls of the assistant message
+        
+    Returns:
+        Tuple of (results, with an error message for each call whose
+        arguments are not valid JSON, and (index, tool name, arguments)
+        for each call to execute)
+    """
+    results: list[Any] = [None] * len(tool_calls)
+    pending: list[tuple[int, str, dict]] = []
+    for i, tool_call in enumerate(tool_calls):
+        tool_name = tool_call["function"]["name"]
+        console.print(f"[dim]Calling tool: {tool_name}[/dim]")
+        try:
+            tool_args = json.loads(tool_call["function"]["arguments"] or "{}")
+        except json.JSONDecodeError as e:
+            results[i] = f"Invalid tool arguments: {e}"
+        else:
+            pending.append((i, tool_name, tool_args))
+    return results, pending
+
+
+def tool_messages(tool_calls: list[dict], results: list[Any]) -> list[ChatMessage]:
+    """Build the tool result messages for an assistant message's tool calls.
+    
+    Args:
+        tool_calls: Tool calls of the assistant message
+        results: Result of each call, in the same order (None if it failed)
+        
+    Returns:
+        One ``tool`` message per call, in tool call order
+    """
+    messages = []
+    for tool_call, result in zip(tool_calls, results):
+        if result is None:
+            result = "Tool execution failed"
+        elif not isinstance(result, str):
+            result = json.dumps(result, indent=2)
+        messages.append(ChatMessage(
+            role="tool",
+            content=result,
+            tool_call_id=tool_call["id"],
+            name=tool_call["function"]["name"]
+        ))
+    return messages
+
+
 class Agent:
     """Interactive AI agent using Azure OpenAI with MCP tool support."""
     
@@ -34,6 +123,8 @@ Be concise but thorough in your responses."""
         token: Optional[TokenResult] = None,
         token_provider: Optional[Callable[[], Optional[str]]] = None,
         mcp_manager: Optional[MCPManager] = None,
+        history_token_budget: Optional[int] = None,
+        summary_deployment: Optional[str] = None,
     ):
         """Initialize the agent.
         
@@ -45,12 +136,21 @@ Be concise but thorough in your responses."""
             token: Static token result (for simple Entra auth)
             token_provider: Callable that returns a fresh token (for OBO with refresh)
             mcp_manager: MCP manager for tool access
+            history_token_budget: Estimated prompt tokens above which older
+                history is compacted (None for unlimited)
+            summary_deployment: Deployment that summarizes compacted history
+                (defaults to ``deployment``)
         """
         self.endpoint = endpoint
         self.deployment = deployment
         self.api_version = api_version
+        self.summary_deployment = summary_deployment
         self.mcp_manager = mcp_manager or MCPManager()
         self._conversation: list[ChatMessage] = []
+        self._history = HistoryManager(token_budget=history_token_budget)
+        
+        # Wire form of _conversation, extended as messages are appended
+        self._messages: list[dict] = []
         
         # Store auth configuration
         self._api_key = api_key
@@ -75,16 +175,14 @@ Be concise but thorough in your responses."""
                 api_version=self.api_version,
             )
         elif self._token_provider:
-            # Use token provider for dynamic token retrieval (OBO)
-            token = self._token_provider()
-            if token:
-                return AzureOpenAI(
-                    azure_endpoint=self.endpoint,
-                    azure_ad_token=token,
-                    api_version=self.api_version,
-                )
-            else:
-                raise ValueError("Token provider returned None")
+            # Use token provider for dynamic token retrieval (OBO). The SDK
+            # calls it before every request, so cached tokens are served from
+            # memory and refreshed by the provider without recreating the client.
+            return AzureOpenAI(
+                azure_endpoint=self.endpoint,
+                azure_ad_token_provider=self._token_provider,
+                api_version=self.api_version,
+            )
         elif self._token:
             # Use static token
             return AzureOpenAI(
@@ -96,9 +194,9 @@ Be concise but thorough in your responses."""
             raise ValueError("No authentication method provided")
     
     def refresh_client(self) -> None:
-        """Refresh the OpenAI client with a new token.
+        """Recreate the OpenAI client with the current credentials.
         
-        Call this if using token_provider and the token may have expired.
+        Not needed with a token_provider, which is called per request.
         """
         self._client = self._create_client()
     
@@ -123,6 +221,93 @@ Be concise but thorough in your responses."""
     def clear_history(self) -> None:
         """Clear conversation history (keeps system prompt)."""
         self._conversation = [self._conversation[0]]
+        self._messages = []
+    
+    def _sync_messages(self) -> list[dict]:
+        """Get the wire-form messages of the conversation.
+        
+        _conversation is append-only between compactions, so only messages
+        appended since the previous request are serialized; a compaction
+        rebuilds the list from the (memoized) message dicts.
+        
+        Returns:
+            Messages for the chat completions API
+        """
+        if len(self._messages) > len(self._conversation):
+            self._messages = []
+        self._messages.extend(msg.to_dict() for msg in self._conversation[len(self._messages):])
+        return self._messages
+    
+    def _summarize(self, messages: list[ChatMessage]) -> Optional[str]:
+        """Summarize messages being compacted out of the history.
+        
+        Args:
+            messages: Oldest turns of the conversation
+            
+        Returns:
+            Summary text, or None if summarization failed (the turns are dropped)
+        """
+        try:
+            response = self._client.chat.completions.create(
+                model=self.summary_deployment or self.deployment,
+                messages=[
+                    {"role": "system", "content": SUMMARY_PROMPT},
+                    {"role": "user", "content": format_transcript(messages)},
+                ],
+            )
+        except Exception as e:
+            console.print(f"[dim]Warning: Could not summarize conversation history: {e}[/dim]")
+            return None
+        return response.choices[0].message.content
+    
+    def _create_completion(self, tools: list[dict], stream: bool = False):
+        """Request a completion for the current conversation.
+        
+        The history is first compacted to the token budget, so every round
+        of the tool loop sends a bounded request.
+        
+        Args:
+            tools: Tool definitions in OpenAI format (may be empty)
+            stream: Return a stream of chunks instead of a complete response
+            
+        Returns:
+            ChatCompletion, or a Stream of ChatCompletionChunk if streaming
+        """
+        if self._history.compact(self._conversation, self._summarize):
+            self._messages = []
+        messages = self._sync_messages()
+        if tools:
+            return self._client.chat.completions.create(
+                model=self.deployment,
+                messages=messages,
+                tools=tools,
+                tool_choice="auto",
+                stream=stream,
+            )
+        return self._client.chat.completions.create(
+            model=self.deployment,
+            messages=messages,
+            stream=stream,
+        )
+    
+    def _run_tool_calls(self, tool_calls: list[dict]) -> None:
+        """Execute tool calls concurrently and add their results to the conversation.
+        
+        Results are appended in the order of ``tool_calls``, whatever order
+        the calls finish in.
+        
+        Args:
+            tool_calls: Tool calls of the preceding assistant message
+        """
+        results, pending = parse_tool_calls(tool_calls)
+        
+        # Call the tools
+        outcomes = self.mcp_manager.call_tools([(name, args) for _, name, args in pending])
+        for (i, _, _), outcome in zip(pending, outcomes):
+            results[i] = outcome
+        
+        # Add tool results to conversation
+        self._conversation.extend(tool_messages(tool_calls, results))
     
     def chat(self, user_message: str) -> str:
         """Send a message and get a response.
@@ -142,23 +327,9 @@ Be concise but thorough in your responses."""
         tools = self.mcp_manager.get_openai_tools() if self.mcp_manager else []
         
         while True:
-            # Prepare messages for API
-            messages = [msg.to_dict() for msg in self._conversation]
-            
             # Call Azure OpenAI
             try:
-                if tools:
-                    response = self._client.chat.completions.create(
-                        model=self.deployment,
-                        messages=messages,
-                        tools=tools,
-                        tool_choice="auto",
-                    )
-                else:
-                    response = self._client.chat.completions.create(
-                        model=self.deployment,
-                        messages=messages,
-                    )
+                response = self._create_completion(tools)
             except Exception as e:
                 error_msg = f"Error calling Azure OpenAI: {e}"
                 console.print(f"[red]{error_msg}[/red]")
@@ -169,45 +340,15 @@ Be concise but thorough in your responses."""
             
             # Check if the assistant wants to call tools
             if assistant_message.tool_calls:
-                # Add assistant message with tool calls
+                tool_calls = tool_call_dicts(assistant_message.tool_calls)
+                
+                # Add assistant message with tool calls, then their results
                 self._conversation.append(ChatMessage(
                     role="assistant",
                     content=assistant_message.content,
-                    tool_calls=[
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        }
-                        for tc in assistant_message.tool_calls
-                    ]
+                    tool_calls=tool_calls
                 ))
-                
-                # Execute each tool call
-                for tool_call in assistant_message.tool_calls:
-                    tool_name = tool_call.function.name
-                    tool_args = json.loads(tool_call.function.arguments)
-                    
-                    console.print(f"[dim]Calling tool: {tool_name}[/dim]")
-                    
-                    # Call the tool
-                    result = self.mcp_manager.call_tool(tool_name, tool_args)
-                    
-                    if result is None:
-                        result = "Tool execution failed"
-                    elif not isinstance(result, str):
-                        result = json.dumps(result, indent=2)
-                    
-                    # Add tool result to conversation
-                    self._conversation.append(ChatMessage(
-                        role="tool",
-                        content=result,
-                        tool_call_id=tool_call.id,
-                        name=tool_name
-                    ))
+                self._run_tool_calls(tool_calls)
                 
                 # Continue the loop to get the final response
                 continue
@@ -221,10 +362,13 @@ Be concise but thorough in your responses."""
             return content
     
     def chat_stream(self, user_message: str) -> Generator[str, None, None]:
-        """Send a message and stream the response.
+        """Send a message and stream the response, including tool calls.
         
-        Note: Streaming doesn't support tool calls in this simplified version.
-        For tool calls, use chat() instead.
+        Text is yielded as it arrives. Tool call fragments
+        (``delta.tool_calls``) are accumulated by index; once the model
+        finishes a round, the completed calls are executed and the
+        follow-up completion is streamed in turn, until the model answers
+        without calling tools.
         
         Args:
             user_message: User's message
@@ -235,28 +379,50 @@ Be concise but thorough in your responses."""
         # Add user message
         self._conversation.append(ChatMessage(role="user", content=user_message))
         
-        messages = [msg.to_dict() for msg in self._conversation]
+        # Get available tools
+        tools = self.mcp_manager.get_openai_tools() if self.mcp_manager else []
         
-        try:
-            response = self._client.chat.completions.create(
-                model=self.deployment,
-                messages=messages,
-                stream=True,
-            )
+        while True:
+            content_parts: list[str] = []
+            tool_calls: dict[int, dict] = {}
+            
+            try:
+                response = self._create_completion(tools, stream=True)
+                
+                for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield delta.content
+                    
+                    merge_tool_call_deltas(tool_calls, delta.tool_calls)
+            except Exception as e:
+                error_msg = f"Error: {e}"
+                yield error_msg
+                return
             
-            full_response = ""
-            for chunk in response:
-                if chunk.choices and chunk.choices[0].delta.content:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
-                    yield content
+            content = "".join(content_parts)
             
-            # Add to conversation
-            self._conversation.append(ChatMessage(role="assistant", content=full_response))
+            if tool_calls:
+                ordered_calls = [tool_calls[index] for index in sorted(tool_calls)]
+                self._conversation.append(ChatMessage(
+                    role="assistant",
+                    content=content or None,
+                    tool_calls=ordered_calls
+                ))
+                self._run_tool_calls(ordered_calls)
+                
+                # Separate this round's text from the follow-up
+                if content:
+                    yield "\n\n"
+                continue
             
-        except Exception as e:
-            error_msg = f"Error: {e}"
-            yield error_msg
+            # Add to conversation
+            self._conversation.append(ChatMessage(role="assistant", content=content))
+            return
 
 
 def create_agent_with_api_key(
@@ -265,6 +431,8 @@ def create_agent_with_api_key(
     api_key: str,
     api_version: str = "2024-02-15-preview",
     mcp_manager: Optional[MCPManager] = None,
+    history_token_budget: Optional[int] = None,
+    summary_deployment: Optional[str] = None,
 ) -> Agent:
     """Create an agent using API key authentication.
     
@@ -274,6 +442,8 @@ def create_agent_with_api_key(
         api_key: Azure OpenAI API key
         api_version: API version
         mcp_manager: Optional MCP manager
+        history_token_budget: Prompt token budget of the conversation history
+        summary_deployment: Deployment that summarizes compacted history
         
     Returns:
         Configured Agent instance
@@ -284,6 +454,8 @@ def create_agent_with_api_key(
         api_version=api_version,
         api_key=api_key,
         mcp_manager=mcp_manager,
+        history_token_budget=history_token_budget,
+        summary_deployment=summary_deployment,
     )
 
 
@@ -293,6 +465,8 @@ def create_agent_with_obo_token(
     token: TokenResult,
     api_version: str = "2024-02-15-preview",
     mcp_manager: Optional[MCPManager] = None,
+    history_token_budget: Optional[int] = None,
+    summary_deployment: Optional[str] = None,
 ) -> Agent:
     """Create an agent using an OBO token for Azure OpenAI.
     
@@ -302,6 +476,8 @@ def create_agent_with_obo_token(
         token: OBO token (T2) for Azure Cognitive Services
         api_version: API version
         mcp_manager: Optional MCP manager
+        history_token_budget: Prompt token budget of the conversation history
+        summary_deployment: Deployment that summarizes compacted history
         
     Returns:
         Configured Agent instance
@@ -312,6 +488,8 @@ def create_agent_with_obo_token(
         api_version=api_version,
         token=token,
         mcp_manager=mcp_manager,
+        history_token_budget=history_token_budget,
+        summary_deployment=summary_deployment,
     )
 
 
@@ -321,6 +499,8 @@ def create_agent_with_token_provider(
     token_provider: Callable[[], Optional[str]],
     api_version: str = "2024-02-15-preview",
     mcp_manager: Optional[MCPManager] = None,
+    history_token_budget: Optional[int] = None,
+    summary_deployment: Optional[str] = None,
 ) -> Agent:
     """Create an agent with a dynamic token provider.
     
@@ -333,6 +513,8 @@ def create_agent_with_token_provider(
         token_provider: Callable that returns a valid access token string
         api_version: API version
         mcp_manager: Optional MCP manager
+        history_token_budget: Prompt token budget of the conversation history
+        summary_deployment: Deployment that summarizes compacted history
         
     Returns:
         Configured Agent instance
@@ -343,4 +525,6 @@ def create_agent_with_token_provider(
         api_version=api_version,
         token_provider=token_provider,
         mcp_manager=mcp_manager,
+        history_token_budget=history_token_budget,
+        summary_deployment=summary_deployment,
     )
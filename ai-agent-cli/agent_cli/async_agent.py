@@ -0,0 +1,268 @@
+"""Asyncio-native Azure OpenAI agent with MCP tool support."""
+
+from typing import AsyncGenerator, Awaitable, Callable, Optional, Union
+
+from openai import AsyncAzureOpenAI
+from rich.console import Console
+
+from .agent import Agent, merge_tool_call_deltas, parse_tool_calls, tool_call_dicts, tool_messages
+from .history import SUMMARY_PROMPT, HistoryManager, format_transcript
+from .mcp_client import MCPManager
+from .models import ChatMessage, TokenResult
+
+
+console = Console()
+
+
+class AsyncAgent:
+    """Azure OpenAI agent driven from an event loop.
+    
+    The async counterpart of Agent, on AsyncAzureOpenAI: completions, token
+    provider calls and MCP tool calls are awaited on the running loop
+    instead of blocking a thread, so one process can drive many
+    conversations (one AsyncAgent each) concurrently. Agents created with
+    the same ``client`` share its connection pool.
+    
+    The MCP servers must be connected on the same loop (see
+    MCPManager.add_servers_async).
+    """
+    
+    SYSTEM_PROMPT = Agent.SYSTEM_PROMPT
+    
+    def __init__(
+        self,
+        endpoint: str,
+        deployment: str,
+        api_version: str = "2024-02-15-preview",
+        api_key: Optional[str] = None,
+        token: Optional[TokenResult] = None,
+        token_provider: Optional[Callable[[], Union[Optional[str], Awaitable[Optional[str]]]]] = None,
+        mcp_manager: Optional[MCPManager] = None,
+        client: Optional[AsyncAzureOpenAI] = None,
+        history_token_budget: Optional[int] = None,
+        summary_deployment: Optional[str] = None,
+    ):
+        """Initialize the agent.
+        
+        Args:
+            endpoint: Azure OpenAI endpoint URL
+            deployment: Deployment name
+            api_version: API version
+            api_key: API key (for API key auth mode)
+            token: Static token result (for simple Entra auth)
+            token_provider: Callable (sync or async) that returns a fresh token,
+                e.g. AsyncDirectTokenProvider.get_openai_token
+            mcp_manager: MCP manager for tool access
+            client: Existing client to share between agents (the auth
+                arguments are then ignored)
+            history_token_budget: Estimated prompt tokens above which older
+                history is compacted (None for unlimited)
+            summary_deployment: Deployment that summarizes compacted history
+                (defaults to ``deployment``)
+        """
+        self.endpoint = endpoint
+        self.deployment = deployment
+        self.api_version = api_version
+        self.summary_deployment = summary_deployment
+        self.mcp_manager = mcp_manager or MCPManager()
+        self._conversation: list[ChatMessage] = []
+        self._history = HistoryManager(token_budget=history_token_budget)
+        
+        # Wire form of _conversation, extended as messages are appended
+        self._messages: list[dict] = []
+        
+        # Store auth configuration
+        self._api_key = api_key
+        self._token = token
+        self._token_provider = token_provider
+        
+        # Only close clients this agent created
+        self._owns_client = client is None
+        self._client = client or self._create_client()
+        
+        # Add system message
+        self._conversation.append(ChatMessage(
+            role="system",
+            content=self.SYSTEM_PROMPT
+        ))
+    
+    def _create_client(self) -> AsyncAzureOpenAI:
+        """Create Azure OpenAI client with current credentials."""
+        if self._api_key:
+            return AsyncAzureOpenAI(
+                azure_endpoint=self.endpoint,
+                api_key=self._api_key,
+                api_version=self.api_version,
+            )
+        elif self._token_provider:
+            # The SDK calls (and awaits) the provider before every request
+            return AsyncAzureOpenAI(
+                azure_endpoint=self.endpoint,
+                azure_ad_token_provider=self._token_provider,
+                api_version=self.api_version,
+            )
+        elif self._token:
+            return AsyncAzureOpenAI(
+                azure_endpoint=self.endpoint,
+                azure_ad_token=self._token.access_token,
+                api_version=self.api_version,
+            )
+        else:
+            raise ValueError("No authentication method provided")
+    
+    def set_mcp_manager(self, manager: MCPManager) -> None:
+        """Set the MCP manager for tool access.
+        
+        Args:
+            manager: MCP manager instance
+        """
+        self.mcp_manager = manager
+    
+    def clear_history(self) -> None:
+        """Clear conversation history (keeps system prompt)."""
+        self._conversation = [self._conversation[0]]
+        self._messages = []
+    
+    def _sync_messages(self) -> list[dict]:
+        """Get the wire-form messages of the conversation (see Agent._sync_messages)."""
+        if len(self._messages) > len(self._conversation):
+            self._messages = []
+        self._messages.extend(msg.to_dict() for msg in self._conversation[len(self._messages):])
+        return self._messages
+    
+    async def _summarize(self, messages: list[ChatMessage]) -> Optional[str]:
+        """Summarize messages being compacted out of the history (see Agent._summarize)."""
+        try:
+            response = await self._client.chat.completions.create(
+                model=self.summary_deployment or self.deployment,
+                messages=[
+                    {"role": "system", "content": SUMMARY_PROMPT},
+                    {"role": "user", "content": format_transcript(messages)},
+                ],
+            )
+        except Exception as e:
+            console.print(f"[dim]Warning: Could not summarize conversation history: {e}[/dim]")
+            return None
+        return response.choices[0].message.content
+    
+    async def _create_completion(self, tools: list[dict], stream: bool = False):
+        """Request a completion for the current conversation (see Agent._create_completion)."""
+        if await self._history.compact_async(self._conversation, self._summarize):
+            self._messages = []
+        messages = self._sync_messages()
+        if tools:
+            return await self._client.chat.completions.create(
+                model=self.deployment,
+                messages=messages,
+                tools=tools,
+                tool_choice="auto",
+                stream=stream,
+            )
+        return await self._client.chat.completions.create(
+            model=self.deployment,
+            messages=messages,
+            stream=stream,
+        )
+    
+    async def _run_tool_calls(self, tool_calls: list[dict]) -> None:
+        """Execute tool calls concurrently and add their results to the conversation."""
+        results, pending = parse_tool_calls(tool_calls)
+        outcomes = await self.mcp_manager.call_tools_async([(name, args) for _, name, args in pending])
+        for (i, _, _), outcome in zip(pending, outcomes):
+            results[i] = outcome
+        self._conversation.extend(tool_messages(tool_calls, results))
+    
+    async def chat(self, user_message: str) -> str:
+        """Send a message and get a response, running the tool-calling loop.
+        
+        Args:
+            user_message: User's message
+            
+        Returns:
+            Assistant's response
+        """
+        self._conversation.append(ChatMessage(role="user", content=user_message))
+        tools = self.mcp_manager.get_openai_tools() if self.mcp_manager else []
+        
+        while True:
+            try:
+                response = await self._create_completion(tools)
+            except Exception as e:
+                error_msg = f"Error calling Azure OpenAI: {e}"
+                console.print(f"[red]{error_msg}[/red]")
+                return error_msg
+            
+            assistant_message = response.choices[0].message
+            
+            if assistant_message.tool_calls:
+                tool_calls = tool_call_dicts(assistant_message.tool_calls)
+                self._conversation.append(ChatMessage(
+                    role="assistant",
+                    content=assistant_message.content,
+                    tool_calls=tool_calls
+                ))
+                await self._run_tool_calls(tool_calls)
+                continue
+            
+            content = assistant_message.content or ""
+            self._conversation.append(ChatMessage(role="assistant", content=content))
+            return content
+    
+    async def chat_stream(self, user_message: str) -> AsyncGenerator[str, None]:
+        """Send a message and stream the response, including tool calls.
+        
+        See Agent.chat_stream.
+        
+        Args:
+            user_message: User's message
+            
+        Yields:
+            Chunks of the response as they arrive
+        """
+        self._conversation.append(ChatMessage(role="user", content=user_message))
+        tools = self.mcp_manager.get_openai_tools() if self.mcp_manager else []
+        
+        while True:
+            content_parts: list[str] = []
+            tool_calls: dict[int, dict] = {}
+            
+            try:
+                response = await self._create_completion(tools, stream=True)
+                
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield delta.content
+                    
+                    merge_tool_call_deltas(tool_calls, delta.tool_calls)
+            except Exception as e:
+                yield f"Error: {e}"
+                return
+            
+            content = "".join(content_parts)
+            
+            if tool_calls:
+                ordered_calls = [tool_calls[index] for index in sorted(tool_calls)]
+                self._conversation.append(ChatMessage(
+                    role="assistant",
+                    content=content or None,
+                    tool_calls=ordered_calls
+                ))
+                await self._run_tool_calls(ordered_calls)
+                
+                # Separate this round's text from the follow-up
+                if content:
+                    yield "\n\n"
+                continue
+            
+            self._conversation.append(ChatMessage(role="assistant", content=content))
+            return
+    
+    async def aclose(self) -> None:
+        """Close the OpenAI client if this agent created it."""
+        if self._owns_client:
+            await self._client.close()
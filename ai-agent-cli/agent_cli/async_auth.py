@@ -0,0 +1,388 @@
+"""Asyncio-native OBO token exchange with single-flight deduplication."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Hashable, Optional
+
+import httpx
+from rich.console import Console
+
+from .auth import (
+    AZURE_COGNITIVE_SERVICES_SCOPE,
+    TOKEN_EXCHANGE_SCOPE,
+    TOKEN_REQUEST_HEADERS,
+    build_blueprint_fmi_request,
+    build_obo_request,
+    parse_token_response,
+    user_cache_key,
+)
+from .credentials import ClientCredential
+from .models import TokenResult
+from .token_cache import ExpiringTokenCache, DEFAULT_REFRESH_SKEW_SECONDS
+from .token_metrics import CACHE_HIT, CACHE_MISS, CACHE_REFRESH, TokenMetrics, error_code
+from .transport import create_async_token_http_client, post_token_request_async, token_endpoint_url
+
+
+console = Console()
+
+
+async def request_token_async(
+    client: httpx.AsyncClient,
+    tenant_id: str,
+    data: dict,
+    error_label: str,
+    metrics: Optional[TokenMetrics] = None,
+    operation: str = "token",
+) -> Optional[TokenResult]:
+    """Async version of request_token.
+    
+    Args:
+        client: Async HTTP client to use
+        tenant_id: Azure AD tenant ID
+        data: Form fields for the token endpoint
+        error_label: Prefix for the error message printed on failure
+        metrics: Statistics to record the call's latency and failure code in
+        operation: Operation name for the statistics (``t1`` or ``obo``)
+        
+    Returns:
+        TokenResult if the request succeeded, None otherwise
+    """
+    start = time.perf_counter()
+    try:
+        response = await post_token_request_async(
+            client,
+            token_endpoint_url(tenant_id),
+            data=data,
+            headers=TOKEN_REQUEST_HEADERS,
+        )
+    except httpx.HTTPError as e:
+        console.print(f"[red]{error_label}: {e}[/red]")
+        if metrics:
+            metrics.record_latency(operation, data.get("scope", ""), time.perf_counter() - start)
+            metrics.record_failure(operation, error_code(exc=e))
+        return None
+    
+    token = parse_token_response(response, error_label)
+    if metrics:
+        metrics.record_latency(operation, data.get("scope", ""), time.perf_counter() - start)
+        if token is None:
+            metrics.record_failure(operation, error_code(response))
+    return token
+
+
+async def get_blueprint_token_with_fmi_path_async(
+    client: httpx.AsyncClient,
+    tenant_id: str,
+    blueprint_app_id: str,
+    client_secret: Optional[str],
+    agent_identity_app_id: str,
+    credential: Optional[ClientCredential] = None,
+    metrics: Optional[TokenMetrics] = None,
+) -> Optional[TokenResult]:
+    """Async version of get_blueprint_token_with_fmi_path (T1).
+    
+    Args:
+        client: Async HTTP client to use
+        tenant_id: Azure AD tenant ID
+        blueprint_app_id: Blueprint application ID
+        client_secret: Blueprint client secret
+        agent_identity_app_id: Agent identity application ID (used as fmi_path)
+        credential: Client credential (e.g. a federated token) to use instead of the secret
+        metrics: Statistics to record the request in
+        
+    Returns:
+        TokenResult (T1) if successful, None otherwise
+    """
+    try:
+        data = build_blueprint_fmi_request(
+            blueprint_app_id=blueprint_app_id,
+            client_secret=client_secret,
+            agent_identity_app_id=agent_identity_app_id,
+            credential=credential,
+        )
+    except (OSError, ValueError) as e:
+        console.print(f"[red]T1 token request failed: could not load client credential: {e}[/red]")
+        if metrics:
+            metrics.record_failure("t1", error_code(exc=e))
+        return None
+    return await request_token_async(client, tenant_id, data, "T1 token request failed", metrics, "t1")
+
+
+async def perform_obo_exchange_async(
+    client: httpx.AsyncClient,
+    tenant_id: str,
+    agent_identity_app_id: str,
+    t1_token: str,
+    user_token: str,
+    scope: str,
+    metrics: Optional[TokenMetrics] = None,
+) -> Optional[TokenResult]:
+    """Async version of perform_obo_exchange (Tc + T1 -> T2).
+    
+    Args:
+        client: Async HTTP client to use
+        tenant_id: Azure AD tenant ID
+        agent_identity_app_id: Agent identity application ID
+        t1_token: Blueprint impersonation token (T1)
+        user_token: User token with Blueprint audience (Tc)
+        scope: Target resource scope
+        metrics: Statistics to record the request in
+        
+    Returns:
+        TokenResult (T2 - OBO token) if successful, None otherwise
+    """
+    return await request_token_async(
+        client,
+        tenant_id,
+        build_obo_request(
+            agent_identity_app_id=agent_identity_app_id,
+            t1_token=t1_token,
+            user_token=user_token,
+            scope=scope,
+        ),
+        "OBO exchange failed",
+        metrics,
+        "obo",
+    )
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key onto one in-flight task."""
+    
+    def __init__(self):
+        """Initialize with no in-flight calls."""
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+    
+    def start(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Optional[TokenResult]]],
+    ) -> asyncio.Task:
+        """Start ``func`` for ``key`` unless a call for that key is already running.
+        
+        Args:
+            key: Deduplication key
+            func: Coroutine function performing the work
+            
+        Returns:
+            The in-flight task for ``key``
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._discard(key, t))
+        return task
+    
+    async def run(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Optional[TokenResult]]],
+    ) -> Optional[TokenResult]:
+        """Run ``func`` for ``key``, joining the in-flight call if there is one.
+        
+        Callers arriving while a call is in flight await the same result.
+        Cancelling one caller does not cancel the shared call.
+        
+        Args:
+            key: Deduplication key
+            func: Coroutine function performing the work
+            
+        Returns:
+            Result of the (shared) call
+        """
+        return await asyncio.shield(self.start(key, func))
+    
+    def _discard(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished call."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            console.print(f"[dim]Token exchange failed: {task.exception()}[/dim]")
+    
+    def in_flight(self, key: Hashable) -> bool:
+        """Check if a call for ``key`` is currently running."""
+        return key in self._inflight
+
+
+class AsyncOBOTokenManager:
+    """Asyncio counterpart to OBOTokenManager.
+    
+    Concurrent requests for the same scope share one in-flight exchange,
+    so a burst of callers after expiry results in exactly one T1 and one
+    T2 request per (user, scope). Request latencies, cache hits and
+    failures are recorded in ``metrics`` (see stats()).
+    """
+    
+    def __init__(
+        self,
+        tenant_id: str,
+        blueprint_app_id: str,
+        blueprint_client_secret: Optional[str],
+        agent_identity_app_id: str,
+        user_token: str,
+        refresh_skew: int = DEFAULT_REFRESH_SKEW_SECONDS,
+        client: Optional[httpx.AsyncClient] = None,
+        blueprint_credential: Optional[ClientCredential] = None,
+        metrics: Optional[TokenMetrics] = None,
+    ):
+        """Initialize async OBO token manager.
+        
+        Args:
+            tenant_id: Azure AD tenant ID
+            blueprint_app_id: Blueprint application ID
+            blueprint_client_secret: Blueprint client secret (None if blueprint_credential is set)
+            agent_identity_app_id: Agent identity application ID
+            user_token: User token (Tc) with Blueprint audience
+            refresh_skew: Seconds before expiry at which tokens are refreshed
+            client: Async HTTP client to use (one is created and owned if omitted)
+            blueprint_credential: Credential used for T1 instead of the client secret
+            metrics: Statistics to record into (a new TokenMetrics if omitted)
+        """
+        self.tenant_id = tenant_id
+        self.blueprint_app_id = blueprint_app_id
+        self.blueprint_client_secret = blueprint_client_secret
+        self.blueprint_credential = blueprint_credential
+        self.agent_identity_app_id = agent_identity_app_id
+        self.user_token = user_token
+        self._user_key = user_cache_key(user_token)
+        self.metrics = metrics or TokenMetrics()
+        
+        self._client = client
+        self._owns_client = client is None
+        self._cache = ExpiringTokenCache(refresh_skew=refresh_skew)
+        self._single_flight = SingleFlight()
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get (or lazily create) the async HTTP client."""
+        if self._client is None or self._client.is_closed:
+            self._client = create_async_token_http_client()
+            self._owns_client = True
+        return self._client
+    
+    async def _get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Optional[TokenResult]]],
+    ) -> Optional[TokenResult]:
+        """Serve a cached token, refreshing ahead of expiry without blocking.
+        
+        Fresh tokens are returned directly. Tokens inside the refresh window
+        are returned while a shared refresh runs in the background. Only
+        missing or expired tokens make the caller wait for an exchange.
+        """
+        scope = self._metrics_scope(key)
+        token = self._cache.get_fresh(key)
+        if token is None:
+            token = self._cache.get(key)
+            if token is None:
+                self.metrics.record_cache(scope, CACHE_MISS)
+                token = await self._single_flight.run(key, fetch)
+                self.metrics.record_use(scope, token)
+                return token
+            if not self._single_flight.in_flight(key):
+                self.metrics.record_cache(scope, CACHE_REFRESH)
+            self._single_flight.start(key, fetch)
+        self.metrics.record_cache(scope, CACHE_HIT)
+        self.metrics.record_use(scope, token)
+        return token
+    
+    @staticmethod
+    def _metrics_scope(key: Hashable) -> str:
+        """Scope under which a cache key is reported in the statistics."""
+        return TOKEN_EXCHANGE_SCOPE if key[0] == "t1" else key[-1]
+    
+    async def _get_t1_token(self) -> Optional[TokenResult]:
+        """Get T1 from cache or via a single shared exchange."""
+        return await self._get_or_fetch(("t1", self.agent_identity_app_id), self._fetch_t1_token)
+    
+    async def _fetch_t1_token(self) -> Optional[TokenResult]:
+        """Acquire a new T1 token from Entra and cache it."""
+        console.print("[dim]Getting T1 token (blueprint impersonation)...[/dim]")
+        t1_token = await get_blueprint_token_with_fmi_path_async(
+            self._get_client(),
+            tenant_id=self.tenant_id,
+            blueprint_app_id=self.blueprint_app_id,
+            client_secret=self.blueprint_client_secret,
+            credential=self.blueprint_credential,
+            agent_identity_app_id=self.agent_identity_app_id,
+            metrics=self.metrics,
+        )
+        if t1_token:
+            self._cache.put(("t1", self.agent_identity_app_id), t1_token)
+            console.print("[green]✓ T1 token acquired[/green]")
+        return t1_token
+    
+    async def _fetch_token_for_scope(self, scope: str) -> Optional[TokenResult]:
+        """Perform the OBO exchange for a scope and cache the result."""
+        t1_token = await self._get_t1_token()
+        if not t1_token:
+            console.print("[red]Failed to get T1 token[/red]")
+            return None
+        
+        console.print(f"[dim]Getting OBO token for scope: {scope}[/dim]")
+        t2_token = await perform_obo_exchange_async(
+            self._get_client(),
+            tenant_id=self.tenant_id,
+            agent_identity_app_id=self.agent_identity_app_id,
+            t1_token=t1_token.access_token,
+            user_token=self.user_token,
+            scope=scope,
+            metrics=self.metrics,
+        )
+        
+        if t2_token:
+            self._cache.put(("t2", self._user_key, scope), t2_token)
+            console.print(f"[green]✓ OBO token acquired for {scope}[/green]")
+        
+        return t2_token
+    
+    async def get_token_for_scope(self, scope: str) -> Optional[TokenResult]:
+        """Get an OBO token for the specified scope.
+        
+        Args:
+            scope: Target resource scope (e.g., https://cognitiveservices.azure.com/.default)
+            
+        Returns:
+            TokenResult (T2) for the scope, or None if exchange fails
+        """
+        return await self._get_or_fetch(
+            ("t2", self._user_key, scope),
+            lambda: self._fetch_token_for_scope(scope),
+        )
+    
+    def update_user_token(self, user_token: str) -> None:
+        """Use a renewed user token (Tc) for subsequent OBO exchanges.
+        
+        Args:
+            user_token: New user token (Tc) with Blueprint audience
+        """
+        self.user_token = user_token
+        self._user_key = user_cache_key(user_token)
+    
+    async def get_azure_openai_token(self) -> Optional[TokenResult]:
+        """Get OBO token for Azure OpenAI / Cognitive Services."""
+        return await self.get_token_for_scope(AZURE_COGNITIVE_SERVICES_SCOPE)
+    
+    async def get_mcp_gateway_token(self, gateway_scope: str) -> Optional[TokenResult]:
+        """Get OBO token for MCP Gateway.
+        
+        Args:
+            gateway_scope: The gateway's scope (e.g., api://{gateway-app-id}/.default)
+        """
+        return await self.get_token_for_scope(gateway_scope)
+    
+    def stats(self) -> dict:
+        """Get token acquisition statistics (see TokenMetrics.snapshot)."""
+        return self.metrics.snapshot()
+    
+    def clear_cache(self) -> None:
+        """Clear all cached tokens."""
+        self._cache.clear()
+    
+    async def aclose(self) -> None:
+        """Clear cached tokens and close the HTTP client if owned."""
+        self.clear_cache()
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+        self._client = None
@@ -2,14 +2,29 @@
 
 import atexit
 import json
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Hashable, Optional
 
 import httpx
-from msal import PublicClientApplication, SerializableTokenCache
+from msal import PublicClientApplication
 from rich.console import Console
 
+from .credentials import ClientCredential
 from .models import TokenResult
+from .msal_cache import PersistentMsalCache, atomic_write
+from .transport import post_token_request, token_endpoint_url, token_error_message
+from .token_cache import (
+    BackgroundRefresher,
+    ExpiringTokenCache,
+    DEFAULT_MAX_CACHED_TOKENS,
+    DEFAULT_REFRESH_SKEW_SECONDS,
+)
+from .token_metrics import CACHE_HIT, CACHE_MISS, CACHE_REFRESH, TokenMetrics, error_code
+from .token_store import EncryptedTokenStore, TokenStore
 
 
 console = Console()
@@ -21,15 +36,33 @@ GRAPH_POWERSHELL_CLIENT_ID = "14d82eec-204b-4c2f-b7e8-296a70dab67e"
 # Token cache file location
 TOKEN_CACHE_PATH = Path.home() / ".ai-agent-cli-tokens.json"
 
+# Last-used account (home_account_id) per tenant and scope set
+ACCOUNT_INDEX_PATH = Path.home() / ".ai-agent-cli-accounts.json"
+
 # Azure OpenAI / Cognitive Services scope
 AZURE_COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
 
+# Scope of the T1 (token exchange) token
+TOKEN_EXCHANGE_SCOPE = "api://AzureADTokenExchange/.default"
+
+# Parallel token acquisitions in a fan-out wave (keep within the transport's
+# max_connections so requests do not queue for a pooled connection)
+DEFAULT_FANOUT_CONCURRENCY = 8
+
+# Headers sent with every token endpoint request
+TOKEN_REQUEST_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
 
 class TokenCache:
-    """Persistent token cache for MSAL."""
+    """Persistent token cache for MSAL.
+    
+    Changes are written through to disk atomically under an advisory file
+    lock, and the file is reloaded when another process updates it, so
+    concurrent CLI processes share refresh tokens safely.
+    """
     
     _instance: Optional["TokenCache"] = None
-    _cache: Optional[SerializableTokenCache] = None
+    _cache: Optional[PersistentMsalCache] = None
     
     @classmethod
     def get_instance(cls) -> "TokenCache":
@@ -40,46 +73,33 @@ class TokenCache:
     
     def __init__(self):
         """Initialize token cache."""
-        self._cache = SerializableTokenCache()
-        self._load()
-        # Register save on exit
+        self._cache = PersistentMsalCache(TOKEN_CACHE_PATH)
+        # Safety net for changes made outside MSAL's add/modify hooks
         atexit.register(self._save)
     
     def _load(self) -> None:
-        """Load cache from disk."""
-        if TOKEN_CACHE_PATH.exists():
-            try:
-                with open(TOKEN_CACHE_PATH, "r") as f:
-                    self._cache.deserialize(f.read())
-            except (json.JSONDecodeError, IOError) as e:
-                console.print(f"[dim]Warning: Could not load token cache: {e}[/dim]")
+        """Reload cache from disk if another process changed it."""
+        self._cache.reload()
     
     def _save(self) -> None:
         """Save cache to disk if modified."""
-        if self._cache.has_state_changed:
-            try:
-                TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-                with open(TOKEN_CACHE_PATH, "w") as f:
-                    f.write(self._cache.serialize())
-            except IOError as e:
-                console.print(f"[dim]Warning: Could not save token cache: {e}[/dim]")
+        try:
+            self._cache.flush()
+        except OSError as e:
+            console.print(f"[dim]Warning: Could not save token cache: {e}[/dim]")
     
     @property
-    def cache(self) -> SerializableTokenCache:
+    def cache(self) -> PersistentMsalCache:
         """Get the underlying MSAL cache."""
         return self._cache
     
     def clear(self) -> None:
         """Clear the token cache."""
-        # Create a new empty cache
-        self._cache = SerializableTokenCache()
-        # Delete the cache file
-        if TOKEN_CACHE_PATH.exists():
-            try:
-                TOKEN_CACHE_PATH.unlink()
-                console.print("[green]✓ Token cache cleared[/green]")
-            except IOError as e:
-                console.print(f"[red]Failed to delete token cache: {e}[/red]")
+        try:
+            self._cache.delete()
+            console.print("[green]✓ Token cache cleared[/green]")
+        except OSError as e:
+            console.print(f"[red]Failed to delete token cache: {e}[/red]")
 
 
 def get_msal_app(
@@ -105,22 +125,98 @@ def get_msal_app(
     )
 
 
+def _account_index_key(tenant_id: str, scopes: list[str]) -> str:
+    """Build the account index key for a tenant and scope set."""
+    return f"{tenant_id}|{' '.join(sorted(scopes))}"
+
+
+def _load_account_index() -> dict[str, str]:
+    """Load the last-used account index from disk."""
+    if not ACCOUNT_INDEX_PATH.exists():
+        return {}
+    try:
+        with open(ACCOUNT_INDEX_PATH, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+
+
+def _remember_account(tenant_id: str, scopes: list[str], home_account_id: Optional[str]) -> None:
+    """Record the account used for a tenant and scope set."""
+    if not home_account_id:
+        return
+    index = _load_account_index()
+    key = _account_index_key(tenant_id, scopes)
+    if index.get(key) == home_account_id:
+        return
+    index[key] = home_account_id
+    try:
+        atomic_write(ACCOUNT_INDEX_PATH, json.dumps(index, indent=2))
+    except IOError as e:
+        console.print(f"[dim]Warning: Could not save account index: {e}[/dim]")
+
+
+def _home_account_id(result: dict) -> Optional[str]:
+    """Derive the MSAL home_account_id (oid.tid) from a token response."""
+    claims = result.get("id_token_claims") or {}
+    if claims.get("oid") and claims.get("tid"):
+        return f"{claims['oid']}.{claims['tid']}"
+    return None
+
+
+def _select_cached_accounts(
+    app: PublicClientApplication,
+    tenant_id: str,
+    scopes: list[str],
+    account_hint: Optional[str] = None,
+) -> list[dict]:
+    """Choose which cached accounts to try for silent acquisition.
+    
+    Args:
+        app: MSAL application
+        tenant_id: Azure AD tenant ID
+        scopes: Scopes being requested
+        account_hint: Username or home_account_id requested by the user
+        
+    Returns:
+        The hinted account, else the last-used account for this tenant and
+        scope set, else all cached accounts
+    """
+    accounts = app.get_accounts()
+    if account_hint:
+        hint = account_hint.lower()
+        return [
+            account for account in accounts
+            if hint in (account.get("username", "").lower(), account.get("home_account_id", "").lower())
+        ]
+    
+    last_used = _load_account_index().get(_account_index_key(tenant_id, scopes))
+    for account in accounts:
+        if account.get("home_account_id") == last_used:
+            return [account]
+    return accounts
+
+
 def get_device_code_token(
     tenant_id: str,
     scopes: list[str],
     client_id: str = GRAPH_POWERSHELL_CLIENT_ID,
     force_refresh: bool = False,
+    account_hint: Optional[str] = None,
 ) -> Optional[TokenResult]:
     """Acquire a token using device code flow with caching.
     
     First attempts to get a cached token silently. If that fails,
-    falls back to device code flow.
+    falls back to device code flow. Only the hinted account, or else the
+    account last used for this tenant and scope set, is tried silently;
+    other cached accounts are tried only when neither is known.
     
     Args:
         tenant_id: Azure AD tenant ID
         scopes: Scopes to request
         client_id: Client ID to use (defaults to Graph PowerShell client)
         force_refresh: If True, skip cache and force new authentication
+        account_hint: Username or home_account_id of the cached account to use
         
     Returns:
         TokenResult if successful, None otherwise
@@ -129,14 +225,15 @@ def get_device_code_token(
     
     # Try to get token silently from cache first
     if not force_refresh:
-        accounts = app.get_accounts()
+        accounts = _select_cached_accounts(app, tenant_id, scopes, account_hint)
         if accounts:
-            console.print(f"[dim]Found {len(accounts)} cached account(s), attempting silent token acquisition...[/dim]")
+            console.print(f"[dim]Found {len(accounts)} matching cached account(s), attempting silent token acquisition...[/dim]")
             
             for account in accounts:
                 result = app.acquire_token_silent(scopes=scopes, account=account)
                 if result and "access_token" in result:
                     console.print(f"[green]✓ Using cached token for {account.get('username', 'unknown')}[/green]")
+                    _remember_account(tenant_id, scopes, account.get("home_account_id"))
                     return TokenResult(
                         access_token=result["access_token"],
                         token_type=result.get("token_type", "Bearer"),
@@ -161,6 +258,7 @@ def get_device_code_token(
     if "access_token" in result:
         # Cache is automatically updated by MSAL
         console.print("[green]✓ Authentication successful, token cached for future use[/green]")
+        _remember_account(tenant_id, scopes, _home_account_id(result))
         return TokenResult(
             access_token=result["access_token"],
             token_type=result.get("token_type", "Bearer"),
@@ -173,9 +271,10 @@ def get_device_code_token(
 
 
 def clear_token_cache() -> None:
-    """Clear the persistent token cache (logout)."""
+    """Clear the persistent token caches (logout)."""
     token_cache = TokenCache.get_instance()
     token_cache.clear()
+    EncryptedTokenStore().clear()
 
 
 def get_cached_accounts(tenant_id: str) -> list[dict]:
@@ -211,10 +310,224 @@ def get_current_username(tenant_id: str) -> Optional[str]:
 # =============================================================================
 
 
+def build_blueprint_fmi_request(
+    blueprint_app_id: str,
+    client_secret: Optional[str],
+    agent_identity_app_id: str,
+    credential: Optional[ClientCredential] = None,
+) -> dict:
+    """Build the token request form for T1 (Blueprint token with fmi_path).
+    
+    Args:
+        blueprint_app_id: Blueprint application ID
+        client_secret: Blueprint client secret (ignored if credential is given)
+        agent_identity_app_id: Agent identity application ID (used as fmi_path)
+        credential: Client credential (e.g. a federated token) to use instead
+        
+    Returns:
+        Form fields for the token endpoint
+    """
+    return {
+        "client_id": blueprint_app_id,
+        "scope": TOKEN_EXCHANGE_SCOPE,
+        "grant_type": "client_credentials",
+        **(credential.client_auth_fields() if credential else {"client_secret": client_secret}),
+        "fmi_path": agent_identity_app_id,
+    }
+
+
+def build_obo_request(
+    agent_identity_app_id: str,
+    t1_token: str,
+    user_token: str,
+    scope: str,
+) -> dict:
+    """Build the token request form for the OBO exchange (Tc + T1 -> T2).
+    
+    Args:
+        agent_identity_app_id: Agent identity application ID
+        t1_token: Blueprint impersonation token (T1)
+        user_token: User token with Blueprint audience (Tc)
+        scope: Target resource scope
+        
+    Returns:
+        Form fields for the token endpoint
+    """
+    return {
+        "client_id": agent_identity_app_id,
+        "scope": scope,
+        "client_assertion_type": "urn:ietf:params:oauth:client-assertion-type:jwt-bearer",
+        "client_assertion": t1_token,
+        "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
+        "assertion": user_token,
+        "requested_token_use": "on_behalf_of",
+    }
+
+
+def build_agent_app_token_request(
+    agent_identity_app_id: str,
+    t1_token: str,
+    scope: str,
+) -> dict:
+    """Build the token request form for an agent identity app token (T1 -> T2).
+    
+    Args:
+        agent_identity_app_id: Agent identity application ID
+        t1_token: Blueprint impersonation token (T1)
+        scope: Target resource scope
+        
+    Returns:
+        Form fields for the token endpoint
+    """
+    return {
+        "client_id": agent_identity_app_id,
+        "scope": scope,
+        "grant_type": "client_credentials",
+        "client_assertion_type": "urn:ietf:params:oauth:client-assertion-type:jwt-bearer",
+        "client_assertion": t1_token,
+    }
+
+
+def parse_token_response(response: httpx.Response, error_label: str) -> Optional[TokenResult]:
+    """Convert a token endpoint response into a TokenResult.
+    
+    Args:
+        response: HTTP response from the token endpoint
+        error_label: Prefix for the error message printed on failure
+        
+    Returns:
+        TokenResult if the request succeeded, None otherwise
+    """
+    if response.status_code == 200:
+        try:
+            result = response.json()
+            return TokenResult(
+                access_token=result["access_token"],
+                token_type=result.get("token_type", "Bearer"),
+                expires_in=result.get("expires_in", 0),
+            )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            console.print(f"[red]{error_label}: malformed token response[/red]")
+            return None
+    else:
+        console.print(f"[red]{error_label}: {token_error_message(response)}[/red]")
+        return None
+
+
+def request_token(
+    tenant_id: str,
+    data: dict,
+    error_label: str,
+    metrics: Optional[TokenMetrics] = None,
+    operation: str = "token",
+) -> Optional[TokenResult]:
+    """Send a token request with retries and parse the response.
+    
+    Args:
+        tenant_id: Azure AD tenant ID
+        data: Form fields for the token endpoint
+        error_label: Prefix for the error message printed on failure
+        metrics: Statistics to record the call's latency and failure code in
+        operation: Operation name for the statistics (``t1``, ``obo`` or ``app``)
+        
+    Returns:
+        TokenResult if the request succeeded, None otherwise
+    """
+    start = time.perf_counter()
+    try:
+        response = post_token_request(
+            token_endpoint_url(tenant_id),
+            data=data,
+            headers=TOKEN_REQUEST_HEADERS,
+        )
+    except httpx.HTTPError as e:
+        console.print(f"[red]{error_label}: {e}[/red]")
+        if metrics:
+            metrics.record_latency(operation, data.get("scope", ""), time.perf_counter() - start)
+            metrics.record_failure(operation, error_code(exc=e))
+        return None
+    
+    token = parse_token_response(response, error_label)
+    if metrics:
+        metrics.record_latency(operation, data.get("scope", ""), time.perf_counter() - start)
+        if token is None:
+            metrics.record_failure(operation, error_code(response))
+    return token
+
+
+def hash_user_token(user_token: str) -> str:
+    """Derive a cache key from the full user token (Tc).
+    
+    Unlike user_cache_key, the key cannot be chosen by forging claims, so
+    it is safe for tokens whose signature has not been verified.
+    
+    Args:
+        user_token: User access token
+        
+    Returns:
+        SHA-256 hex digest of the token
+    """
+    return hashlib.sha256(user_token.encode()).hexdigest()
+
+
+def user_cache_key(user_token: str) -> str:
+    """Derive a stable cache key for the user behind a token (Tc).
+    
+    Uses the ``oid`` and ``tid`` claims when present so that refreshed
+    tokens for the same user map to the same key. The claims are not
+    verified, so only use this for the caller's own tokens.
+    
+    Args:
+        user_token: User access token
+        
+    Returns:
+        Cache key identifying the user
+    """
+    token = TokenResult(access_token=user_token)
+    oid = token.object_id or token.subject
+    if oid:
+        return f"{oid}.{token.tenant_id or ''}"
+    return hash_user_token(user_token)
+
+
+def acquire_shared(
+    token_store: Optional[TokenStore],
+    store_key: tuple[str, str, str],
+    fetch: Callable[[], Optional[TokenResult]],
+    skew_for: Callable[[TokenResult], float],
+) -> tuple[Optional[TokenResult], bool]:
+    """Acquire a token so that only one replica sharing a store fetches it.
+    
+    Holds the store's lock for the key, re-reads the store (another
+    replica may have just refreshed it) and only fetches from Entra if the
+    stored token is missing or inside its refresh window.
+    
+    Args:
+        token_store: Shared token store, or None to just fetch
+        store_key: (user, agent identity, scope) key in the store
+        fetch: Callable that acquires a new token
+        skew_for: Refresh window of a token in seconds
+        
+    Returns:
+        Tuple of (token or None, True if the token was read from the store)
+    """
+    if token_store is None:
+        return fetch(), False
+    with token_store.lock(*store_key):
+        token = token_store.get(*store_key)
+        if token and not token.is_expired(skew_for(token)):
+            return token, True
+        token = fetch()
+        if token:
+            token_store.put(*store_key, token)
+        return token, False
+
+
 def get_user_token_for_blueprint(
     tenant_id: str,
     blueprint_app_id: str,
     force_refresh: bool = False,
+    account_hint: Optional[str] = None,
 ) -> Optional[TokenResult]:
     """Get a user token with the Blueprint as the audience (Tc).
     
@@ -225,6 +538,7 @@ def get_user_token_for_blueprint(
         tenant_id: Azure AD tenant ID
         blueprint_app_id: Blueprint application ID (used as audience)
         force_refresh: If True, skip cache and force new authentication
+        account_hint: Username or home_account_id of the cached account to use
         
     Returns:
         TokenResult (Tc) if successful, None otherwise
@@ -238,14 +552,119 @@ def get_user_token_for_blueprint(
         tenant_id=tenant_id,
         scopes=scopes,
         force_refresh=force_refresh,
+        account_hint=account_hint,
     )
 
 
+def acquire_user_token_silent(
+    tenant_id: str,
+    blueprint_app_id: str,
+    account_hint: Optional[str] = None,
+) -> Optional[TokenResult]:
+    """Renew the user token (Tc) from the MSAL cache without user interaction.
+    
+    Uses the cached refresh token of the hinted or last-used account and
+    never falls back to device code flow.
+    
+    Args:
+        tenant_id: Azure AD tenant ID
+        blueprint_app_id: Blueprint application ID (used as audience)
+        account_hint: Username or home_account_id of the cached account to use
+        
+    Returns:
+        A newly issued TokenResult (Tc), or None if no refresh token is usable
+    """
+    scopes = [f"api://{blueprint_app_id}/access_as_user"]
+    app = get_msal_app(tenant_id)
+    
+    for account in _select_cached_accounts(app, tenant_id, scopes, account_hint):
+        # force_refresh redeems the refresh token even if the cached Tc is
+        # still valid, so the renewed Tc has a full lifetime
+        result = app.acquire_token_silent(scopes=scopes, account=account, force_refresh=True)
+        if result and "access_token" in result:
+            return TokenResult(
+                access_token=result["access_token"],
+                token_type=result.get("token_type", "Bearer"),
+                expires_in=result.get("expires_in", 0),
+            )
+    return None
+
+
+class UserTokenRefresher:
+    """Keeps the user token (Tc) fresh by silently renewing it through MSAL.
+    
+    A background thread redeems the MSAL refresh token ``refresh_skew``
+    seconds before Tc expires and hands the new Tc to ``on_refresh`` (e.g.
+    a token provider's ``update_user_token``), so long sessions never fall
+    back to interactive device code login.
+    """
+    
+    _KEY = "tc"
+    
+    def __init__(
+        self,
+        tenant_id: str,
+        blueprint_app_id: str,
+        user_token: TokenResult,
+        on_refresh: Callable[[str], None],
+        refresh_skew: int = DEFAULT_REFRESH_SKEW_SECONDS,
+        account_hint: Optional[str] = None,
+    ):
+        """Initialize the refresher.
+        
+        Args:
+            tenant_id: Azure AD tenant ID
+            blueprint_app_id: Blueprint application ID (used as audience)
+            user_token: Current user token (Tc)
+            on_refresh: Called with each renewed Tc access token
+            refresh_skew: Seconds before expiry at which Tc is renewed
+            account_hint: Username or home_account_id of the cached account to use
+        """
+        self.tenant_id = tenant_id
+        self.blueprint_app_id = blueprint_app_id
+        self.account_hint = account_hint
+        self._on_refresh = on_refresh
+        self._cache = ExpiringTokenCache(refresh_skew=refresh_skew)
+        self._cache.put(self._KEY, user_token)
+        self._refresher = BackgroundRefresher(
+            self._cache,
+            self._refresh,
+            name="user-token-refresher",
+        )
+    
+    @property
+    def user_token(self) -> Optional[TokenResult]:
+        """Get the current user token (Tc) if it has not expired."""
+        return self._cache.get(self._KEY)
+    
+    def _refresh(self, key: str) -> Optional[TokenResult]:
+        """Renew Tc and pass it on (called by the background refresher)."""
+        token = acquire_user_token_silent(
+            tenant_id=self.tenant_id,
+            blueprint_app_id=self.blueprint_app_id,
+            account_hint=self.account_hint,
+        )
+        if token:
+            self._cache.put(key, token)
+            self._on_refresh(token.access_token)
+        return token
+    
+    def start(self) -> None:
+        """Start renewing Tc in the background."""
+        self._refresher.start()
+    
+    def stop(self) -> None:
+        """Stop renewing Tc."""
+        self._refresher.stop()
+
+
 def get_blueprint_token_with_fmi_path(
     tenant_id: str,
     blueprint_app_id: str,
-    client_secret: str,
+    client_secret: Optional[str],
     agent_identity_app_id: str,
+    credential: Optional[ClientCredential] = None,
+    metrics: Optional[TokenMetrics] = None,
 ) -> Optional[TokenResult]:
     """Get T1 token: Blueprint token with fmi_path pointing to agent identity.
     
@@ -256,38 +675,25 @@ def get_blueprint_token_with_fmi_path(
         blueprint_app_id: Blueprint application ID
         client_secret: Blueprint client secret
         agent_identity_app_id: Agent identity application ID (used as fmi_path)
+        credential: Client credential (e.g. a federated token) to use instead of the secret
+        metrics: Statistics to record the request in
         
     Returns:
         TokenResult (T1) if successful, None otherwise
     """
-    token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
-    
-    data = {
-        "client_id": blueprint_app_id,
-        "scope": "api://AzureADTokenExchange/.default",
-        "grant_type": "client_credentials",
-        "client_secret": client_secret,
-        "fmi_path": agent_identity_app_id,
-    }
-    
-    with httpx.Client() as client:
-        response = client.post(
-            token_url,
-            data=data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
+    try:
+        data = build_blueprint_fmi_request(
+            blueprint_app_id=blueprint_app_id,
+            client_secret=client_secret,
+            agent_identity_app_id=agent_identity_app_id,
+            credential=credential,
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return TokenResult(
-                access_token=result["access_token"],
-                token_type=result.get("token_type", "Bearer"),
-                expires_in=result.get("expires_in", 0),
-            )
-        else:
-            error = response.json()
-            console.print(f"[red]T1 token request failed: {error.get('error_description', error.get('error', 'Unknown error'))}[/red]")
-            return None
+    except (OSError, ValueError) as e:
+        console.print(f"[red]T1 token request failed: could not load client credential: {e}[/red]")
+        if metrics:
+            metrics.record_failure("t1", error_code(exc=e))
+        return None
+    return request_token(tenant_id, data, "T1 token request failed", metrics, "t1")
 
 
 def perform_obo_exchange(
@@ -296,6 +702,7 @@ def perform_obo_exchange(
     t1_token: str,
     user_token: str,
     scope: str,
+    metrics: Optional[TokenMetrics] = None,
 ) -> Optional[TokenResult]:
     """Perform OBO exchange to get resource token (T2) for agent acting on behalf of user.
     
@@ -311,40 +718,51 @@ def perform_obo_exchange(
         t1_token: Blueprint impersonation token (T1)
         user_token: User token with Blueprint audience (Tc)
         scope: Target resource scope (e.g., https://cognitiveservices.azure.com/.default)
+        metrics: Statistics to record the request in
         
     Returns:
         TokenResult (T2 - OBO token) if successful, None otherwise
     """
-    token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
-    
-    data = {
-        "client_id": agent_identity_app_id,
-        "scope": scope,
-        "client_assertion_type": "urn:ietf:params:oauth:client-assertion-type:jwt-bearer",
-        "client_assertion": t1_token,
-        "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
-        "assertion": user_token,
-        "requested_token_use": "on_behalf_of",
-    }
+    return request_token(
+        tenant_id,
+        build_obo_request(
+            agent_identity_app_id=agent_identity_app_id,
+            t1_token=t1_token,
+            user_token=user_token,
+            scope=scope,
+        ),
+        "OBO exchange failed",
+        metrics,
+        "obo",
+    )
+
+
+def get_agent_app_token(
+    tenant_id: str,
+    agent_identity_app_id: str,
+    t1_token: str,
+    scope: str,
+    metrics: Optional[TokenMetrics] = None,
+) -> Optional[TokenResult]:
+    """Get an app-only token (T2) for the agent identity itself (no user).
     
-    with httpx.Client() as client:
-        response = client.post(
-            token_url,
-            data=data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        )
+    Args:
+        tenant_id: Azure AD tenant ID
+        agent_identity_app_id: Agent identity application ID
+        t1_token: Blueprint impersonation token (T1)
+        scope: Target resource scope
+        metrics: Statistics to record the request in
         
-        if response.status_code == 200:
-            result = response.json()
-            return TokenResult(
-                access_token=result["access_token"],
-                token_type=result.get("token_type", "Bearer"),
-                expires_in=result.get("expires_in", 0),
-            )
-        else:
-            error = response.json()
-            console.print(f"[red]OBO exchange failed: {error.get('error_description', error.get('error', 'Unknown error'))}[/red]")
-            return None
+    Returns:
+        TokenResult (T2 - app token) if successful, None otherwise
+    """
+    return request_token(
+        tenant_id,
+        build_agent_app_token_request(agent_identity_app_id, t1_token, scope),
+        "Agent app token request failed",
+        metrics,
+        "app",
+    )
 
 
 def get_obo_token(
@@ -403,89 +821,237 @@ def get_obo_token(
 
 
 class OBOTokenManager:
-    """Manages OBO tokens for multiple resource scopes."""
+    """Manages OBO tokens for multiple resource scopes.
+    
+    T1 and T2 tokens are cached with their expiry. A background thread
+    refreshes each token ``refresh_skew`` seconds before it expires, so
+    lookups on the request path are served from memory. Call latency,
+    cache hits and failures are recorded in ``metrics`` (see stats()).
+    """
     
     def __init__(
         self,
         tenant_id: str,
         blueprint_app_id: str,
-        blueprint_client_secret: str,
+        blueprint_client_secret: Optional[str],
         agent_identity_app_id: str,
         user_token: str,
+        refresh_skew: int = DEFAULT_REFRESH_SKEW_SECONDS,
+        background_refresh: bool = True,
+        token_store: Optional[TokenStore] = None,
+        blueprint_credential: Optional[ClientCredential] = None,
+        stale_while_revalidate: bool = True,
+        metrics: Optional[TokenMetrics] = None,
     ):
         """Initialize OBO token manager.
         
         Args:
             tenant_id: Azure AD tenant ID
             blueprint_app_id: Blueprint application ID
-            blueprint_client_secret: Blueprint client secret
+            blueprint_client_secret: Blueprint client secret (None if blueprint_credential is set)
             agent_identity_app_id: Agent identity application ID
             user_token: User token (Tc) with Blueprint audience
+            refresh_skew: Seconds before expiry at which tokens are refreshed
+            background_refresh: Refresh tokens in a background thread before they expire
+            token_store: Persistent or shared cache consulted before any network
+                exchange; acquisitions hold its per-key lock
+            blueprint_credential: Credential used for T1 instead of the client secret
+            stale_while_revalidate: Serve tokens inside the refresh window and
+                refresh them in a background thread instead of on the request path
+            metrics: Statistics to record into (a new TokenMetrics if omitted)
         """
         self.tenant_id = tenant_id
         self.blueprint_app_id = blueprint_app_id
         self.blueprint_client_secret = blueprint_client_secret
+        self.blueprint_credential = blueprint_credential
         self.agent_identity_app_id = agent_identity_app_id
         self.user_token = user_token
+        self.stale_while_revalidate = stale_while_revalidate
+        self.metrics = metrics or TokenMetrics()
+        self._token_store = token_store
+        self._user_key = user_cache_key(user_token) if token_store else ""
         
-        # Cache T1 token (reusable for different scopes)
-        self._t1_token: Optional[TokenResult] = None
+        # Cache T1 (reusable for different scopes) and T2 tokens by scope
+        self._cache = ExpiringTokenCache(refresh_skew=refresh_skew)
+        self._refresher: Optional[BackgroundRefresher] = None
+        if background_refresh:
+            self._refresher = BackgroundRefresher(
+                self._cache,
+                self._refresh_key,
+                name=f"obo-refresher-{agent_identity_app_id}",
+            )
+    
+    @property
+    def _t1_key(self) -> tuple[str, str]:
+        """Cache key for the T1 token."""
+        return ("t1", self.agent_identity_app_id)
+    
+    def _store_key(self, key: tuple[str, str]) -> tuple[str, str, str]:
+        """Persistent cache key (user, agent identity, scope) for a cache key."""
+        kind, value = key
+        if kind == "t1":
+            # T1 is not user-specific
+            return ("", self.agent_identity_app_id, "t1")
+        return (self._user_key, self.agent_identity_app_id, value)
+    
+    def _cache_token(self, key: tuple[str, str], token: TokenResult) -> None:
+        """Store a token and schedule its refresh."""
+        self._cache.put(key, token)
+        if self._refresher:
+            self._refresher.start()
+            self._refresher.wake()
+    
+    def _load_persisted(self, key: tuple[str, str], serve_stale: bool) -> Optional[TokenResult]:
+        """Load a token saved by a previous process into the in-memory cache."""
+        if not self._token_store:
+            return None
+        token = self._token_store.get(*self._store_key(key))
+        if token is None:
+            return None
+        if not serve_stale and token.is_expired(self._cache.skew_for(token)):
+            return None
+        self._cache_token(key, token)
+        return token
+    
+    def _acquire(
+        self,
+        key: tuple[str, str],
+        fetch: Callable[[], Optional[TokenResult]],
+    ) -> Optional[TokenResult]:
+        """Fetch a token, or take the one another replica stored meanwhile."""
+        token, from_store = acquire_shared(self._token_store, self._store_key(key), fetch, self._cache.skew_for)
+        if from_store:
+            self._cache_token(key, token)
+        return token
+    
+    def _get_cached(
+        self,
+        key: tuple[str, str],
+        fetch: Callable[[], Optional[TokenResult]],
+    ) -> Optional[TokenResult]:
+        """Get a cached token, fetching it on a miss.
+        
+        While the background refresher is running, tokens inside the refresh
+        window are still served (the refresher will replace them). Otherwise,
+        with stale-while-revalidate they are served while a one-off refresh
+        runs in the background; without it only tokens outside the refresh
+        window are returned.
+        """
+        serve_stale = bool(self._refresher and self._refresher.is_running)
+        missed = False
+        
+        def fetch_or_load() -> Optional[TokenResult]:
+            nonlocal missed
+            missed = True
+            return self._load_persisted(key, serve_stale=bool(self._refresher)) or self._acquire(key, fetch)
+        
+        if self.stale_while_revalidate and not serve_stale:
+            token = self._cache.get_or_revalidate(key, fetch_or_load, self._refresh_key)
+        else:
+            token = self._cache.get_or_fetch(key, fetch_or_load, serve_stale=serve_stale)
         
-        # Cache T2 tokens by scope
-        self._t2_tokens: dict[str, TokenResult] = {}
+        scope = self._metrics_scope(key)
+        self.metrics.record_cache(scope, CACHE_MISS if missed else CACHE_HIT)
+        self.metrics.record_use(scope, token)
+        return token
+    
+    @staticmethod
+    def _metrics_scope(key: tuple[str, str]) -> str:
+        """Scope under which a cache key is reported in the statistics."""
+        kind, value = key
+        return TOKEN_EXCHANGE_SCOPE if kind == "t1" else value
     
     def _get_t1_token(self) -> Optional[TokenResult]:
         """Get or cache T1 token."""
-        if self._t1_token is None:
+        return self._get_cached(self._t1_key, self._fetch_t1_token)
+    
+    def _fetch_t1_token(self, verbose: bool = True) -> Optional[TokenResult]:
+        """Acquire a new T1 token from Entra and cache it."""
+        if verbose:
             console.print("[dim]Getting T1 token (blueprint impersonation)...[/dim]")
-            self._t1_token = get_blueprint_token_with_fmi_path(
-                tenant_id=self.tenant_id,
-                blueprint_app_id=self.blueprint_app_id,
-                client_secret=self.blueprint_client_secret,
-                agent_identity_app_id=self.agent_identity_app_id,
-            )
-            if self._t1_token:
+        t1_token = get_blueprint_token_with_fmi_path(
+            tenant_id=self.tenant_id,
+            blueprint_app_id=self.blueprint_app_id,
+            client_secret=self.blueprint_client_secret,
+            credential=self.blueprint_credential,
+            agent_identity_app_id=self.agent_identity_app_id,
+            metrics=self.metrics,
+        )
+        if t1_token:
+            self._cache_token(self._t1_key, t1_token)
+            if verbose:
                 console.print("[green]✓ T1 token acquired[/green]")
-        return self._t1_token
+        return t1_token
     
-    def get_token_for_scope(self, scope: str) -> Optional[TokenResult]:
-        """Get an OBO token for the specified scope.
-        
-        Caches tokens to avoid repeated OBO exchanges for the same scope.
-        
-        Args:
-            scope: Target resource scope (e.g., https://cognitiveservices.azure.com/.default)
-            
-        Returns:
-            TokenResult (T2) for the scope, or None if exchange fails
-        """
-        # Check cache first
-        if scope in self._t2_tokens:
-            # TODO: Check expiration and refresh if needed
-            return self._t2_tokens[scope]
-        
-        # Get T1 if not already cached
+    def _fetch_token_for_scope(self, scope: str, verbose: bool = True) -> Optional[TokenResult]:
+        """Perform the OBO exchange for a scope and cache the result."""
         t1_token = self._get_t1_token()
         if not t1_token:
             console.print("[red]Failed to get T1 token[/red]")
             return None
         
-        # Perform OBO exchange
-        console.print(f"[dim]Getting OBO token for scope: {scope}[/dim]")
+        if verbose:
+            console.print(f"[dim]Getting OBO token for scope: {scope}[/dim]")
         t2_token = perform_obo_exchange(
             tenant_id=self.tenant_id,
             agent_identity_app_id=self.agent_identity_app_id,
             t1_token=t1_token.access_token,
             user_token=self.user_token,
             scope=scope,
+            metrics=self.metrics,
         )
         
         if t2_token:
-            self._t2_tokens[scope] = t2_token
-            console.print(f"[green]✓ OBO token acquired for {scope}[/green]")
+            self._cache_token(("t2", scope), t2_token)
+            if verbose:
+                console.print(f"[green]✓ OBO token acquired for {scope}[/green]")
         
         return t2_token
     
+    def _refresh_key(self, key: tuple[str, str]) -> Optional[TokenResult]:
+        """Re-acquire a cached token (called by the background refresher)."""
+        kind, value = key
+        self.metrics.record_cache(self._metrics_scope(key), CACHE_REFRESH)
+        if kind == "t1":
+            fetch = partial(self._fetch_t1_token, verbose=False)
+        else:
+            fetch = partial(self._fetch_token_for_scope, value, verbose=False)
+        with self._cache.lock(key):
+            return self._acquire(key, fetch)
+    
+    def get_token_for_scope(self, scope: str) -> Optional[TokenResult]:
+        """Get an OBO token for the specified scope.
+        
+        Caches tokens to avoid repeated OBO exchanges for the same scope.
+        Only the first request for a scope (or one after a failed refresh)
+        performs a synchronous exchange.
+        
+        Args:
+            scope: Target resource scope (e.g., https://cognitiveservices.azure.com/.default)
+            
+        Returns:
+            TokenResult (T2) for the scope, or None if exchange fails
+        """
+        return self._get_cached(("t2", scope), lambda: self._fetch_token_for_scope(scope))
+    
+    def update_user_token(self, user_token: str) -> None:
+        """Use a renewed user token (Tc) for subsequent OBO exchanges.
+        
+        Cached T2 tokens stay valid for the same user; they are dropped if
+        the new token belongs to a different user.
+        
+        Args:
+            user_token: New user token (Tc) with Blueprint audience
+        """
+        user_key = user_cache_key(user_token)
+        if user_key != user_cache_key(self.user_token):
+            for key in self._cache.keys():
+                if key[0] == "t2":
+                    self._cache.remove(key)
+        self.user_token = user_token
+        if self._token_store:
+            self._user_key = user_key
+    
     def get_azure_openai_token(self) -> Optional[TokenResult]:
         """Get OBO token for Azure OpenAI / Cognitive Services.
         
@@ -505,7 +1071,319 @@ class OBOTokenManager:
         """
         return self.get_token_for_scope(gateway_scope)
     
+    def stats(self) -> dict:
+        """Get token acquisition statistics (see TokenMetrics.snapshot)."""
+        return self.metrics.snapshot()
+    
     def clear_cache(self) -> None:
         """Clear all cached tokens."""
-        self._t1_token = None
-        self._t2_tokens.clear()
+        self._cache.clear()
+    
+    def close(self) -> None:
+        """Stop background refresh, clear all cached tokens and close the store."""
+        if self._refresher:
+            self._refresher.stop()
+        self.clear_cache()
+        if self._token_store:
+            self._token_store.close()
+
+
+class MultiUserOBOTokenManager:
+    """OBO token manager shared by many users and agent identities.
+    
+    T1 depends only on the agent identity, so one T1 per identity is shared
+    by all users. T2 tokens are cached per (user, agent identity, scope),
+    where the user is identified by a hash of their Tc unless the caller
+    passes a key derived from verified claims (``user_key``). The T2
+    cache is bounded: expired tokens are purged first, then the least
+    recently used entries are evicted. Tokens are refreshed on demand.
+    
+    get_t1_tokens() and get_tokens() acquire tokens for many agent
+    identities in one bounded parallel wave over the shared connection pool.
+    
+    With a shared ``token_store`` (see SQLiteTokenStore), replicas of the
+    server read each other's tokens and only one of them exchanges a given
+    key at a time.
+    """
+    
+    def __init__(
+        self,
+        tenant_id: str,
+        blueprint_app_id: str,
+        blueprint_client_secret: Optional[str],
+        refresh_skew: int = DEFAULT_REFRESH_SKEW_SECONDS,
+        max_entries: int = DEFAULT_MAX_CACHED_TOKENS,
+        blueprint_credential: Optional[ClientCredential] = None,
+        metrics: Optional[TokenMetrics] = None,
+        token_store: Optional[TokenStore] = None,
+    ):
+        """Initialize multi-user OBO token manager.
+        
+        Args:
+            tenant_id: Azure AD tenant ID
+            blueprint_app_id: Blueprint application ID
+            blueprint_client_secret: Blueprint client secret (None if blueprint_credential is set)
+            refresh_skew: Seconds before expiry at which tokens are refreshed
+            max_entries: Maximum number of cached T2 tokens
+            blueprint_credential: Credential used for T1 instead of the client secret
+            metrics: Statistics to record token requests into (a new TokenMetrics if omitted)
+            token_store: Cache shared with other replicas, consulted on a miss
+        """
+        self.tenant_id = tenant_id
+        self.blueprint_app_id = blueprint_app_id
+        self.blueprint_client_secret = blueprint_client_secret
+        self.blueprint_credential = blueprint_credential
+        self.metrics = metrics or TokenMetrics()
+        self._token_store = token_store
+        
+        self._t1_cache = ExpiringTokenCache(refresh_skew=refresh_skew, max_entries=max_entries)
+        self._t2_cache = ExpiringTokenCache(refresh_skew=refresh_skew, max_entries=max_entries)
+    
+    def get_t1_token(self, agent_identity_app_id: str) -> Optional[TokenResult]:
+        """Get the shared T1 token for an agent identity.
+        
+        Args:
+            agent_identity_app_id: Agent identity application ID (used as fmi_path)
+            
+        Returns:
+            TokenResult (T1) if successful, None otherwise
+        """
+        return self._t1_cache.get_or_fetch(
+            agent_identity_app_id,
+            partial(
+                self._acquire,
+                self._t1_cache,
+                agent_identity_app_id,
+                ("", agent_identity_app_id, "t1"),
+                partial(self._fetch_t1_token, agent_identity_app_id),
+            ),
+        )
+    
+    def _acquire(
+        self,
+        cache: ExpiringTokenCache,
+        key: Hashable,
+        store_key: tuple[str, str, str],
+        fetch: Callable[[], Optional[TokenResult]],
+    ) -> Optional[TokenResult]:
+        """Fetch a token, or take the one another replica stored meanwhile."""
+        token, from_store = acquire_shared(self._token_store, store_key, fetch, cache.skew_for)
+        if from_store:
+            cache.put(key, token)
+        return token
+    
+    def _fetch_t1_token(self, agent_identity_app_id: str) -> Optional[TokenResult]:
+        """Acquire a new T1 token from Entra and cache it."""
+        t1_token = get_blueprint_token_with_fmi_path(
+            tenant_id=self.tenant_id,
+            blueprint_app_id=self.blueprint_app_id,
+            client_secret=self.blueprint_client_secret,
+            credential=self.blueprint_credential,
+            agent_identity_app_id=agent_identity_app_id,
+            metrics=self.metrics,
+        )
+        if t1_token:
+            self._t1_cache.put(agent_identity_app_id, t1_token)
+        return t1_token
+    
+    def _fetch_token_for_scope(
+        self,
+        key: tuple[str, str, str],
+        user_token: str,
+    ) -> Optional[TokenResult]:
+        """Perform the OBO exchange for a (user, agent identity, scope) key."""
+        _, agent_identity_app_id, scope = key
+        t1_token = self.get_t1_token(agent_identity_app_id)
+        if not t1_token:
+            console.print("[red]Failed to get T1 token[/red]")
+            return None
+        
+        t2_token = perform_obo_exchange(
+            tenant_id=self.tenant_id,
+            agent_identity_app_id=agent_identity_app_id,
+            t1_token=t1_token.access_token,
+            user_token=user_token,
+            scope=scope,
+            metrics=self.metrics,
+        )
+        if t2_token:
+            self._t2_cache.put(key, t2_token)
+        return t2_token
+    
+    def get_token_for_scope(
+        self,
+        user_token: str,
+        agent_identity_app_id: str,
+        scope: str,
+        user_key: Optional[str] = None,
+    ) -> Optional[TokenResult]:
+        """Get an OBO token for a user, agent identity and scope.
+        
+        Args:
+            user_token: User token (Tc) with Blueprint audience
+            agent_identity_app_id: Agent identity application ID
+            scope: Target resource scope
+            user_key: Cache key of the user derived from verified claims;
+                defaults to hash_user_token(), so a token with forged
+                claims can never select another user's cached token
+            
+        Returns:
+            TokenResult (T2) for the scope, or None if exchange fails
+        """
+        key = (user_key or hash_user_token(user_token), agent_identity_app_id, scope)
+        return self._t2_cache.get_or_fetch(
+            key,
+            partial(self._acquire, self._t2_cache, key, key, partial(self._fetch_token_for_scope, key, user_token)),
+        )
+    
+    def _fetch_app_token(self, key: tuple[str, str, str]) -> Optional[TokenResult]:
+        """Acquire an app-only token for an ("", agent identity, scope) key."""
+        _, agent_identity_app_id, scope = key
+        t1_token = self.get_t1_token(agent_identity_app_id)
+        if not t1_token:
+            console.print("[red]Failed to get T1 token[/red]")
+            return None
+        
+        token = get_agent_app_token(
+            tenant_id=self.tenant_id,
+            agent_identity_app_id=agent_identity_app_id,
+            t1_token=t1_token.access_token,
+            scope=scope,
+            metrics=self.metrics,
+        )
+        if token:
+            self._t2_cache.put(key, token)
+        return token
+    
+    def get_app_token(self, agent_identity_app_id: str, scope: str) -> Optional[TokenResult]:
+        """Get an app-only token for an agent identity, shared by all callers.
+        
+        Args:
+            agent_identity_app_id: Agent identity application ID
+            scope: Target resource scope
+            
+        Returns:
+            TokenResult (T2) for the scope, or None if the exchange fails
+        """
+        key = ("", agent_identity_app_id, scope)
+        return self._t2_cache.get_or_fetch(
+            key,
+            partial(self._acquire, self._t2_cache, key, key, partial(self._fetch_app_token, key)),
+        )
+    
+    @staticmethod
+    def _fan_out(
+        calls: dict[Hashable, Callable[[], Optional[TokenResult]]],
+        max_concurrency: int,
+    ) -> dict[Hashable, Optional[TokenResult]]:
+        """Run token acquisitions concurrently, at most ``max_concurrency`` at a time."""
+        if not calls:
+            return {}
+        workers = max(1, min(max_concurrency, len(calls)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="token-fanout") as pool:
+            futures = {key: pool.submit(call) for key, call in calls.items()}
+            return {key: future.result() for key, future in futures.items()}
+    
+    def get_t1_tokens(
+        self,
+        agent_identity_app_ids: list[str],
+        max_concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+    ) -> dict[str, Optional[TokenResult]]:
+        """Get the T1 tokens for many agent identities in parallel.
+        
+        Args:
+            agent_identity_app_ids: Agent identity application IDs (one fmi_path each)
+            max_concurrency: Maximum number of T1 requests in flight
+            
+        Returns:
+            Dict of agent identity -> T1 (None where acquisition failed)
+        """
+        return self._fan_out(
+            {agent_id: partial(self.get_t1_token, agent_id) for agent_id in dict.fromkeys(agent_identity_app_ids)},
+            max_concurrency,
+        )
+    
+    def get_tokens(
+        self,
+        requests: list[tuple[str, str]],
+        user_token: Optional[str] = None,
+        max_concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+        user_key: Optional[str] = None,
+    ) -> dict[tuple[str, str], Optional[TokenResult]]:
+        """Get tokens for many (agent identity, scope) pairs in parallel.
+        
+        The distinct agent identities' T1 tokens are acquired first in their
+        own wave, so workers never sit blocked on another request's T1; the
+        batch then costs about one T1 plus one T2 round trip when
+        ``max_concurrency`` covers it.
+        
+        Args:
+            requests: (agent identity application ID, scope) pairs
+            user_token: User token (Tc) for OBO tokens; app-only tokens if None
+            max_concurrency: Maximum number of token requests in flight
+            user_key: Verified cache key of the user (see get_token_for_scope)
+            
+        Returns:
+            Dict of (agent identity, scope) -> token (None where acquisition failed)
+        """
+        def acquire(agent_id: str, scope: str) -> Optional[TokenResult]:
+            if user_token:
+                return self.get_token_for_scope(user_token, agent_id, scope, user_key=user_key)
+            return self.get_app_token(agent_id, scope)
+        
+        self.get_t1_tokens([agent_id for agent_id, _ in requests], max_concurrency)
+        return self._fan_out(
+            {pair: partial(acquire, *pair) for pair in dict.fromkeys(requests)},
+            max_concurrency,
+        )
+    
+    def evict_user(self, user_token: Optional[str] = None, user_key: Optional[str] = None) -> int:
+        """Drop all cached T2 tokens for a user (e.g. on sign-out).
+        
+        Args:
+            user_token: The token (Tc) the tokens were requested with
+            user_key: The user key they were requested with (see
+                get_token_for_scope); takes precedence over ``user_token``
+            
+        Returns:
+            Number of tokens removed
+            
+        Raises:
+            ValueError: If neither user_token nor user_key is given
+        """
+        if not (user_key or user_token):
+            raise ValueError("user_token or user_key is required")
+        user_key = user_key or hash_user_token(user_token)
+        keys = [key for key in self._t2_cache.keys() if key[0] == user_key]
+        for key in keys:
+            self._t2_cache.remove(key)
+        return len(keys)
+    
+    def purge_expired(self) -> int:
+        """Remove expired T1 and T2 tokens.
+        
+        Returns:
+            Number of tokens removed
+        """
+        return self._t1_cache.purge_expired() + self._t2_cache.purge_expired()
+    
+    def cache_info(self) -> dict[str, int]:
+        """Get cache occupancy and eviction counts."""
+        return {
+            "t1_tokens": len(self._t1_cache),
+            "t2_tokens": len(self._t2_cache),
+            "max_entries": self._t2_cache.max_entries,
+            "evictions": self._t1_cache.evictions + self._t2_cache.evictions,
+            "expirations": self._t1_cache.expirations + self._t2_cache.expirations,
+        }
+    
+    def clear_cache(self) -> None:
+        """Clear all cached tokens."""
+        self._t1_cache.clear()
+        self._t2_cache.clear()
+    
+    def close(self) -> None:
+        """Clear all cached tokens and close the token store."""
+        self.clear_cache()
+        if self._token_store:
+            self._token_store.close()
@@ -8,12 +8,25 @@ from typing import Optional
 from dotenv import load_dotenv
 
 from .models import MCPServer
+from .credentials import DEFAULT_FEDERATED_TOKEN_FILE, FEDERATED_TOKEN_FILE_ENV
+from .history import DEFAULT_CHAT_HISTORY_TOKEN_BUDGET
+from .transport import DEFAULT_AUTHORITY_HOST
+from .token_cache import DEFAULT_MAX_CACHED_TOKENS, DEFAULT_REFRESH_SKEW_SECONDS
 
 
 # Default config file location
 DEFAULT_CONFIG_PATH = Path.home() / ".ai-agent-cli.json"
 
 
+def _parse_bool(value, default: bool = False) -> bool:
+    """Parse a boolean from a config or environment value."""
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
 class Config:
     """Manages CLI configuration including Azure OpenAI settings and MCP servers."""
     
@@ -40,11 +53,18 @@ class Config:
         self._azure_openai_deployment_env = os.getenv("AZURE_OPENAI_DEPLOYMENT")
         self._azure_openai_api_version_env = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
         self._azure_openai_api_key_env = os.getenv("AZURE_OPENAI_API_KEY")
+        self._chat_stream_env = os.getenv("CHAT_STREAM")
+        self._chat_history_token_budget_env = os.getenv("CHAT_HISTORY_TOKEN_BUDGET")
+        self._chat_summary_deployment_env = os.getenv("CHAT_SUMMARY_DEPLOYMENT")
         
         # Blueprint and Agent Identity for OBO flows
         self._blueprint_app_id_env = os.getenv("BLUEPRINT_APP_ID")
         self._blueprint_client_secret_env = os.getenv("BLUEPRINT_CLIENT_SECRET")
+        self._federated_token_file_env = os.getenv(FEDERATED_TOKEN_FILE_ENV)
+        self._blueprint_certificate_path_env = os.getenv("BLUEPRINT_CERTIFICATE_PATH")
+        self._blueprint_certificate_password_env = os.getenv("BLUEPRINT_CERTIFICATE_PASSWORD")
         self._agent_identity_app_id_env = os.getenv("AGENT_IDENTITY_APP_ID")
+        self._agent_identity_app_ids_env = os.getenv("AGENT_IDENTITY_APP_IDS")
         
         # MCP Server for OBO tokens (audience for MCP/Gateway calls)
         self._mcp_server_app_id_env = os.getenv("MCP_SERVER_APP_ID")
@@ -56,6 +76,20 @@ class Config:
         self._sidecar_url_env = os.getenv("SIDECAR_URL", "http://localhost:5000")
         self._sidecar_openai_api_name_env = os.getenv("SIDECAR_OPENAI_API_NAME", "openai")
         self._sidecar_mcp_api_name_env = os.getenv("SIDECAR_MCP_API_NAME", "mcp")
+        
+        # Token caching: refresh tokens this many seconds before they expire
+        self._token_refresh_skew_env = os.getenv("TOKEN_REFRESH_SKEW_SECONDS")
+        self._token_background_refresh_env = os.getenv("TOKEN_BACKGROUND_REFRESH")
+        self._token_stale_while_revalidate_env = os.getenv("TOKEN_STALE_WHILE_REVALIDATE")
+        self._token_cache_max_entries_env = os.getenv("TOKEN_CACHE_MAX_ENTRIES")
+        self._token_persistent_cache_env = os.getenv("TOKEN_PERSISTENT_CACHE")
+        self._token_shared_cache_path_env = os.getenv("TOKEN_SHARED_CACHE_PATH")
+        
+        # Token endpoint transport (pooled keep-alive client to Entra)
+        self._token_http_timeout_env = os.getenv("TOKEN_HTTP_TIMEOUT_SECONDS")
+        self._token_http2_env = os.getenv("TOKEN_HTTP2")
+        self._token_http_max_attempts_env = os.getenv("TOKEN_HTTP_MAX_ATTEMPTS")
+        self._authority_host_env = os.getenv("AZURE_AUTHORITY_HOST")
     
     def _load_config(self) -> None:
         """Load configuration from file."""
@@ -154,6 +188,59 @@ class Config:
         self._data["azure_openai_api_key"] = value
         self._save_config()
     
+    # Streaming Chat
+    @property
+    def chat_stream(self) -> bool:
+        """Get whether chat responses (including tool-call rounds) are streamed.
+        
+        Default: true
+        """
+        value = self._data.get("chat_stream")
+        if value is None:
+            value = self._chat_stream_env
+        return _parse_bool(value, default=True)
+    
+    @chat_stream.setter
+    def chat_stream(self, value: bool) -> None:
+        """Set streaming chat in config."""
+        self._data["chat_stream"] = bool(value)
+        self._save_config()
+    
+    # Conversation History Budget
+    @property
+    def chat_history_token_budget(self) -> int:
+        """Get the estimated prompt tokens above which older history is compacted.
+        
+        0 disables compaction. Default: 32000
+        """
+        value = self._data.get("chat_history_token_budget")
+        if value is None:
+            value = self._chat_history_token_budget_env
+        return int(value) if value not in (None, "") else DEFAULT_CHAT_HISTORY_TOKEN_BUDGET
+    
+    @chat_history_token_budget.setter
+    def chat_history_token_budget(self, value: int) -> None:
+        """Set conversation history token budget in config."""
+        if value < 0:
+            raise ValueError("chat_history_token_budget must be >= 0")
+        self._data["chat_history_token_budget"] = value
+        self._save_config()
+    
+    # Summary Deployment
+    @property
+    def chat_summary_deployment(self) -> Optional[str]:
+        """Get the (cheaper) deployment that summarizes compacted history.
+        
+        Defaults to the chat deployment when not set.
+        """
+        return self._data.get("chat_summary_deployment") or self._chat_summary_deployment_env
+    
+    @chat_summary_deployment.setter
+    def chat_summary_deployment(self, value: str) -> None:
+        """Set summary deployment in config."""
+        self._data["chat_summary_deployment"] = value
+        self._save_config()
+    
     # Blueprint App ID (for OBO flows)
     @property
     def blueprint_app_id(self) -> Optional[str]:
@@ -178,6 +265,43 @@ class Config:
         self._data["blueprint_client_secret"] = value
         self._save_config()
     
+    # Blueprint Certificate (signed client assertion instead of the secret)
+    @property
+    def blueprint_certificate_path(self) -> Optional[str]:
+        """Get the PEM file (private key + certificate) used to sign Blueprint assertions."""
+        return self._data.get("blueprint_certificate_path") or self._blueprint_certificate_path_env
+    
+    @blueprint_certificate_path.setter
+    def blueprint_certificate_path(self, value: str) -> None:
+        """Set Blueprint certificate path in config."""
+        self._data["blueprint_certificate_path"] = value
+        self._save_config()
+    
+    @property
+    def blueprint_certificate_password(self) -> Optional[str]:
+        """Get the Blueprint certificate key password from environment."""
+        return self._blueprint_certificate_password_env
+    
+    # Federated Token File (workload identity credential for the Blueprint)
+    @property
+    def federated_token_file(self) -> Optional[str]:
+        """Get the projected service account token used instead of the Blueprint secret.
+        
+        Defaults to the path mounted by the Kubernetes manifests if it exists.
+        """
+        value = self._data.get("federated_token_file") or self._federated_token_file_env
+        if value:
+            return value
+        if os.path.exists(DEFAULT_FEDERATED_TOKEN_FILE):
+            return DEFAULT_FEDERATED_TOKEN_FILE
+        return None
+    
+    @federated_token_file.setter
+    def federated_token_file(self, value: str) -> None:
+        """Set federated token file in config."""
+        self._data["federated_token_file"] = value
+        self._save_config()
+    
     # Agent Identity App ID (for OBO flows)
     @property
     def agent_identity_app_id(self) -> Optional[str]:
@@ -190,6 +314,25 @@ class Config:
         self._data["agent_identity_app_id"] = value
         self._save_config()
     
+    # All agent identities hosted under the Blueprint (multi-agent hosts)
+    @property
+    def agent_identity_app_ids(self) -> list[str]:
+        """Get the agent identity application IDs hosted by this process.
+        
+        Read from AGENT_IDENTITY_APP_IDS (comma-separated); AGENT_IDENTITY_APP_ID
+        is always included first when set.
+        """
+        ids = self._data.get("agent_identity_app_ids") or (self._agent_identity_app_ids_env or "").split(",")
+        if self.agent_identity_app_id:
+            ids = [self.agent_identity_app_id, *ids]
+        return list(dict.fromkeys(i.strip() for i in ids if i and i.strip()))
+    
+    @agent_identity_app_ids.setter
+    def agent_identity_app_ids(self, value: list[str]) -> None:
+        """Set agent identity application IDs in config."""
+        self._data["agent_identity_app_ids"] = [v.strip() for v in value if v.strip()]
+        self._save_config()
+    
     # MCP Server App ID (for OBO tokens to MCP/Gateway)
     @property
     def mcp_server_app_id(self) -> Optional[str]:
@@ -274,6 +417,182 @@ class Config:
         self._data["sidecar_mcp_api_name"] = value
         self._save_config()
     
+    # Token Refresh Skew
+    @property
+    def token_refresh_skew_seconds(self) -> int:
+        """Get how many seconds before expiry cached tokens are refreshed.
+        
+        Default: 300
+        """
+        value = self._data.get("token_refresh_skew_seconds") or self._token_refresh_skew_env
+        return int(value) if value else DEFAULT_REFRESH_SKEW_SECONDS
+    
+    @token_refresh_skew_seconds.setter
+    def token_refresh_skew_seconds(self, value: int) -> None:
+        """Set token refresh skew in config."""
+        if value < 0:
+            raise ValueError("token_refresh_skew_seconds must be >= 0")
+        self._data["token_refresh_skew_seconds"] = value
+        self._save_config()
+    
+    # Token Background Refresh
+    @property
+    def token_background_refresh(self) -> bool:
+        """Get whether cached tokens are refreshed in a background thread.
+        
+        Default: true
+        """
+        value = self._data.get("token_background_refresh")
+        if value is None:
+            value = self._token_background_refresh_env
+        return _parse_bool(value, default=True)
+    
+    @token_background_refresh.setter
+    def token_background_refresh(self, value: bool) -> None:
+        """Set token background refresh in config."""
+        self._data["token_background_refresh"] = bool(value)
+        self._save_config()
+    
+    # Token Stale-While-Revalidate
+    @property
+    def token_stale_while_revalidate(self) -> bool:
+        """Get whether tokens in the refresh window are served while refreshed asynchronously.
+        
+        Default: true
+        """
+        value = self._data.get("token_stale_while_revalidate")
+        if value is None:
+            value = self._token_stale_while_revalidate_env
+        return _parse_bool(value, default=True)
+    
+    @token_stale_while_revalidate.setter
+    def token_stale_while_revalidate(self, value: bool) -> None:
+        """Set token stale-while-revalidate in config."""
+        self._data["token_stale_while_revalidate"] = bool(value)
+        self._save_config()
+    
+    # Token Cache Size
+    @property
+    def token_cache_max_entries(self) -> int:
+        """Get the maximum number of per-user tokens kept in memory.
+        
+        Default: 1000
+        """
+        value = self._data.get("token_cache_max_entries") or self._token_cache_max_entries_env
+        return int(value) if value else DEFAULT_MAX_CACHED_TOKENS
+    
+    @token_cache_max_entries.setter
+    def token_cache_max_entries(self, value: int) -> None:
+        """Set token cache size in config."""
+        if value < 1:
+            raise ValueError("token_cache_max_entries must be >= 1")
+        self._data["token_cache_max_entries"] = value
+        self._save_config()
+    
+    # Persistent Token Cache
+    @property
+    def token_persistent_cache(self) -> bool:
+        """Get whether OBO tokens are kept in an encrypted on-disk cache.
+        
+        Lets restarts reuse still-valid T1/T2 tokens. Default: false
+        """
+        value = self._data.get("token_persistent_cache")
+        if value is None:
+            value = self._token_persistent_cache_env
+        return _parse_bool(value, default=False)
+    
+    @token_persistent_cache.setter
+    def token_persistent_cache(self, value: bool) -> None:
+        """Set persistent token cache in config."""
+        self._data["token_persistent_cache"] = bool(value)
+        self._save_config()
+    
+    # Shared Token Cache
+    @property
+    def token_shared_cache_path(self) -> Optional[str]:
+        """Get the SQLite token cache shared by replicas (e.g. on a shared volume).
+        
+        When set, it replaces the per-process persistent cache and only one
+        replica acquires a given token at a time.
+        """
+        return self._data.get("token_shared_cache_path") or self._token_shared_cache_path_env
+    
+    @token_shared_cache_path.setter
+    def token_shared_cache_path(self, value: str) -> None:
+        """Set shared token cache path in config."""
+        self._data["token_shared_cache_path"] = value
+        self._save_config()
+    
+    # Token Endpoint HTTP Timeout
+    @property
+    def token_http_timeout_seconds(self) -> float:
+        """Get the timeout for Entra token endpoint requests.
+        
+        Default: 30
+        """
+        value = self._data.get("token_http_timeout_seconds") or self._token_http_timeout_env
+        return float(value) if value else 30.0
+    
+    @token_http_timeout_seconds.setter
+    def token_http_timeout_seconds(self, value: float) -> None:
+        """Set token endpoint timeout in config."""
+        if value <= 0:
+            raise ValueError("token_http_timeout_seconds must be > 0")
+        self._data["token_http_timeout_seconds"] = value
+        self._save_config()
+    
+    # Token Endpoint Retries
+    @property
+    def token_http_max_attempts(self) -> int:
+        """Get the attempts per Entra token request (429/5xx and connection errors are retried).
+        
+        Default: 3
+        """
+        value = self._data.get("token_http_max_attempts") or self._token_http_max_attempts_env
+        return int(value) if value else 3
+    
+    @token_http_max_attempts.setter
+    def token_http_max_attempts(self, value: int) -> None:
+        """Set token endpoint attempts in config."""
+        if value < 1:
+            raise ValueError("token_http_max_attempts must be >= 1")
+        self._data["token_http_max_attempts"] = value
+        self._save_config()
+    
+    # Token Endpoint HTTP/2
+    @property
+    def token_http2(self) -> bool:
+        """Get whether HTTP/2 is used for Entra token endpoint requests.
+        
+        Requires the optional 'h2' package. Default: false
+        """
+        value = self._data.get("token_http2")
+        if value is None:
+            value = self._token_http2_env
+        return _parse_bool(value, default=False)
+    
+    @token_http2.setter
+    def token_http2(self, value: bool) -> None:
+        """Set token endpoint HTTP/2 in config."""
+        self._data["token_http2"] = bool(value)
+        self._save_config()
+    
+    # Authority Host (token endpoint base URL)
+    @property
+    def authority_host(self) -> str:
+        """Get the Microsoft Entra authority host used for token exchanges.
+        
+        Point it at a local mock (see benchmarks/) to test without Entra.
+        Default: https://login.microsoftonline.com
+        """
+        return self._data.get("authority_host") or self._authority_host_env or DEFAULT_AUTHORITY_HOST
+    
+    @authority_host.setter
+    def authority_host(self, value: str) -> None:
+        """Set authority host in config."""
+        self._data["authority_host"] = value
+        self._save_config()
+    
     # MCP Servers
     def add_mcp_server(self, server: MCPServer) -> None:
         """Add an MCP server to config.
@@ -353,9 +672,13 @@ class Config:
                 # Agent identity is required (passed to sidecar)
                 return base_config and bool(self.sidecar_url and self.agent_identity_app_id)
             else:
-                # Direct mode: need blueprint secret and agent identity
+                # Direct mode: need a blueprint credential and agent identity
                 return base_config and bool(
-                    self.blueprint_client_secret and
+                    (
+                        self.blueprint_client_secret
+                        or self.blueprint_certificate_path
+                        or self.federated_token_file
+                    ) and
                     self.agent_identity_app_id
                 )
 
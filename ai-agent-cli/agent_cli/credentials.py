@@ -0,0 +1,238 @@
+"""Client credentials used by the Blueprint to authenticate the T1 request."""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Protocol, runtime_checkable
+
+from .models import TokenResult
+from .transport import token_endpoint_url
+
+
+# Projected service account token mounted by the Kubernetes manifests
+DEFAULT_FEDERATED_TOKEN_FILE = "/var/run/secrets/tokens/azure-identity-token"
+
+# Environment variable set by the Azure Workload Identity webhook
+FEDERATED_TOKEN_FILE_ENV = "AZURE_FEDERATED_TOKEN_FILE"
+
+# client_assertion_type for JWT client assertions
+JWT_BEARER_ASSERTION_TYPE = "urn:ietf:params:oauth:client-assertion-type:jwt-bearer"
+
+# Re-read (or re-sign) assertions this many seconds before they expire
+DEFAULT_ASSERTION_REFRESH_SKEW_SECONDS = 60
+
+# Lifetime of assertions signed with a certificate
+DEFAULT_ASSERTION_LIFETIME_SECONDS = 600
+
+
+def _b64url(data: bytes) -> str:
+    """Base64url-encode without padding (JWT encoding)."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+@runtime_checkable
+class ClientCredential(Protocol):
+    """Source of client authentication fields for a token request."""
+    
+    def client_auth_fields(self) -> dict:
+        """Get the form fields that authenticate the client.
+        
+        Returns:
+            Either ``client_secret`` or ``client_assertion_type`` + ``client_assertion``
+        """
+        ...
+
+
+class ClientSecretCredential:
+    """Authenticates with a client secret."""
+    
+    def __init__(self, client_secret: str):
+        """Initialize with a client secret.
+        
+        Args:
+            client_secret: Application client secret
+        """
+        self.client_secret = client_secret
+    
+    def client_auth_fields(self) -> dict:
+        """Get the client_secret form field."""
+        return {"client_secret": self.client_secret}
+
+
+class FederatedTokenFileCredential:
+    """Authenticates with a federated (workload identity) token read from a file.
+    
+    Kubernetes projects a short-lived service account token into the pod and
+    rotates it in place. The token is kept in memory and the file is only
+    re-read when its mtime changes or the cached token nears expiry.
+    """
+    
+    def __init__(
+        self,
+        token_file: Optional[str] = None,
+        refresh_skew: int = DEFAULT_ASSERTION_REFRESH_SKEW_SECONDS,
+    ):
+        """Initialize the credential.
+        
+        Args:
+            token_file: Path to the projected token (defaults to
+                AZURE_FEDERATED_TOKEN_FILE, then the path used by the manifests)
+            refresh_skew: Seconds before expiry at which the file is re-read
+        """
+        self.token_file = Path(
+            token_file or os.getenv(FEDERATED_TOKEN_FILE_ENV) or DEFAULT_FEDERATED_TOKEN_FILE
+        )
+        self.refresh_skew = refresh_skew
+        self._assertion: Optional[TokenResult] = None
+        self._mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def get_assertion(self) -> str:
+        """Get the current federated token.
+        
+        Returns:
+            The projected token
+            
+        Raises:
+            OSError: If the token file cannot be read
+            ValueError: If the token file is empty
+        """
+        with self._lock:
+            mtime_ns = self.token_file.stat().st_mtime_ns
+            if (
+                self._assertion is None
+                or mtime_ns != self._mtime_ns
+                or self._assertion.is_expired(self.refresh_skew)
+            ):
+                token = self.token_file.read_text().strip()
+                if not token:
+                    raise ValueError(f"Federated token file is empty: {self.token_file}")
+                self._assertion = TokenResult(access_token=token)
+                self._mtime_ns = mtime_ns
+            return self._assertion.access_token
+    
+    def client_auth_fields(self) -> dict:
+        """Get the client_assertion form fields."""
+        return {
+            "client_assertion_type": JWT_BEARER_ASSERTION_TYPE,
+            "client_assertion": self.get_assertion(),
+        }
+
+
+class CertificateCredential:
+    """Authenticates with a JWT client assertion signed by a certificate key.
+    
+    The PEM file must contain the private key and the certificate registered
+    on the application. The key is loaded once, and each signed assertion is
+    reused until shortly before it expires, so RSA signing happens once per
+    assertion lifetime rather than once per token request.
+    """
+    
+    def __init__(
+        self,
+        tenant_id: str,
+        client_id: str,
+        certificate_path: str,
+        password: Optional[str] = None,
+        lifetime: int = DEFAULT_ASSERTION_LIFETIME_SECONDS,
+        refresh_skew: int = DEFAULT_ASSERTION_REFRESH_SKEW_SECONDS,
+    ):
+        """Initialize the credential.
+        
+        Args:
+            tenant_id: Azure AD tenant ID (the assertion audience is its token endpoint)
+            client_id: Application (client) ID, used as issuer and subject
+            certificate_path: PEM file with the private key and certificate
+            password: Password of the private key, if encrypted
+            lifetime: Seconds each signed assertion is valid for
+            refresh_skew: Seconds before expiry at which a new assertion is signed
+        """
+        self.tenant_id = tenant_id
+        self.client_id = client_id
+        self.certificate_path = Path(certificate_path)
+        self.password = password
+        self.lifetime = lifetime
+        self.refresh_skew = refresh_skew
+        self._private_key = None
+        self._thumbprint: Optional[str] = None
+        self._assertion: Optional[TokenResult] = None
+        self._lock = threading.Lock()
+    
+    def _load_certificate(self) -> None:
+        """Load the private key and certificate thumbprint (once)."""
+        if self._private_key is not None:
+            return
+        from cryptography import x509
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        
+        pem = self.certificate_path.read_bytes()
+        try:
+            private_key = serialization.load_pem_private_key(
+                pem,
+                password=self.password.encode() if self.password else None,
+            )
+        except TypeError as e:
+            # Raised for a missing or unexpected password
+            raise ValueError(str(e)) from e
+        if not isinstance(private_key, rsa.RSAPrivateKey):
+            raise ValueError(f"Certificate key must be an RSA key: {self.certificate_path}")
+        certificate = x509.load_pem_x509_certificate(pem)
+        der = certificate.public_bytes(serialization.Encoding.DER)
+        self._thumbprint = _b64url(hashlib.sha1(der).digest())
+        self._private_key = private_key
+    
+    def _sign(self) -> TokenResult:
+        """Sign a new client assertion (RS256 with x5t header)."""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+        
+        now = int(time.time())
+        header = {"alg": "RS256", "typ": "JWT", "x5t": self._thumbprint}
+        payload = {
+            "aud": token_endpoint_url(self.tenant_id),
+            "iss": self.client_id,
+            "sub": self.client_id,
+            "jti": str(uuid.uuid4()),
+            "nbf": now,
+            "iat": now,
+            "exp": now + self.lifetime,
+        }
+        signing_input = (
+            f"{_b64url(json.dumps(header, separators=(',', ':')).encode())}."
+            f"{_b64url(json.dumps(payload, separators=(',', ':')).encode())}"
+        )
+        signature = self._private_key.sign(signing_input.encode(), padding.PKCS1v15(), hashes.SHA256())
+        return TokenResult(
+            access_token=f"{signing_input}.{_b64url(signature)}",
+            expires_in=self.lifetime,
+            acquired_at=now,
+        )
+    
+    def get_assertion(self) -> str:
+        """Get a signed client assertion, reusing the current one while valid.
+        
+        Returns:
+            Signed JWT assertion
+            
+        Raises:
+            OSError: If the certificate file cannot be read
+            ValueError: If the key or certificate cannot be loaded
+        """
+        with self._lock:
+            if self._assertion is None or self._assertion.is_expired(self.refresh_skew):
+                self._load_certificate()
+                self._assertion = self._sign()
+            return self._assertion.access_token
+    
+    def client_auth_fields(self) -> dict:
+        """Get the client_assertion form fields."""
+        return {
+            "client_assertion_type": JWT_BEARER_ASSERTION_TYPE,
+            "client_assertion": self.get_assertion(),
+        }
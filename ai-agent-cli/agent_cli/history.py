@@ -0,0 +1,208 @@
+"""Token-budgeted conversation history with automatic compaction."""
+
+from typing import Awaitable, Callable, Optional
+
+from .models import ChatMessage
+
+
+# Characters per token used to estimate message sizes (English text / JSON)
+CHARS_PER_TOKEN = 4
+
+# Per-message token overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Characters of JSON around each tool call (id, type, field names)
+TOOL_CALL_OVERHEAD_CHARS = 80
+
+# Default prompt token budget of the CLI conversation
+DEFAULT_CHAT_HISTORY_TOKEN_BUDGET = 32000
+
+# Most recent user turns always kept verbatim
+DEFAULT_KEEP_RECENT_TURNS = 4
+
+# Tool outputs outside the recent turns are cut to this many characters
+DEFAULT_TOOL_OUTPUT_LIMIT = 1000
+
+# Note appended to truncated tool outputs (with the omitted character count)
+TRUNCATION_NOTE = "\n[... {omitted} characters of tool output omitted]"
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+SUMMARY_PROMPT = """Summarize the following conversation between a user and an AI assistant so that the assistant can continue it.
+Keep facts, decisions, names, identifiers and open questions; drop pleasantries and verbatim tool output.
+Reply with the summary only."""
+
+
+def estimate_tokens(message: ChatMessage) -> int:
+    """Estimate the prompt tokens a message costs.
+    
+    Args:
+        message: Conversation message
+        
+    Returns:
+        Approximate token count (characters / CHARS_PER_TOKEN plus overhead)
+    """
+    chars = len(message.content or "")
+    for tool_call in message.tool_calls or []:
+        function = tool_call["function"]
+        chars += TOOL_CALL_OVERHEAD_CHARS + len(function["name"]) + len(function["arguments"])
+    return MESSAGE_OVERHEAD_TOKENS + chars // CHARS_PER_TOKEN
+
+
+def format_transcript(messages: list[ChatMessage]) -> str:
+    """Render messages as plain text for the summarizer."""
+    lines = []
+    for message in messages:
+        if message.tool_calls:
+            calls = ", ".join(
+                f"{tc['function']['name']}({tc['function']['arguments']})" for tc in message.tool_calls
+            )
+            lines.append(f"assistant called: {calls}")
+        if message.content:
+            label = f"tool {message.name}" if message.role == "tool" else message.role
+            lines.append(f"{label}: {message.content}")
+    return "\n".join(lines)
+
+
+class HistoryManager:
+    """Keeps a conversation within a prompt token budget.
+    
+    The system prompt and the last ``keep_recent_turns`` user turns are
+    always sent verbatim. When the estimated size exceeds ``token_budget``:
+    
+    1. Tool outputs in older turns are cut to ``tool_output_limit`` characters.
+    2. If still over budget, the oldest turns are replaced by a summary
+       (from ``summarize``) or, without a summarizer or if it fails, dropped.
+       
+    Whole turns are compacted at a time, so an assistant message with tool
+    calls is never separated from its tool results.
+    """
+    
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        keep_recent_turns: int = DEFAULT_KEEP_RECENT_TURNS,
+        tool_output_limit: int = DEFAULT_TOOL_OUTPUT_LIMIT,
+    ):
+        """Initialize the history manager.
+        
+        Args:
+            token_budget: Maximum estimated prompt tokens (None for unlimited)
+            keep_recent_turns: User turns always kept verbatim
+            tool_output_limit: Characters kept of each older tool output
+        """
+        self.token_budget = token_budget
+        self.keep_recent_turns = keep_recent_turns
+        self.tool_output_limit = tool_output_limit
+        self.compactions = 0
+    
+    def token_count(self, conversation: list[ChatMessage]) -> int:
+        """Estimate the prompt tokens of a conversation."""
+        return sum(estimate_tokens(message) for message in conversation)
+    
+    def over_budget(self, conversation: list[ChatMessage]) -> bool:
+        """Check whether a conversation exceeds the token budget."""
+        return bool(self.token_budget) and self.token_count(conversation) > self.token_budget
+    
+    def _recent_start(self, conversation: list[ChatMessage]) -> int:
+        """Index of the first message of the turns kept verbatim."""
+        turns = 0
+        for i in range(len(conversation) - 1, 0, -1):
+            if conversation[i].role == "user":
+                turns += 1
+                if turns >= self.keep_recent_turns:
+                    return i
+        return 1
+    
+    def _truncate_tool_outputs(self, conversation: list[ChatMessage], end: int) -> bool:
+        """Cut older tool outputs to the limit; returns True if any changed.
+        
+        The note counts towards the limit, so a truncated output is never
+        truncated again (which would lose the original omitted count).
+        """
+        truncated_suffix = TRUNCATION_NOTE.split("}", 1)[1]
+        changed = False
+        for i in range(1, end):
+            message = conversation[i]
+            content = message.content or ""
+            if message.role != "tool" or len(content) <= self.tool_output_limit or content.endswith(truncated_suffix):
+                continue
+            # Size the note for the largest possible count so the result fits
+            keep = max(self.tool_output_limit - len(TRUNCATION_NOTE.format(omitted=len(content))), 0)
+            conversation[i] = ChatMessage(
+                role="tool",
+                content=content[:keep] + TRUNCATION_NOTE.format(omitted=len(content) - keep),
+                tool_call_id=message.tool_call_id,
+                name=message.name,
+            )
+            changed = True
+        return changed
+    
+    def _compaction_end(self, conversation: list[ChatMessage]) -> int:
+        """End (exclusive) of the oldest turns to compact, or 0 if none.
+        
+        Takes whole turns from the start until the rest fits the budget,
+        never reaching into the recent turns.
+        """
+        recent_start = self._recent_start(conversation)
+        excess = self.token_count(conversation) - self.token_budget
+        freed = 0
+        end = 0
+        for i in range(1, recent_start):
+            freed += estimate_tokens(conversation[i])
+            if conversation[i + 1].role == "user":
+                end = i + 1
+                if freed >= excess:
+                    break
+        return end
+    
+    def _plan(self, conversation: list[ChatMessage]) -> int:
+        """Truncate old tool outputs, then find the turns still to compact."""
+        if not self.over_budget(conversation):
+            return 0
+        recent_start = self._recent_start(conversation)
+        if self._truncate_tool_outputs(conversation, recent_start):
+            self.compactions += 1
+            if not self.over_budget(conversation):
+                return 0
+        return self._compaction_end(conversation)
+    
+    def _replace(self, conversation: list[ChatMessage], end: int, summary: Optional[str]) -> None:
+        """Replace conversation[1:end] with a summary message (or drop it)."""
+        replacement = [ChatMessage(role="system", content=SUMMARY_PREFIX + summary)] if summary else []
+        conversation[1:end] = replacement
+        self.compactions += 1
+    
+    def compact(
+        self,
+        conversation: list[ChatMessage],
+        summarize: Optional[Callable[[list[ChatMessage]], Optional[str]]] = None,
+    ) -> bool:
+        """Bring a conversation within the budget, in place.
+        
+        Args:
+            conversation: Messages, starting with the system prompt
+            summarize: Returns a summary of the given messages (None to drop them)
+            
+        Returns:
+            True if the conversation was changed
+        """
+        compactions = self.compactions
+        end = self._plan(conversation)
+        if end:
+            summary = summarize(conversation[1:end]) if summarize else None
+            self._replace(conversation, end, summary)
+        return self.compactions != compactions
+    
+    async def compact_async(
+        self,
+        conversation: list[ChatMessage],
+        summarize: Optional[Callable[[list[ChatMessage]], Awaitable[Optional[str]]]] = None,
+    ) -> bool:
+        """Async version of compact() for an awaitable summarizer."""
+        compactions = self.compactions
+        end = self._plan(conversation)
+        if end:
+            summary = await summarize(conversation[1:end]) if summarize else None
+            self._replace(conversation, end, summary)
+        return self.compactions != compactions
@@ -3,9 +3,11 @@
 from typing import Optional
 
 import json
+import time
 
 import typer
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 from rich.prompt import Prompt, Confirm
 from rich.markdown import Markdown
@@ -16,14 +18,22 @@ from .auth import (
     get_user_token_for_blueprint,
     clear_token_cache,
     get_current_username,
+    MultiUserOBOTokenManager,
     OBOTokenManager,
+    UserTokenRefresher,
     AZURE_COGNITIVE_SERVICES_SCOPE,
 )
 from .config import get_config
 from .models import MCPServer, TokenResult
 from .mcp_client import MCPManager
-from .agent import Agent, create_agent_with_api_key, create_agent_with_obo_token, create_agent_with_token_provider
+from .agent import Agent, create_agent_with_api_key, create_agent_with_token_provider
 from .token_providers import create_token_provider, TokenProvider, DirectTokenProvider, SidecarTokenProvider
+from .startup import print_startup_summary, run_startup_pipeline
+from .token_server import TokenVendingServer, parse_downstream_api
+from .token_store import create_token_store
+from .token_validation import UserTokenValidator
+from .transport import configure_token_transport
+from .credentials import CertificateCredential, ClientCredential, FederatedTokenFileCredential
 
 
 app = typer.Typer(
@@ -33,6 +43,47 @@ app = typer.Typer(
 )
 console = Console()
 
+# Screen updates per second while a response is streamed
+STREAM_REFRESH_PER_SECOND = 12
+
+
+def configure_transport_from_config() -> None:
+    """Apply token endpoint transport settings from config."""
+    config = get_config()
+    configure_token_transport(
+        timeout=config.token_http_timeout_seconds,
+        http2=config.token_http2,
+        max_attempts=config.token_http_max_attempts,
+        authority_host=config.authority_host,
+    )
+
+
+def create_blueprint_credential() -> Optional[ClientCredential]:
+    """Create the Blueprint credential to use instead of a client secret.
+    
+    A client secret takes precedence, then a certificate, then a projected
+    federated token.
+    
+    Returns:
+        CertificateCredential or FederatedTokenFileCredential, or None to use
+        BLUEPRINT_CLIENT_SECRET
+    """
+    config = get_config()
+    if config.blueprint_client_secret:
+        return None
+    if config.blueprint_certificate_path:
+        console.print(f"[dim]Using certificate for Blueprint: {config.blueprint_certificate_path}[/dim]")
+        return CertificateCredential(
+            tenant_id=config.tenant_id,
+            client_id=config.blueprint_app_id,
+            certificate_path=config.blueprint_certificate_path,
+            password=config.blueprint_certificate_password,
+        )
+    if not config.federated_token_file:
+        return None
+    console.print(f"[dim]Using federated token for Blueprint: {config.federated_token_file}[/dim]")
+    return FederatedTokenFileCredential(config.federated_token_file)
+
 
 def require_azure_openai_config() -> tuple[str, str, str]:
     """Ensure Azure OpenAI is configured.
@@ -84,16 +135,38 @@ def display_menu(username: Optional[str] = None, auth_mode: str = "api_key") ->
 [bold]3.[/bold] Add MCP tool server
 [bold]4.[/bold] Remove MCP tool server
 [bold]5.[/bold] Clear conversation history
-[bold]6.[/bold] Exit
+[bold]6.[/bold] Token statistics
+[bold]7.[/bold] Exit
 """
     console.print(menu_text)
 
 
-def prompt_agent_loop(agent: Agent) -> None:
+def stream_response(agent: Agent, user_input: str) -> None:
+    """Render a streamed agent response as Markdown while it arrives.
+    
+    Args:
+        agent: Configured agent
+        user_input: User's message
+    """
+    text = ""
+    # Markdown parses the whole text, so re-parse at most once per refresh
+    interval = 1 / STREAM_REFRESH_PER_SECOND
+    rendered_at = 0.0
+    with Live(Markdown(text), console=console, refresh_per_second=STREAM_REFRESH_PER_SECOND, vertical_overflow="visible") as live:
+        for chunk in agent.chat_stream(user_input):
+            text += chunk
+            if time.monotonic() - rendered_at >= interval:
+                live.update(Markdown(text))
+                rendered_at = time.monotonic()
+        live.update(Markdown(text))
+
+
+def prompt_agent_loop(agent: Agent, stream: bool = True) -> None:
     """Run the interactive chat loop.
     
     Args:
         agent: Configured agent
+        stream: Show responses as they are generated instead of when complete
     """
     console.print("\n[bold cyan]Chat with AI Agent[/bold cyan]")
     console.print("[dim]Type 'exit' or 'quit' to return to menu, 'clear' to reset history[/dim]\n")
@@ -120,9 +193,12 @@ def prompt_agent_loop(agent: Agent) -> None:
         console.print("\n[bold blue]Assistant[/bold blue]:")
         
         try:
-            response = agent.chat(user_input)
-            # Render response as markdown for better formatting
-            console.print(Markdown(response))
+            if stream:
+                stream_response(agent, user_input)
+            else:
+                response = agent.chat(user_input)
+                # Render response as markdown for better formatting
+                console.print(Markdown(response))
             console.print()
         except Exception as e:
             console.print(f"[red]Error: {e}[/red]\n")
@@ -158,6 +234,80 @@ def list_mcp_tools(mcp_manager: MCPManager) -> None:
     console.print()
 
 
+def _format_ms(value: Optional[float]) -> str:
+    """Format milliseconds for display."""
+    return "-" if value is None else f"{value:.1f}"
+
+
+def show_token_stats(token_provider: Optional[TokenProvider]) -> None:
+    """Display token acquisition latency, cache and failure statistics.
+    
+    Args:
+        token_provider: Active token provider (None in API key mode)
+    """
+    if token_provider is None:
+        console.print("\n[yellow]No token statistics in Test Mode (API Key).[/yellow]\n")
+        return
+    
+    stats = token_provider.stats()
+    console.print()
+    
+    if not stats["latency"] and not stats["cache"]:
+        console.print("[yellow]No tokens have been requested yet.[/yellow]\n")
+        return
+    
+    latency_table = Table(title="Token Request Latency (ms)")
+    latency_table.add_column("Call", style="cyan")
+    latency_table.add_column("Count", justify="right")
+    latency_table.add_column("Mean", justify="right")
+    latency_table.add_column("p50", justify="right")
+    latency_table.add_column("p95", justify="right")
+    latency_table.add_column("p99", justify="right")
+    latency_table.add_column("Max", justify="right")
+    for name, histogram in stats["latency"].items():
+        latency_table.add_row(
+            name,
+            str(histogram["count"]),
+            _format_ms(histogram["mean_ms"]),
+            _format_ms(histogram["p50_ms"]),
+            _format_ms(histogram["p95_ms"]),
+            _format_ms(histogram["p99_ms"]),
+            _format_ms(histogram["max_ms"]),
+        )
+    console.print(latency_table)
+    
+    cache_table = Table(title="Token Cache")
+    cache_table.add_column("Scope / API", style="cyan")
+    cache_table.add_column("Hits", justify="right")
+    cache_table.add_column("Misses", justify="right")
+    cache_table.add_column("Refreshes", justify="right")
+    cache_table.add_column("Hit rate", justify="right")
+    cache_table.add_column("Min time to expiry", justify="right")
+    for scope, counts in stats["cache"].items():
+        expiry = stats["time_to_expiry"].get(scope)
+        cache_table.add_row(
+            scope,
+            str(counts["hits"]),
+            str(counts["misses"]),
+            str(counts["refreshes"]),
+            "-" if counts["hit_rate"] is None else f"{counts['hit_rate']:.1%}",
+            f"{expiry['min_seconds'] / 60:.1f} min" if expiry else "-",
+        )
+    console.print(cache_table)
+    
+    if stats["failures"]:
+        failure_table = Table(title="Token Request Failures")
+        failure_table.add_column("Call", style="cyan")
+        failure_table.add_column("Error", style="red")
+        failure_table.add_column("Count", justify="right")
+        for operation, codes in stats["failures"].items():
+            for code, count in sorted(codes.items(), key=lambda item: -item[1]):
+                failure_table.add_row(operation, code, str(count))
+        console.print(failure_table)
+    
+    console.print(f"[dim]Collected over {stats['uptime_seconds'] / 60:.1f} min[/dim]\n")
+
+
 def add_mcp_server(mcp_manager: MCPManager) -> None:
     """Prompt user to add an MCP server.
     
@@ -252,28 +402,39 @@ def remove_mcp_server(mcp_manager: MCPManager) -> None:
         console.print("\n[dim]Cancelled.[/dim]\n")
 
 
+def report_failed_mcp_servers(failed: list[str]) -> None:
+    """Print a warning for each MCP server that could not be connected.
+    
+    Args:
+        failed: Names of servers that failed to connect
+    """
+    for name in failed:
+        console.print(f"[yellow]⚠ Skipping {name} - will continue without this MCP server[/yellow]")
+        console.print(f"[dim]  You can remove it with menu option 4, or start the server and restart the CLI[/dim]")
+
+
 def connect_saved_mcp_servers(mcp_manager: MCPManager) -> None:
     """Connect to all saved MCP servers.
     
-    Gracefully handles connection failures - prints a warning and continues.
+    Servers are connected concurrently. Gracefully handles connection
+    failures - prints a warning and continues.
     
     Args:
         mcp_manager: MCP manager
     """
     config = get_config()
-    servers = config.list_mcp_servers()
+    servers = [server for server in config.list_mcp_servers() if server.enabled]
     
-    for server in servers:
-        if server.enabled:
-            console.print(f"[dim]Connecting to MCP server: {server.name}...[/dim]")
-            if not mcp_manager.add_server(server):
-                console.print(f"[yellow]⚠ Skipping {server.name} - will continue without this MCP server[/yellow]")
-                console.print(f"[dim]  You can remove it with menu option 4, or start the server and restart the CLI[/dim]")
+    if servers:
+        console.print(f"[dim]Connecting to MCP servers: {', '.join(s.name for s in servers)}...[/dim]")
+    results = mcp_manager.add_servers(servers)
+    report_failed_mcp_servers([name for name, connected in results.items() if not connected])
 
 
 @app.command()
 def run(
     force_refresh: bool = typer.Option(False, "--force-refresh", "-f", help="Force re-authentication"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
 ) -> None:
     """Start the interactive AI Agent CLI."""
     config = get_config()
@@ -295,7 +456,7 @@ def run(
         console.print("  - AZURE_OPENAI_ENDPOINT")
         console.print("  - AZURE_OPENAI_DEPLOYMENT")
         console.print("  - BLUEPRINT_APP_ID")
-        console.print("  - BLUEPRINT_CLIENT_SECRET")
+        console.print("  - BLUEPRINT_CLIENT_SECRET (or BLUEPRINT_CERTIFICATE_PATH, or AZURE_FEDERATED_TOKEN_FILE for workload identity)")
         console.print("  - AGENT_IDENTITY_APP_ID")
         console.print("\nFor Entra mode with sidecar, set:")
         console.print("  - AUTH_MODE=entra")
@@ -315,6 +476,8 @@ def run(
     agent: Optional[Agent] = None
     mcp_manager: Optional[MCPManager] = None
     obo_manager: Optional[OBOTokenManager] = None
+    token_provider: Optional[TokenProvider] = None
+    user_token_refresher: Optional[UserTokenRefresher] = None
     
     if config.auth_mode == "api_key":
         # Test mode: API key authentication
@@ -332,10 +495,13 @@ def run(
             api_key=config.azure_openai_api_key,
             api_version=api_version,
             mcp_manager=mcp_manager,
+            history_token_budget=config.chat_history_token_budget or None,
+            summary_deployment=config.chat_summary_deployment,
         )
     
     else:
         # Production mode: Entra OBO authentication
+        configure_transport_from_config()
         provider_mode = config.token_provider_mode
         console.print(f"[bold blue]Running in PRODUCTION MODE (Entra OBO, provider={provider_mode})[/bold blue]\n")
         
@@ -347,6 +513,7 @@ def run(
             tenant_id=config.tenant_id,
             blueprint_app_id=config.blueprint_app_id,
             force_refresh=force_refresh,
+            account_hint=account,
         )
         
         if not user_token:
@@ -359,7 +526,6 @@ def run(
         # Step 2: Create Token Provider based on mode
         console.print(f"[bold]Step 2: Initializing Token Provider ({provider_mode} mode)[/bold]")
         
-        token_provider: TokenProvider
         if provider_mode == "sidecar":
             token_provider = create_token_provider(
                 mode="sidecar",
@@ -367,6 +533,9 @@ def run(
                 sidecar_openai_api_name=config.sidecar_openai_api_name,
                 sidecar_mcp_api_name=config.sidecar_mcp_api_name,
                 agent_identity_app_id=config.agent_identity_app_id,  # Optional for sidecar
+                refresh_skew=config.token_refresh_skew_seconds,
+                background_refresh=config.token_background_refresh,
+                stale_while_revalidate=config.token_stale_while_revalidate,
             )
         else:
             token_provider = create_token_provider(
@@ -374,8 +543,14 @@ def run(
                 tenant_id=config.tenant_id,
                 blueprint_app_id=config.blueprint_app_id,
                 blueprint_client_secret=config.blueprint_client_secret,
+                blueprint_credential=create_blueprint_credential(),
                 agent_identity_app_id=config.agent_identity_app_id,
                 mcp_server_app_id=config.mcp_server_app_id,
+                refresh_skew=config.token_refresh_skew_seconds,
+                background_refresh=config.token_background_refresh,
+                persistent_cache=config.token_persistent_cache,
+                stale_while_revalidate=config.token_stale_while_revalidate,
+                shared_cache_path=config.token_shared_cache_path,
             )
         
         # Initialize provider with user token
@@ -383,46 +558,59 @@ def run(
             console.print("[red]Failed to initialize token provider.[/red]")
             raise typer.Exit(1)
         
+        # Renew Tc silently before it expires and re-seed the provider
+        if config.token_background_refresh:
+            user_token_refresher = UserTokenRefresher(
+                tenant_id=config.tenant_id,
+                blueprint_app_id=config.blueprint_app_id,
+                user_token=user_token,
+                on_refresh=token_provider.update_user_token,
+                refresh_skew=config.token_refresh_skew_seconds,
+                account_hint=account,
+            )
+            user_token_refresher.start()
+        
         console.print()
         
-        # Step 3: Get OBO token for Azure OpenAI
-        console.print("[bold]Step 3: Getting OBO token for Azure OpenAI[/bold]")
-        aoai_token_str = token_provider.get_openai_token()
+        # Step 3: Get OBO tokens for Azure OpenAI and the MCP Server, and
+        # connect saved MCP servers. These are independent of each other
+        # (both T2s only need T1 + Tc), so they run concurrently.
+        console.print("[bold]Step 3: Getting OBO tokens and connecting MCP servers (concurrently)[/bold]")
+        
+        # The token provider returns the access token string for MCP gateway authentication
+        def mcp_token_provider_func() -> Optional[str]:
+            return token_provider.get_mcp_token()
+        
+        mcp_manager = MCPManager(token_provider=mcp_token_provider_func)
+        startup = run_startup_pipeline(token_provider, mcp_manager, config.list_mcp_servers())
         
-        if not aoai_token_str:
+        if not startup.openai_token:
             console.print("[red]Failed to get OBO token for Azure OpenAI.[/red]")
             console.print("[yellow]Hint: Ensure admin consent is granted for the Agent Identity.[/yellow]")
             raise typer.Exit(1)
         
-        # Create TokenResult for compatibility with existing agent code
-        aoai_token = TokenResult(access_token=aoai_token_str)
-        console.print("[green]✓ Azure OpenAI OBO token acquired[/green]\n")
-        
-        # Step 4: Get OBO token for MCP Server (if configured)
-        console.print("[bold]Step 4: Getting OBO token for MCP Server[/bold]")
-        mcp_token_str = token_provider.get_mcp_token()
+        console.print("[green]✓ Azure OpenAI OBO token acquired[/green]")
         
-        if mcp_token_str:
-            console.print("[green]✓ MCP Server OBO token acquired[/green]\n")
+        if startup.mcp_token:
+            console.print("[green]✓ MCP Server OBO token acquired[/green]")
         else:
             console.print("[yellow]Warning: Could not get MCP Server OBO token.[/yellow]")
-            console.print("[yellow]MCP calls will not have authentication.[/yellow]\n")
+            console.print("[yellow]MCP calls will not have authentication.[/yellow]")
         
-        # Step 5: Create MCP manager with token provider
-        # The token provider returns the access token string for MCP gateway authentication
-        def mcp_token_provider_func() -> Optional[str]:
-            return token_provider.get_mcp_token()
-        
-        mcp_manager = MCPManager(token_provider=mcp_token_provider_func)
-        connect_saved_mcp_servers(mcp_manager)
+        report_failed_mcp_servers(startup.failed_servers)
+        print_startup_summary(startup)
+        console.print()
         
-        # Step 6: Create agent with OBO token
-        agent = create_agent_with_obo_token(
+        # Step 4: Create agent that pulls the OBO token from the provider per
+        # request (served from cache, refreshed ahead of expiry)
+        agent = create_agent_with_token_provider(
             endpoint=endpoint,
             deployment=deployment,
-            token=aoai_token,
+            token_provider=token_provider.get_openai_token,
             api_version=api_version,
             mcp_manager=mcp_manager,
+            history_token_budget=config.chat_history_token_budget or None,
+            summary_deployment=config.chat_summary_deployment,
         )
         
         console.print("[bold green]✓ Agent initialized with OBO authentication[/bold green]\n")
@@ -432,13 +620,13 @@ def run(
         display_menu(username, config.auth_mode)
         
         try:
-            choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4", "5", "6"])
+            choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4", "5", "6", "7"])
         except (KeyboardInterrupt, EOFError):
             console.print("\n[bold]Goodbye![/bold]\n")
             break
         
         if choice == "1":
-            prompt_agent_loop(agent)
+            prompt_agent_loop(agent, stream=config.chat_stream)
         elif choice == "2":
             list_mcp_tools(mcp_manager)
         elif choice == "3":
@@ -449,14 +637,21 @@ def run(
             agent.clear_history()
             console.print("\n[green]✓ Conversation history cleared.[/green]\n")
         elif choice == "6":
+            show_token_stats(token_provider)
+        elif choice == "7":
             console.print("\n[bold]Goodbye![/bold]\n")
             break
     
     # Cleanup
+    if user_token_refresher:
+        user_token_refresher.stop()
     if mcp_manager:
         mcp_manager.disconnect_all()
-    if 'token_provider' in locals() and hasattr(token_provider, 'clear_cache'):
-        token_provider.clear_cache()
+    if token_provider:
+        if hasattr(token_provider, 'close'):
+            token_provider.close()
+        elif hasattr(token_provider, 'clear_cache'):
+            token_provider.clear_cache()
 
 
 @app.command()
@@ -480,10 +675,25 @@ def config_show() -> None:
     table.add_row("Tenant ID", config.tenant_id or "[dim]Not set[/dim]")
     table.add_row("Blueprint App ID", config.blueprint_app_id or "[dim]Not set[/dim]")
     table.add_row("Blueprint Secret", "[green]Set[/green]" if config.blueprint_client_secret else "[dim]Not set[/dim]")
+    table.add_row("Blueprint Certificate", config.blueprint_certificate_path or "[dim]Not set[/dim]")
+    table.add_row("Federated Token File", config.federated_token_file or "[dim]Not set[/dim]")
     table.add_row("Agent Identity App ID", config.agent_identity_app_id or "[dim]Not set[/dim]")
     table.add_row("MCP Server App ID", config.mcp_server_app_id or "[dim]Not set[/dim]")
     table.add_row("", "")
     
+    # Token cache settings
+    table.add_row("[bold]Token Cache[/bold]", "")
+    table.add_row("Refresh skew", f"{config.token_refresh_skew_seconds}s")
+    table.add_row("Background refresh", "enabled" if config.token_background_refresh else "disabled")
+    table.add_row("Stale-while-revalidate", "enabled" if config.token_stale_while_revalidate else "disabled")
+    table.add_row("Persistent cache", "enabled" if config.token_persistent_cache else "disabled")
+    table.add_row("Shared cache", config.token_shared_cache_path or "[dim]Not set[/dim]")
+    table.add_row("Token endpoint timeout", f"{config.token_http_timeout_seconds:g}s")
+    table.add_row("Token endpoint HTTP/2", "enabled" if config.token_http2 else "disabled")
+    table.add_row("Token endpoint attempts", str(config.token_http_max_attempts))
+    table.add_row("Authority host", config.authority_host)
+    table.add_row("", "")
+    
     # Sidecar settings (only show if sidecar mode)
     if config.token_provider_mode == "sidecar":
         table.add_row("[bold]Sidecar[/bold]", "")
@@ -498,6 +708,9 @@ def config_show() -> None:
     table.add_row("Deployment", config.azure_openai_deployment or "[dim]Not set[/dim]")
     table.add_row("API Version", config.azure_openai_api_version)
     table.add_row("API Key", "[green]Set[/green]" if config.azure_openai_api_key else "[dim]Not set[/dim]")
+    table.add_row("Streaming", "enabled" if config.chat_stream else "disabled")
+    table.add_row("History budget", f"{config.chat_history_token_budget} tokens" if config.chat_history_token_budget else "unlimited")
+    table.add_row("Summary deployment", config.chat_summary_deployment or "[dim]Same as chat[/dim]")
     
     console.print(table)
     
@@ -532,6 +745,7 @@ def display_token(title: str, token: TokenResult, color: str = "blue") -> None:
 def show_tokens(
     force_refresh: bool = typer.Option(False, "--force-refresh", "-f", help="Force re-authentication"),
     output_raw: bool = typer.Option(False, "--output-raw", "-r", help="Also output raw token strings"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
 ) -> None:
     """Show all OBO tokens (Tc, T2 for OpenAI, T2 for MCP Server).
     
@@ -556,6 +770,7 @@ def show_tokens(
         console.print("Required: TENANT_ID, BLUEPRINT_APP_ID")
         raise typer.Exit(1)
     
+    configure_transport_from_config()
     provider_mode = config.token_provider_mode
     console.print(f"\n[bold]OBO Token Flow - Token Display (provider={provider_mode})[/bold]\n")
     
@@ -567,6 +782,7 @@ def show_tokens(
         tenant_id=config.tenant_id,
         blueprint_app_id=config.blueprint_app_id,
         force_refresh=force_refresh,
+        account_hint=account,
     )
     
     if not tc_token:
@@ -594,6 +810,7 @@ def show_tokens(
                 sidecar_openai_api_name=config.sidecar_openai_api_name,
                 sidecar_mcp_api_name=config.sidecar_mcp_api_name,
                 agent_identity_app_id=config.agent_identity_app_id,
+                background_refresh=False,
             )
         else:
             token_provider = create_token_provider(
@@ -601,8 +818,12 @@ def show_tokens(
                 tenant_id=config.tenant_id,
                 blueprint_app_id=config.blueprint_app_id,
                 blueprint_client_secret=config.blueprint_client_secret,
+                blueprint_credential=create_blueprint_credential(),
                 agent_identity_app_id=config.agent_identity_app_id,
                 mcp_server_app_id=config.mcp_server_app_id,
+                background_refresh=False,
+                persistent_cache=config.token_persistent_cache,
+                shared_cache_path=config.token_shared_cache_path,
             )
         
         if not token_provider.initialize(tc_token.access_token):
@@ -715,6 +936,101 @@ def show_tokens(
     console.print()
 
 
+@app.command()
+def serve_tokens(
+    host: str = typer.Option("127.0.0.1", "--host", help="Address to listen on"),
+    port: int = typer.Option(5000, "--port", "-p", help="Port to listen on"),
+    api: Optional[list[str]] = typer.Option(None, "--api", help="OBO downstream API as NAME=SCOPE (repeatable)"),
+    app_api: Optional[list[str]] = typer.Option(None, "--app-api", help="App-token downstream API as NAME=SCOPE (repeatable)"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Log every request"),
+    warm_up: bool = typer.Option(True, "--warm-up/--no-warm-up", help="Acquire T1 and app tokens for all agent identities at startup"),
+) -> None:
+    """Serve tokens over the sidecar API (/AuthorizationHeader/{apiName}, /healthz).
+    
+    A lightweight stand-in for the Microsoft Entra SDK sidecar: point
+    SIDECAR_URL at it and use TOKEN_PROVIDER_MODE=sidecar. Without --api,
+    the OpenAI and MCP APIs are served under SIDECAR_OPENAI_API_NAME and
+    SIDECAR_MCP_API_NAME. T1 tokens (and app-only tokens for --app-api)
+    for AGENT_IDENTITY_APP_ID and AGENT_IDENTITY_APP_IDS are acquired in
+    one parallel wave before serving.
+    """
+    config = get_config()
+    credential = create_blueprint_credential()
+    if not (config.tenant_id and config.blueprint_app_id and (config.blueprint_client_secret or credential)):
+        console.print("[red]Error: TENANT_ID, BLUEPRINT_APP_ID and a Blueprint credential are required.[/red]")
+        console.print("Set BLUEPRINT_CLIENT_SECRET, BLUEPRINT_CERTIFICATE_PATH or AZURE_FEDERATED_TOKEN_FILE.")
+        raise typer.Exit(1)
+    
+    try:
+        apis = [parse_downstream_api(spec) for spec in api or []]
+        apis += [parse_downstream_api(spec, request_app_token=True) for spec in app_api or []]
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    if not apis:
+        apis = [parse_downstream_api(f"{config.sidecar_openai_api_name}={AZURE_COGNITIVE_SERVICES_SCOPE}")]
+        if config.mcp_server_app_id:
+            apis.append(parse_downstream_api(f"{config.sidecar_mcp_api_name}=api://{config.mcp_server_app_id}/.default"))
+    
+    configure_transport_from_config()
+    manager = MultiUserOBOTokenManager(
+        tenant_id=config.tenant_id,
+        blueprint_app_id=config.blueprint_app_id,
+        blueprint_client_secret=config.blueprint_client_secret,
+        blueprint_credential=credential,
+        refresh_skew=config.token_refresh_skew_seconds,
+        max_entries=config.token_cache_max_entries,
+        token_store=create_token_store(config.token_shared_cache_path),
+    )
+    
+    agent_ids = config.agent_identity_app_ids
+    if warm_up and agent_ids:
+        console.print(f"[dim]Warming up {len(agent_ids)} agent identities...[/dim]")
+        start = time.perf_counter()
+        app_tokens = manager.get_tokens([
+            (agent_id, " ".join(downstream.scopes))
+            for agent_id in agent_ids
+            for downstream in apis
+            if downstream.request_app_token
+        ])
+        t1_tokens = manager.get_t1_tokens(agent_ids)
+        failed = sorted({a for a, t in t1_tokens.items() if not t} | {a for (a, _), t in app_tokens.items() if not t})
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        console.print(f"[green]✓ Tokens acquired for {len(agent_ids) - len(failed)}/{len(agent_ids)} agent identities in {elapsed_ms:.0f} ms[/green]")
+        if failed:
+            console.print(f"[yellow]Warning: token acquisition failed for: {', '.join(failed)}[/yellow]")
+    
+    try:
+        server = TokenVendingServer(
+            (host, port),
+            manager,
+            apis,
+            default_agent_identity=config.agent_identity_app_id,
+            verbose=verbose,
+            user_token_validator=UserTokenValidator(config.tenant_id, config.blueprint_app_id),
+        )
+    except OSError as e:
+        console.print(f"[red]Failed to listen on {host}:{port}: {e}[/red]")
+        raise typer.Exit(1)
+    
+    table = Table(title=f"Token server on http://{host}:{port}")
+    table.add_column("API", style="cyan")
+    table.add_column("Scopes", style="white")
+    table.add_column("Token", style="dim")
+    for downstream in apis:
+        table.add_row(downstream.name, " ".join(downstream.scopes), "app" if downstream.request_app_token else "OBO")
+    console.print(table)
+    console.print("[dim]Press Ctrl+C to stop[/dim]")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[bold]Stopping token server[/bold]")
+    finally:
+        server.server_close()
+        manager.close()
+
+
 @app.command()
 def logout() -> None:
     """Clear cached authentication tokens."""
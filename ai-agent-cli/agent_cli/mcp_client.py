@@ -1,7 +1,8 @@
 """MCP (Model Context Protocol) client using official SDK with Streamable HTTP transport."""
 
 import asyncio
-from typing import Optional, Any, Callable
+import inspect
+from typing import Optional, Any, Awaitable, Callable, Union
 from dataclasses import dataclass
 
 from rich.console import Console
@@ -15,6 +16,9 @@ from .models import MCPTool, MCPServer
 
 console = Console()
 
+# Tool calls dispatched concurrently to one server by MCPManager.call_tools
+DEFAULT_MAX_CONCURRENT_CALLS_PER_SERVER = 4
+
 
 @dataclass
 class MCPResponse:
@@ -32,14 +36,15 @@ class MCPClient:
         self,
         server: MCPServer,
         access_token: Optional[str] = None,
-        token_provider: Optional[Callable[[], Optional[str]]] = None,
+        token_provider: Optional[Callable[[], Union[Optional[str], Awaitable[Optional[str]]]]] = None,
     ):
         """Initialize MCP client.
         
         Args:
             server: MCP server configuration
             access_token: Static Bearer token for authentication
-            token_provider: Callable that returns a fresh token (for dynamic auth)
+            token_provider: Callable that returns a fresh token (for dynamic auth);
+                may be async when connecting from a running event loop
         """
         self.server = server
         self._access_token = access_token
@@ -71,6 +76,13 @@ class MCPClient:
         
         return headers
     
+    async def _get_auth_headers_async(self) -> dict[str, str]:
+        """Get authentication headers, awaiting an async token provider."""
+        token = self._token_provider() if self._token_provider else self._access_token
+        if inspect.isawaitable(token):
+            token = await token
+        return {"Authorization": f"Bearer {token}"} if token else {}
+    
     def update_token(self, token: str) -> None:
         """Update the access token.
         
@@ -113,10 +125,28 @@ class MCPClient:
             console.print(f"[yellow]⚠ Failed to connect to {self.server.name}: {e}[/yellow]")
             return False
     
+    async def connect_async(self) -> bool:
+        """Connect to the MCP server from a running event loop.
+        
+        Same as connect(), for use when connecting several servers
+        concurrently on one loop.
+        
+        Returns:
+            True if connection successful, False otherwise
+        """
+        try:
+            return await self._connect_async()
+        except asyncio.CancelledError:
+            console.print(f"[yellow]⚠ Connection to {self.server.name} was cancelled (server may be unavailable)[/yellow]")
+            return False
+        except Exception as e:
+            console.print(f"[yellow]⚠ Failed to connect to {self.server.name}: {e}[/yellow]")
+            return False
+    
     async def _connect_async(self) -> bool:
         """Async implementation of connect."""
         try:
-            headers = self._get_auth_headers()
+            headers = await self._get_auth_headers_async()
             
             # Use the official MCP SDK's streamablehttp_client
             # We need to keep the context manager open, so we manually enter it
@@ -210,6 +240,18 @@ class MCPClient:
             asyncio.set_event_loop(loop)
             return loop.run_until_complete(self._call_tool_async(name, arguments))
     
+    async def call_tool_async(self, name: str, arguments: dict) -> Optional[Any]:
+        """Call a tool from the event loop the session was opened on.
+        
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+            
+        Returns:
+            Tool result if successful, None otherwise
+        """
+        return await self._call_tool_async(name, arguments)
+    
     async def _call_tool_async(self, name: str, arguments: dict) -> Optional[Any]:
         """Async implementation of call_tool."""
         if not self._session:
@@ -251,6 +293,15 @@ class MCPClient:
             self._session = None
             self._tools = []
     
+    async def disconnect_async(self) -> None:
+        """Disconnect from the MCP server from a running event loop."""
+        try:
+            await self._disconnect_async()
+        finally:
+            self._connected = False
+            self._session = None
+            self._tools = []
+    
     async def _disconnect_async(self) -> None:
         """Async implementation of disconnect."""
         try:
@@ -310,6 +361,57 @@ class MCPManager:
             return True
         return False
     
+    def add_servers(self, servers: list[MCPServer]) -> dict[str, bool]:
+        """Add and connect to several MCP servers concurrently.
+        
+        All connections run on the same event loop, so total connect time
+        is roughly that of the slowest server rather than the sum.
+        
+        Args:
+            servers: MCP server configurations
+            
+        Returns:
+            Dictionary of server name to whether the connection succeeded
+        """
+        if not servers:
+            return {}
+        
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+        return loop.run_until_complete(self.add_servers_async(servers))
+    
+    async def add_servers_async(self, servers: list[MCPServer]) -> dict[str, bool]:
+        """Add and connect to several MCP servers from a running event loop.
+        
+        The sessions are bound to that loop, so their tools must then be
+        called with call_tool_async() / call_tools_async() on it.
+        
+        Args:
+            servers: MCP server configurations
+            
+        Returns:
+            Dictionary of server name to whether the connection succeeded
+        """
+        clients = [
+            MCPClient(server=server, token_provider=self._token_provider)
+            for server in servers
+        ]
+        outcomes = await asyncio.gather(
+            *(client.connect_async() for client in clients),
+            return_exceptions=True,
+        )
+        
+        results = {}
+        for client, outcome in zip(clients, outcomes):
+            connected = outcome is True
+            if connected:
+                self._clients[client.server.name] = client
+            results[client.server.name] = connected
+        return results
+    
     def remove_server(self, name: str) -> None:
         """Remove an MCP server.
         
@@ -350,6 +452,14 @@ class MCPManager:
         """
         return [tool.to_openai_tool() for tool in self.list_all_tools()]
     
+    def _find_client(self, tool_name: str) -> Optional[MCPClient]:
+        """Find the client of the server that provides a tool."""
+        for client in self._clients.values():
+            for tool in client.tools:
+                if tool.name == tool_name:
+                    return client
+        return None
+    
     def call_tool(self, name: str, arguments: dict) -> Optional[Any]:
         """Call a tool by name, finding the appropriate server.
         
@@ -360,21 +470,108 @@ class MCPManager:
         Returns:
             Tool result if successful, None otherwise
         """
-        # Find which server has this tool
-        for client in self._clients.values():
-            for tool in client.tools:
-                if tool.name == name:
-                    return client.call_tool(name, arguments)
+        client = self._find_client(name)
+        if client:
+            return client.call_tool(name, arguments)
         
         console.print(f"[red]Tool not found: {name}[/red]")
         return None
     
+    async def call_tool_async(self, name: str, arguments: dict) -> Optional[Any]:
+        """Call a tool by name from the event loop the sessions were opened on.
+        
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+            
+        Returns:
+            Tool result if successful, None otherwise
+        """
+        client = self._find_client(name)
+        if client:
+            return await client.call_tool_async(name, arguments)
+        
+        console.print(f"[red]Tool not found: {name}[/red]")
+        return None
+    
+    def call_tools(
+        self,
+        calls: list[tuple[str, dict]],
+        max_concurrency_per_server: int = DEFAULT_MAX_CONCURRENT_CALLS_PER_SERVER,
+    ) -> list[Optional[Any]]:
+        """Call several tools concurrently.
+        
+        All calls run on the same event loop (the one the sessions were
+        opened on), at most ``max_concurrency_per_server`` at a time per
+        server, so independent calls cost about as long as the slowest one
+        rather than their sum.
+        
+        Args:
+            calls: (tool name, arguments) pairs
+            max_concurrency_per_server: Maximum calls in flight per server
+            
+        Returns:
+            Results in the order of ``calls`` (None where a call failed)
+        """
+        if not calls:
+            return []
+        
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+        return loop.run_until_complete(self.call_tools_async(calls, max_concurrency_per_server))
+    
+    async def call_tools_async(
+        self,
+        calls: list[tuple[str, dict]],
+        max_concurrency_per_server: int = DEFAULT_MAX_CONCURRENT_CALLS_PER_SERVER,
+    ) -> list[Optional[Any]]:
+        """Call several tools concurrently from a running event loop.
+        
+        Args:
+            calls: (tool name, arguments) pairs
+            max_concurrency_per_server: Maximum calls in flight per server
+            
+        Returns:
+            Results in the order of ``calls`` (None where a call failed)
+        """
+        limits: dict[str, asyncio.Semaphore] = {}
+        
+        async def call(name: str, arguments: dict) -> Optional[Any]:
+            client = self._find_client(name)
+            if client is None:
+                console.print(f"[red]Tool not found: {name}[/red]")
+                return None
+            limit = limits.setdefault(client.server.name, asyncio.Semaphore(max(1, max_concurrency_per_server)))
+            async with limit:
+                return await client.call_tool_async(name, arguments)
+        
+        outcomes = await asyncio.gather(
+            *(call(name, arguments) for name, arguments in calls),
+            return_exceptions=True,
+        )
+        
+        results = []
+        for (name, _), outcome in zip(calls, outcomes):
+            if isinstance(outcome, BaseException):
+                console.print(f"[red]Tool call error ({name}): {outcome}[/red]")
+                outcome = None
+            results.append(outcome)
+        return results
+    
     def disconnect_all(self) -> None:
         """Disconnect from all servers."""
         for client in self._clients.values():
             client.disconnect()
         self._clients.clear()
     
+    async def disconnect_all_async(self) -> None:
+        """Disconnect from all servers from a running event loop."""
+        await asyncio.gather(*(client.disconnect_async() for client in self._clients.values()))
+        self._clients.clear()
+    
     @property
     def connected_servers(self) -> list[str]:
         """Get list of connected server names."""
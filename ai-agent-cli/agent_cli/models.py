@@ -2,37 +2,120 @@
 
 import base64
 import json
+import time
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Optional, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenResult:
-    """Result of a token acquisition."""
+    """Result of a token acquisition.
+    
+    JWT claims are decoded lazily on first access and memoized, so expiry
+    checks on the request path never re-parse the token.
+    """
     
     access_token: str
     token_type: str = "Bearer"
     expires_in: int = 0
+    acquired_at: float = field(default_factory=time.time)
+    _claims: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    _claims_token: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
-    def decoded_claims(self) -> dict:
-        """Decode and return JWT claims (without verification)."""
-        # Split the JWT
-        parts = self.access_token.split(".")
-        if len(parts) != 3:
-            return {}
+    @property
+    def claims(self) -> dict:
+        """Get the JWT claims (decoded once, without verification)."""
+        if self._claims_token is not self.access_token:
+            self._claims = _decode_jwt_claims(self.access_token)
+            self._claims_token = self.access_token
+        return self._claims
+    
+    @property
+    def expires_at(self) -> Optional[float]:
+        """Get the absolute expiry time (epoch seconds), if known.
         
-        # Decode the payload (middle part)
-        payload = parts[1]
-        # Add padding if needed
-        padding = 4 - len(payload) % 4
-        if padding != 4:
-            payload += "=" * padding
+        Prefers the JWT ``exp`` claim and falls back to ``expires_in``
+        relative to when the token was acquired.
+        """
+        exp = self.claims.get("exp")
+        if isinstance(exp, (int, float)):
+            return float(exp)
+        if self.expires_in:
+            return self.acquired_at + self.expires_in
+        return None
+    
+    @property
+    def expires_on(self) -> Optional[datetime]:
+        """Get the expiry instant as a UTC datetime, if known."""
+        expires_at = self.expires_at
+        if expires_at is None:
+            return None
+        return datetime.fromtimestamp(expires_at, tz=timezone.utc)
+    
+    @property
+    def remaining_lifetime(self) -> Optional[float]:
+        """Get the seconds until the token expires (negative if expired), if known."""
+        expires_at = self.expires_at
+        if expires_at is None:
+            return None
+        return expires_at - time.time()
+    
+    @property
+    def audience(self) -> Optional[str | list[str]]:
+        """Get the ``aud`` claim (a list when the token has several audiences)."""
+        return self.claims.get("aud")
+    
+    @property
+    def subject(self) -> Optional[str]:
+        """Get the ``sub`` claim."""
+        return self.claims.get("sub")
+    
+    @property
+    def object_id(self) -> Optional[str]:
+        """Get the ``oid`` claim (object ID of the user or service principal)."""
+        return self.claims.get("oid")
+    
+    @property
+    def tenant_id(self) -> Optional[str]:
+        """Get the ``tid`` claim."""
+        return self.claims.get("tid")
+    
+    def is_expired(self, skew: float = 0, now: Optional[float] = None) -> bool:
+        """Check whether the token expires within ``skew`` seconds.
         
-        try:
-            decoded = base64.urlsafe_b64decode(payload)
-            return json.loads(decoded)
-        except Exception:
-            return {}
+        Tokens with unknown expiry are never considered expired.
+        """
+        expires_at = self.expires_at
+        if expires_at is None:
+            return False
+        return (now if now is not None else time.time()) >= expires_at - skew
+    
+    def decoded_claims(self) -> dict:
+        """Decode and return JWT claims (without verification)."""
+        return self.claims
+
+
+def _decode_jwt_claims(token: str) -> dict:
+    """Decode the payload of a JWT (without verification)."""
+    # Split the JWT
+    parts = token.split(".")
+    if len(parts) != 3:
+        return {}
+    
+    # Decode the payload (middle part)
+    payload = parts[1]
+    # Add padding if needed
+    padding = 4 - len(payload) % 4
+    if padding != 4:
+        payload += "=" * padding
+    
+    try:
+        decoded = base64.urlsafe_b64decode(payload)
+        claims = json.loads(decoded)
+    except Exception:
+        return {}
+    return claims if isinstance(claims, dict) else {}
 
 
 @dataclass
@@ -82,18 +165,29 @@ class MCPTool:
         }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ChatMessage:
-    """A message in the conversation history."""
+    """A message in the conversation history.
+    
+    Immutable, so the wire form is built once and reused for every
+    request the message is part of.
+    """
     
     role: str  # "system", "user", "assistant", "tool"
     content: Optional[str] = None
     tool_calls: Optional[list[dict]] = None
     tool_call_id: Optional[str] = None
     name: Optional[str] = None
+    _wire: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> dict:
-        """Convert to dictionary for OpenAI API."""
+        """Convert to dictionary for OpenAI API (memoized; do not modify the result)."""
+        if self._wire is None:
+            object.__setattr__(self, "_wire", self._build_dict())
+        return self._wire
+    
+    def _build_dict(self) -> dict:
+        """Build the OpenAI API dictionary."""
         msg = {"role": self.role}
         
         if self.content is not None:
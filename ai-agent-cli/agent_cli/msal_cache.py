@@ -0,0 +1,184 @@
+"""Multi-process-safe file persistence for the MSAL token cache."""
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from msal import SerializableTokenCache
+from rich.console import Console
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+
+console = Console()
+
+
+@contextmanager
+def file_lock(lock_path: Path, shared: bool = False) -> Iterator[None]:
+    """Hold an advisory inter-process lock on ``lock_path``.
+    
+    Uses ``fcntl.flock`` on POSIX and ``msvcrt.locking`` on Windows. On
+    platforms with neither, only in-process locking applies.
+    
+    Args:
+        lock_path: Lock file (created if missing)
+        shared: Take a shared (read) lock instead of an exclusive one (POSIX only)
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write(path: Path, data: str) -> None:
+    """Write a file via a temporary file and atomic rename (mode 0600).
+    
+    Readers see either the old or the new content, never a partial write.
+    
+    Args:
+        path: Destination file
+        data: Text to write
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class PersistentMsalCache(SerializableTokenCache):
+    """MSAL token cache that is written through to a shared file.
+    
+    Every change MSAL makes (new tokens, refresh-token rotation, account
+    removal) is applied under an exclusive file lock on top of the latest
+    on-disk state and written back atomically. Lookups reload the file when
+    another process has changed it. Several CLI processes can therefore
+    share one cache without losing each other's refresh tokens.
+    """
+    
+    def __init__(self, path: Path):
+        """Initialize the cache and load it from disk.
+        
+        Args:
+            path: Cache file
+        """
+        super().__init__()
+        self.path = path
+        self.lock_path = path.with_name(f"{path.name}.lock")
+        self._transaction_lock = threading.RLock()
+        self._transaction_depth = 0
+        self._signature: Optional[tuple[int, int]] = None
+        self.reload()
+    
+    def _file_signature(self) -> Optional[tuple[int, int]]:
+        """Get (mtime_ns, size) of the cache file, or None if it does not exist."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _reload_if_changed(self) -> None:
+        """Re-read the cache file if it changed since it was last read or written."""
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        try:
+            state = self.path.read_text() if signature is not None else None
+            self.deserialize(state)
+        except (OSError, ValueError) as e:
+            console.print(f"[dim]Warning: Could not load token cache: {e}[/dim]")
+            self.deserialize(None)
+        self._signature = signature
+    
+    def _write(self) -> None:
+        """Write the in-memory state to disk (caller holds the file lock)."""
+        atomic_write(self.path, self.serialize())
+        self._signature = self._file_signature()
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Apply changes on top of the latest file state and write them through.
+        
+        Re-entrant, so nested MSAL calls (add() -> modify()) take the file
+        lock and write the file only once.
+        """
+        with self._transaction_lock:
+            if self._transaction_depth:
+                self._transaction_depth += 1
+                try:
+                    yield
+                finally:
+                    self._transaction_depth -= 1
+                return
+            
+            with file_lock(self.lock_path):
+                self._reload_if_changed()
+                self._transaction_depth = 1
+                try:
+                    yield
+                finally:
+                    self._transaction_depth = 0
+                if self.has_state_changed:
+                    self._write()
+    
+    def reload(self) -> None:
+        """Pick up changes written by other processes."""
+        with self._transaction_lock:
+            if self._transaction_depth or self._file_signature() == self._signature:
+                return
+            with file_lock(self.lock_path, shared=True):
+                self._reload_if_changed()
+    
+    def add(self, event, **kwargs):
+        with self._transaction():
+            super().add(event, **kwargs)
+    
+    def modify(self, credential_type, old_entry, new_key_value_pairs=None):
+        with self._transaction():
+            super().modify(credential_type, old_entry, new_key_value_pairs)
+    
+    def search(self, credential_type, target=None, query=None, **kwargs):
+        self.reload()
+        return super().search(credential_type, target=target, query=query, **kwargs)
+    
+    def flush(self) -> None:
+        """Write any unsaved in-memory changes to disk."""
+        if self.has_state_changed:
+            with self._transaction_lock, file_lock(self.lock_path):
+                self._write()
+    
+    def delete(self) -> None:
+        """Empty the cache and delete its file."""
+        with self._transaction_lock, file_lock(self.lock_path):
+            self.deserialize(None)
+            self.path.unlink(missing_ok=True)
+            self._signature = None
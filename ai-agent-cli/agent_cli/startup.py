@@ -0,0 +1,105 @@
+"""Concurrent startup pipeline for OBO token acquisition and MCP connections."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from .mcp_client import MCPManager
+from .models import MCPServer
+from .token_providers import TokenProvider
+
+
+console = Console()
+
+
+@dataclass
+class StartupResult:
+    """Outcome and timings of the startup pipeline."""
+    
+    openai_token: Optional[str] = None
+    mcp_token: Optional[str] = None
+    mcp_connections: dict[str, bool] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+    critical_path: float = 0.0
+    
+    @property
+    def sequential_time(self) -> float:
+        """Time the steps would have taken if run one after another."""
+        return sum(self.timings.values())
+    
+    @property
+    def failed_servers(self) -> list[str]:
+        """Names of MCP servers that could not be connected."""
+        return [name for name, connected in self.mcp_connections.items() if not connected]
+
+
+def _timed(func: Callable[..., Any], *args) -> tuple[Any, float]:
+    """Call ``func`` and return its result with the elapsed seconds."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run_startup_pipeline(
+    token_provider: TokenProvider,
+    mcp_manager: MCPManager,
+    servers: list[MCPServer],
+) -> StartupResult:
+    """Acquire OBO tokens and connect MCP servers concurrently.
+    
+    Both T2 exchanges (or sidecar calls) depend only on T1 + Tc, so they
+    run in parallel. MCP connections start as soon as the MCP token is
+    available and run concurrently with each other, while the Azure OpenAI
+    token is still being acquired. Cold start therefore costs the longest
+    chain rather than the sum of all round trips.
+    
+    Args:
+        token_provider: Initialized token provider
+        mcp_manager: MCP manager configured with the MCP token provider
+        servers: Saved MCP servers to connect
+        
+    Returns:
+        StartupResult with tokens, connection results and timings
+    """
+    result = StartupResult()
+    start = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup") as pool:
+        openai_future = pool.submit(_timed, token_provider.get_openai_token)
+        mcp_future = pool.submit(_timed, token_provider.get_mcp_token)
+        
+        result.mcp_token, result.timings["MCP token"] = mcp_future.result()
+        
+        # MCP sessions are bound to this thread's event loop, so connect here
+        enabled = [server for server in servers if server.enabled]
+        if enabled:
+            result.mcp_connections, result.timings["MCP connect"] = _timed(
+                mcp_manager.add_servers, enabled
+            )
+        
+        result.openai_token, result.timings["Azure OpenAI token"] = openai_future.result()
+    
+    result.critical_path = time.perf_counter() - start
+    return result
+
+
+def print_startup_summary(result: StartupResult) -> None:
+    """Print per-step and critical-path timings of the startup pipeline.
+    
+    Args:
+        result: Result returned by run_startup_pipeline
+    """
+    table = Table(title="Startup Timings", show_header=True)
+    table.add_column("Step", style="cyan")
+    table.add_column("Time", style="white", justify="right")
+    
+    for step, seconds in result.timings.items():
+        table.add_row(step, f"{seconds * 1000:.0f} ms")
+    table.add_row("[bold]Critical path[/bold]", f"[bold]{result.critical_path * 1000:.0f} ms[/bold]")
+    table.add_row("[dim]Sequential total[/dim]", f"[dim]{result.sequential_time * 1000:.0f} ms[/dim]")
+    
+    console.print(table)
@@ -0,0 +1,455 @@
+"""Expiry-aware in-memory token cache with background refresh."""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Hashable, Iterator, Optional
+
+from rich.console import Console
+
+from .models import TokenResult
+
+
+console = Console()
+
+# Refresh tokens this many seconds before they expire
+DEFAULT_REFRESH_SKEW_SECONDS = 300
+
+# How long to wait before retrying a failed background refresh
+DEFAULT_REFRESH_RETRY_SECONDS = 30
+
+# Upper bound on cached per-user tokens in multi-user managers
+DEFAULT_MAX_CACHED_TOKENS = 1000
+
+
+class KeyedLocks:
+    """Per-key locks that exist only while some caller holds or waits for them.
+    
+    A lock is reference counted and dropped by its last user, so the map
+    stays bounded without ever discarding a lock another thread still
+    relies on for single-flight acquisition.
+    """
+    
+    def __init__(self):
+        self._locks: dict[Hashable, list] = {}  # key -> [lock, users]
+        self._guard = threading.Lock()
+    
+    @contextmanager
+    def __call__(self, key: Hashable) -> Iterator[None]:
+        """Hold the lock for a key."""
+        with self._guard:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+    
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+class ExpiringTokenCache:
+    """Thread-safe token cache that tracks the expiry of each entry.
+    
+    Entries are considered "fresh" until they enter the refresh window
+    (``refresh_skew`` seconds before expiry) and "valid" until they
+    actually expire. Lookups never block on network calls.
+    
+    When ``max_entries`` is set the cache is bounded: expired entries are
+    purged first (found through an expiry heap, not a scan), then the least
+    recently used entries are evicted. ``evictions`` counts the latter and
+    ``expirations`` the expired entries removed.
+    """
+    
+    def __init__(
+        self,
+        refresh_skew: int = DEFAULT_REFRESH_SKEW_SECONDS,
+        max_entries: Optional[int] = None,
+    ):
+        """Initialize the cache.
+        
+        Args:
+            refresh_skew: Seconds before expiry at which a token should be refreshed
+            max_entries: Maximum number of cached tokens (unbounded if None)
+        """
+        self.refresh_skew = refresh_skew
+        self.max_entries = max_entries
+        self._tokens: OrderedDict[Hashable, TokenResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = KeyedLocks()
+        self._expiry_heap: list[tuple[float, int, Hashable]] = []
+        self._heap_seq = itertools.count()
+        self._revalidating: set[Hashable] = set()
+        self._revalidate_after: dict[Hashable, float] = {}
+        self.evictions = 0
+        self.expirations = 0
+    
+    def _peek(self, key: Hashable) -> Optional[TokenResult]:
+        """Get a cached token (expired or not), marking it recently used."""
+        if self.max_entries is None:
+            return self._tokens.get(key)
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is not None:
+                self._tokens.move_to_end(key)
+            return token
+    
+    def get(self, key: Hashable) -> Optional[TokenResult]:
+        """Get a cached token if it has not expired.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            TokenResult if cached and still valid, None otherwise
+        """
+        token = self._peek(key)
+        if token is None or token.is_expired():
+            return None
+        return token
+    
+    def get_fresh(self, key: Hashable) -> Optional[TokenResult]:
+        """Get a cached token if it is not yet due for refresh.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            TokenResult if cached and outside the refresh window, None otherwise
+        """
+        token = self._peek(key)
+        if token is None or token.is_expired(self.skew_for(token)):
+            return None
+        return token
+    
+    def skew_for(self, token: TokenResult) -> float:
+        """Get the refresh skew to apply to a token.
+        
+        The skew is capped at half the token's lifetime so short-lived
+        tokens are not perpetually due for refresh.
+        """
+        expires_at = token.expires_at
+        if expires_at is None:
+            return self.refresh_skew
+        return min(self.refresh_skew, max((expires_at - token.acquired_at) / 2, 0))
+    
+    def put(self, key: Hashable, token: TokenResult) -> None:
+        """Store a token in the cache.
+        
+        Args:
+            key: Cache key
+            token: Token to cache
+        """
+        with self._lock:
+            self._tokens[key] = token
+            self._tokens.move_to_end(key)
+            if self.max_entries is None:
+                return
+            if token.expires_at is not None:
+                heapq.heappush(self._expiry_heap, (token.expires_at, next(self._heap_seq), key))
+                if len(self._expiry_heap) > 2 * self.max_entries:
+                    self._rebuild_expiry_heap()
+            if len(self._tokens) > self.max_entries:
+                self._evict()
+    
+    def _rebuild_expiry_heap(self) -> None:
+        """Drop heap entries of replaced or removed tokens (caller holds the lock)."""
+        self._expiry_heap = [
+            (token.expires_at, next(self._heap_seq), key)
+            for key, token in self._tokens.items()
+            if token.expires_at is not None
+        ]
+        heapq.heapify(self._expiry_heap)
+    
+    def _evict(self) -> None:
+        """Shrink the cache to ``max_entries`` (caller holds the lock)."""
+        now = time.time()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(heap)
+            token = self._tokens.get(key)
+            # Skip heap entries of tokens that have since been replaced
+            if token is not None and token.expires_at == expires_at:
+                self._drop(key, expired=True)
+        while len(self._tokens) > self.max_entries:
+            key = next(iter(self._tokens))
+            self._drop(key)
+    
+    def _drop(self, key: Hashable, expired: bool = False) -> None:
+        """Remove an entry, counting it as expired or evicted (caller holds the lock)."""
+        del self._tokens[key]
+        if expired:
+            self.expirations += 1
+        else:
+            self.evictions += 1
+    
+    def remove(self, key: Hashable) -> None:
+        """Remove a token from the cache."""
+        with self._lock:
+            self._tokens.pop(key, None)
+    
+    def purge_expired(self) -> int:
+        """Remove all expired tokens.
+        
+        Returns:
+            Number of tokens removed
+        """
+        now = time.time()
+        with self._lock:
+            expired = [k for k, t in self._tokens.items() if t.is_expired(now=now)]
+            for key in expired:
+                self._drop(key, expired=True)
+        return len(expired)
+    
+    def clear(self) -> None:
+        """Remove all cached tokens."""
+        with self._lock:
+            self._tokens.clear()
+            self._expiry_heap.clear()
+            self._revalidate_after.clear()
+    
+    def lock(self, key: Hashable) -> ContextManager[None]:
+        """Get the lock serializing acquisitions for a key.
+        
+        Holding this lock while fetching a token ensures only one
+        exchange per key is in flight at a time. The lock outlives
+        eviction, purging and clear() of the entry while anyone holds it.
+        
+        Returns:
+            Context manager holding the key's lock
+        """
+        return self._key_locks(key)
+    
+    def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Optional[TokenResult]],
+        serve_stale: bool = False,
+    ) -> Optional[TokenResult]:
+        """Get a cached token, fetching it on a miss.
+        
+        The fetch runs under the key's lock, so concurrent callers for the
+        same key wait for one acquisition instead of each starting their own.
+        
+        Args:
+            key: Cache key
+            fetch: Callable that acquires the token and stores it in the cache
+            serve_stale: Also serve tokens inside the refresh window (used while
+                a background refresher is keeping entries fresh)
+            
+        Returns:
+            TokenResult if cached or fetched, None if the fetch failed
+        """
+        lookup = self.get if serve_stale else self.get_fresh
+        token = lookup(key)
+        if token:
+            return token
+        
+        with self.lock(key):
+            token = lookup(key)
+            if token:
+                return token
+            return fetch()
+    
+    def get_or_revalidate(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Optional[TokenResult]],
+        refresh: Callable[[Hashable], Optional[TokenResult]],
+    ) -> Optional[TokenResult]:
+        """Get a cached token, refreshing it off the request path when due.
+        
+        Stale-while-revalidate: tokens inside the refresh window that have
+        not expired yet are returned immediately while ``refresh`` runs once
+        in a background thread. Only missing or expired tokens block on
+        ``fetch``.
+        
+        Args:
+            key: Cache key
+            fetch: Callable that acquires the token and stores it in the cache
+            refresh: Callable that re-acquires the token for a key and stores it
+            
+        Returns:
+            TokenResult if cached or fetched, None if the fetch failed
+        """
+        token = self._peek(key)
+        if token is not None and not token.is_expired():
+            if token.is_expired(self.skew_for(token)):
+                self.revalidate(key, refresh)
+            return token
+        return self.get_or_fetch(key, fetch, serve_stale=True)
+    
+    def revalidate(
+        self,
+        key: Hashable,
+        refresh: Callable[[Hashable], Optional[TokenResult]],
+    ) -> bool:
+        """Refresh a key in a background thread.
+        
+        At most one revalidation per key runs at a time, and a failed one is
+        not retried for DEFAULT_REFRESH_RETRY_SECONDS.
+        
+        Returns:
+            True if a revalidation was started
+        """
+        with self._lock:
+            if key in self._revalidating or self._revalidate_after.get(key, 0) > time.time():
+                return False
+            self._revalidating.add(key)
+        
+        def run() -> None:
+            try:
+                token = refresh(key)
+            except Exception as e:
+                console.print(f"[dim]Background token refresh failed: {e}[/dim]")
+                token = None
+            with self._lock:
+                self._revalidating.discard(key)
+                if token:
+                    self._revalidate_after.pop(key, None)
+                else:
+                    self._revalidate_after[key] = time.time() + DEFAULT_REFRESH_RETRY_SECONDS
+        
+        threading.Thread(target=run, name="token-revalidate", daemon=True).start()
+        return True
+    
+    def keys(self) -> list[Hashable]:
+        """Get all cached keys."""
+        with self._lock:
+            return list(self._tokens)
+    
+    def keys_due_for_refresh(self, now: Optional[float] = None) -> list[Hashable]:
+        """Get keys whose tokens have entered the refresh window.
+        
+        Args:
+            now: Current time (defaults to time.time())
+            
+        Returns:
+            List of keys that should be refreshed
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            return [
+                key for key, token in self._tokens.items()
+                if token.is_expired(self.skew_for(token), now=now)
+            ]
+    
+    def next_refresh_at(self) -> Optional[float]:
+        """Get the earliest time at which any cached token needs refreshing.
+        
+        Returns:
+            Epoch seconds, or None if no cached token has a known expiry
+        """
+        with self._lock:
+            times = [
+                token.expires_at - self.skew_for(token)
+                for token in self._tokens.values()
+                if token.expires_at is not None
+            ]
+        return min(times) if times else None
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tokens
+    
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+
+class BackgroundRefresher:
+    """Daemon thread that refreshes cache entries before they expire."""
+    
+    def __init__(
+        self,
+        cache: ExpiringTokenCache,
+        refresh: Callable[[Hashable], Optional[TokenResult]],
+        name: str = "token-refresher",
+        retry_interval: float = DEFAULT_REFRESH_RETRY_SECONDS,
+    ):
+        """Initialize the refresher.
+        
+        Args:
+            cache: Cache whose entries should be kept fresh
+            refresh: Callable that re-acquires the token for a key and stores it
+            name: Thread name
+            retry_interval: Seconds to wait before retrying a failed refresh
+        """
+        self.cache = cache
+        self._refresh = refresh
+        self._name = name
+        self._retry_interval = retry_interval
+        self._retry_at: dict[Hashable, float] = {}
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def is_running(self) -> bool:
+        """Check if the refresh thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """Start the refresh thread if it is not already running."""
+        if self.is_running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+    
+    def wake(self) -> None:
+        """Re-evaluate the refresh schedule (call after adding entries)."""
+        self._wake.set()
+    
+    def stop(self, timeout: Optional[float] = 5) -> None:
+        """Stop the refresh thread."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+    
+    def _run(self) -> None:
+        """Refresh loop."""
+        while not self._stopped.is_set():
+            self._wake.clear()
+            now = time.time()
+            for key in self.cache.keys_due_for_refresh(now):
+                if self._stopped.is_set():
+                    return
+                if self._retry_at.get(key, 0) > now:
+                    continue
+                try:
+                    token = self._refresh(key)
+                except Exception as e:
+                    console.print(f"[dim]Background token refresh failed: {e}[/dim]")
+                    token = None
+                if token:
+                    self._retry_at.pop(key, None)
+                else:
+                    self._retry_at[key] = time.time() + self._retry_interval
+            
+            self._wake.wait(self._seconds_until_next_run())
+    
+    def _seconds_until_next_run(self) -> float:
+        """Compute how long to sleep until the next refresh is due."""
+        now = time.time()
+        candidates = [t for t in self._retry_at.values() if t > now]
+        next_refresh = self.cache.next_refresh_at()
+        if next_refresh is not None:
+            if next_refresh > now:
+                candidates.append(next_refresh)
+            elif not candidates:
+                # Due entries are all waiting on a retry, which is handled above
+                candidates.append(now + self._retry_interval)
+        if not candidates:
+            return self._retry_interval * 10
+        return max(min(candidates) - now, 0.05)
@@ -0,0 +1,207 @@
+"""Latency, cache and failure statistics for token acquisition."""
+
+import bisect
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Optional
+
+import httpx
+
+from .models import TokenResult
+
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Cache lookup outcomes
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_REFRESH = "refresh"
+
+_AADSTS_PATTERN = re.compile(r"AADSTS\d+")
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (not thread-safe; guarded by TokenMetrics)."""
+    
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        """Initialize an empty histogram.
+        
+        Args:
+            buckets: Ascending bucket upper bounds in milliseconds
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, value_ms: float) -> None:
+        """Record one sample in milliseconds."""
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Estimate a percentile as the upper bound of its bucket.
+        
+        Args:
+            pct: Percentile (0-100)
+            
+        Returns:
+            Milliseconds (capped at the largest sample), or None if empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, round(pct / 100 * self.count))
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_ms)
+        return self.max_ms
+    
+    def snapshot(self) -> dict:
+        """Get count, mean, p50/p95/p99, max and per-bucket counts."""
+        labels = [f"<={b:g}ms" for b in self.buckets] + [f">{self.buckets[-1]:g}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms if self.count else None,
+            "buckets": {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
+def error_code(response: Optional[httpx.Response] = None, exc: Optional[BaseException] = None) -> str:
+    """Classify a failed token request.
+    
+    Args:
+        response: Error response (Entra or sidecar)
+        exc: Exception raised instead of a response
+        
+    Returns:
+        The first AADSTS code if present, else the OAuth ``error`` field,
+        else ``HTTP <status>``, or the exception class name
+    """
+    if response is None:
+        return type(exc).__name__ if exc is not None else "unknown"
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if isinstance(body, dict):
+        codes = body.get("error_codes")
+        if isinstance(codes, list) and codes:
+            return f"AADSTS{codes[0]}"
+        match = _AADSTS_PATTERN.search(str(body.get("error_description") or body.get("detail") or ""))
+        if match:
+            return match.group(0)
+        if isinstance(body.get("error"), str):
+            return body["error"]
+    return f"HTTP {response.status_code}"
+
+
+class TokenMetrics:
+    """Thread-safe counters and histograms for one token source.
+    
+    Records, per operation and scope, the latency of network calls (T1,
+    OBO, app token, sidecar), cache hits/misses/refreshes, failures by
+    error code, and the remaining lifetime of tokens when they are used.
+    """
+    
+    def __init__(self):
+        """Initialize empty statistics."""
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+        self._latency: dict[tuple[str, str], LatencyHistogram] = {}
+        self._cache: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self._failures: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self._time_to_expiry: dict[str, list[float]] = {}
+    
+    def record_latency(self, operation: str, scope: str, seconds: float) -> None:
+        """Record the duration of a network call.
+        
+        Args:
+            operation: Call type, e.g. ``t1``, ``obo``, ``app`` or ``sidecar``
+            scope: Requested scope (or sidecar API name)
+            seconds: Duration in seconds
+        """
+        with self._lock:
+            histogram = self._latency.get((operation, scope))
+            if histogram is None:
+                histogram = self._latency[(operation, scope)] = LatencyHistogram()
+            histogram.observe(seconds * 1000)
+    
+    def record_cache(self, scope: str, outcome: str) -> None:
+        """Count a cache lookup outcome (CACHE_HIT, CACHE_MISS or CACHE_REFRESH)."""
+        with self._lock:
+            self._cache[scope][outcome] += 1
+    
+    def record_failure(self, operation: str, code: str) -> None:
+        """Count a failed call by error code (see error_code)."""
+        with self._lock:
+            self._failures[operation][code] += 1
+    
+    def record_use(self, scope: str, token: Optional[TokenResult]) -> None:
+        """Record the remaining lifetime of a token handed to a caller."""
+        if token is None or token.expires_at is None:
+            return
+        remaining = token.expires_at - time.time()
+        with self._lock:
+            # [count, total, min]
+            stats = self._time_to_expiry.get(scope)
+            if stats is None:
+                self._time_to_expiry[scope] = [1, remaining, remaining]
+            else:
+                stats[0] += 1
+                stats[1] += remaining
+                stats[2] = min(stats[2], remaining)
+    
+    def snapshot(self) -> dict:
+        """Get a point-in-time copy of all statistics.
+        
+        Returns:
+            Dict with ``latency`` (``"operation scope"`` -> histogram summary),
+            ``cache`` (scope -> hit/miss/refresh counts and hit rate),
+            ``failures`` (operation -> error code -> count),
+            ``time_to_expiry`` (scope -> count/mean/min seconds) and
+            ``uptime_seconds``
+        """
+        with self._lock:
+            cache = {}
+            for scope, counts in self._cache.items():
+                lookups = counts[CACHE_HIT] + counts[CACHE_MISS]
+                cache[scope] = {
+                    "hits": counts[CACHE_HIT],
+                    "misses": counts[CACHE_MISS],
+                    "refreshes": counts[CACHE_REFRESH],
+                    "hit_rate": counts[CACHE_HIT] / lookups if lookups else None,
+                }
+            return {
+                "uptime_seconds": time.time() - self._started_at,
+                "latency": {
+                    f"{operation} {scope}": histogram.snapshot()
+                    for (operation, scope), histogram in self._latency.items()
+                },
+                "cache": cache,
+                "failures": {op: dict(codes) for op, codes in self._failures.items()},
+                "time_to_expiry": {
+                    scope: {"count": count, "mean_seconds": total / count, "min_seconds": minimum}
+                    for scope, (count, total, minimum) in self._time_to_expiry.items()
+                },
+            }
+    
+    def reset(self) -> None:
+        """Discard all recorded statistics."""
+        with self._lock:
+            self._started_at = time.time()
+            self._latency.clear()
+            self._cache.clear()
+            self._failures.clear()
+            self._time_to_expiry.clear()
@@ -1,16 +1,36 @@
 """Token provider abstraction for pluggable token acquisition strategies."""
 
+import time
 from typing import Protocol, Optional, runtime_checkable
 
 import httpx
 from rich.console import Console
 
-from .auth import OBOTokenManager, AZURE_COGNITIVE_SERVICES_SCOPE
+from .async_auth import AsyncOBOTokenManager
+from .auth import (
+    MultiUserOBOTokenManager,
+    OBOTokenManager,
+    AZURE_COGNITIVE_SERVICES_SCOPE,
+    DEFAULT_FANOUT_CONCURRENCY,
+    user_cache_key,
+)
+from .credentials import ClientCredential
 from .models import TokenResult
+from .token_cache import (
+    BackgroundRefresher,
+    ExpiringTokenCache,
+    DEFAULT_MAX_CACHED_TOKENS,
+    DEFAULT_REFRESH_SKEW_SECONDS,
+)
+from .token_metrics import CACHE_HIT, CACHE_MISS, CACHE_REFRESH, TokenMetrics, error_code
+from .token_store import create_token_store
 
 
 console = Console()
 
+# Lifetime assumed for sidecar tokens without an ``exp`` claim (e.g. opaque tokens)
+UNKNOWN_EXPIRY_TTL_SECONDS = 300
+
 
 @runtime_checkable
 class TokenProvider(Protocol):
@@ -31,6 +51,14 @@ class TokenProvider(Protocol):
         """
         ...
     
+    def update_user_token(self, user_token: str) -> None:
+        """Replace the user's token (Tc) after it has been renewed.
+        
+        Args:
+            user_token: The renewed access token with Blueprint as audience
+        """
+        ...
+    
     def get_openai_token(self) -> Optional[str]:
         """Get an OBO token (T2) for Azure OpenAI / Cognitive Services.
         
@@ -46,6 +74,15 @@ class TokenProvider(Protocol):
             Access token string if successful, None otherwise
         """
         ...
+    
+    def stats(self) -> dict:
+        """Get token acquisition statistics.
+        
+        Returns:
+            Latency histograms, cache counters, failures by error code and
+            time-to-expiry at use (see TokenMetrics.snapshot)
+        """
+        ...
 
 
 class DirectTokenProvider:
@@ -56,7 +93,7 @@ class DirectTokenProvider:
     
     Requires:
         - BLUEPRINT_APP_ID
-        - BLUEPRINT_CLIENT_SECRET
+        - BLUEPRINT_CLIENT_SECRET or a federated token (AZURE_FEDERATED_TOKEN_FILE)
         - AGENT_IDENTITY_APP_ID
         - MCP_SERVER_APP_ID (optional, for MCP tokens)
     """
@@ -65,24 +102,44 @@ class DirectTokenProvider:
         self,
         tenant_id: str,
         blueprint_app_id: str,
-        blueprint_client_secret: str,
+        blueprint_client_secret: Optional[str],
         agent_identity_app_id: str,
         mcp_server_app_id: Optional[str] = None,
+        refresh_skew: int = DEFAULT_REFRESH_SKEW_SECONDS,
+        background_refresh: bool = True,
+        persistent_cache: bool = False,
+        blueprint_credential: Optional[ClientCredential] = None,
+        stale_while_revalidate: bool = True,
+        shared_cache_path: Optional[str] = None,
     ):
         """Initialize direct token provider.
         
         Args:
             tenant_id: Azure AD tenant ID
             blueprint_app_id: Blueprint application ID
-            blueprint_client_secret: Blueprint client secret
+            blueprint_client_secret: Blueprint client secret (None if blueprint_credential is set)
             agent_identity_app_id: Agent identity application ID
             mcp_server_app_id: MCP server application ID (optional)
+            refresh_skew: Seconds before expiry at which tokens are refreshed
+            background_refresh: Refresh tokens in the background before they expire
+            persistent_cache: Reuse T1/T2 tokens from an encrypted on-disk cache
+            blueprint_credential: Credential used for T1 instead of the client secret
+            stale_while_revalidate: Serve tokens due for refresh while refreshing them asynchronously
+            shared_cache_path: SQLite token cache shared with other replicas
+                (overrides persistent_cache)
         """
         self.tenant_id = tenant_id
         self.blueprint_app_id = blueprint_app_id
         self.blueprint_client_secret = blueprint_client_secret
+        self.blueprint_credential = blueprint_credential
         self.agent_identity_app_id = agent_identity_app_id
         self.mcp_server_app_id = mcp_server_app_id
+        self.refresh_skew = refresh_skew
+        self.background_refresh = background_refresh
+        self.persistent_cache = persistent_cache
+        self.shared_cache_path = shared_cache_path
+        self.stale_while_revalidate = stale_while_revalidate
+        self.metrics = TokenMetrics()
         
         self._obo_manager: Optional[OBOTokenManager] = None
         self._initialized = False
@@ -101,8 +158,14 @@ class DirectTokenProvider:
                 tenant_id=self.tenant_id,
                 blueprint_app_id=self.blueprint_app_id,
                 blueprint_client_secret=self.blueprint_client_secret,
+                blueprint_credential=self.blueprint_credential,
                 agent_identity_app_id=self.agent_identity_app_id,
                 user_token=user_token,
+                refresh_skew=self.refresh_skew,
+                background_refresh=self.background_refresh,
+                token_store=create_token_store(self.shared_cache_path, self.persistent_cache),
+                stale_while_revalidate=self.stale_while_revalidate,
+                metrics=self.metrics,
             )
             self._initialized = True
             console.print("[green]✓ DirectTokenProvider initialized[/green]")
@@ -111,6 +174,15 @@ class DirectTokenProvider:
             console.print(f"[red]Failed to initialize DirectTokenProvider: {e}[/red]")
             return False
     
+    def update_user_token(self, user_token: str) -> None:
+        """Use a renewed user token (Tc) for subsequent OBO exchanges.
+        
+        Args:
+            user_token: User's renewed access token (Tc) with Blueprint audience
+        """
+        if self._obo_manager:
+            self._obo_manager.update_user_token(user_token)
+    
     def get_openai_token(self) -> Optional[str]:
         """Get OBO token for Azure OpenAI using direct exchange.
         
@@ -142,10 +214,368 @@ class DirectTokenProvider:
         token = self._obo_manager.get_token_for_scope(mcp_scope)
         return token.access_token if token else None
     
+    def stats(self) -> dict:
+        """Get T1/T2 acquisition statistics (see TokenMetrics.snapshot)."""
+        return self.metrics.snapshot()
+    
+    def clear_cache(self) -> None:
+        """Clear cached tokens."""
+        if self._obo_manager:
+            self._obo_manager.clear_cache()
+    
+    def close(self) -> None:
+        """Stop background token refresh and clear cached tokens."""
+        if self._obo_manager:
+            self._obo_manager.close()
+
+
+class MultiAgentTokenProvider:
+    """Direct token provider for many agent identities under one Blueprint.
+    
+    Each agent identity gets its own T1 (its ``fmi_path``); T2 tokens are
+    cached per (agent identity, scope). All identities share one Blueprint
+    credential, one token cache and the pooled token endpoint connection.
+    warm_up() acquires every identity's tokens in a single parallel wave
+    bounded by ``max_concurrency`` instead of N serial T1 -> T2 chains, and
+    for_agent() returns a TokenProvider bound to one identity.
+    
+    Without a user token (``app_only=True``) app-only tokens are minted for
+    the agent identities themselves.
+    """
+    
+    def __init__(
+        self,
+        tenant_id: str,
+        blueprint_app_id: str,
+        blueprint_client_secret: Optional[str],
+        agent_identity_app_ids: list[str],
+        mcp_server_app_id: Optional[str] = None,
+        refresh_skew: int = DEFAULT_REFRESH_SKEW_SECONDS,
+        max_entries: int = DEFAULT_MAX_CACHED_TOKENS,
+        max_concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+        blueprint_credential: Optional[ClientCredential] = None,
+        app_only: bool = False,
+        shared_cache_path: Optional[str] = None,
+    ):
+        """Initialize multi-agent token provider.
+        
+        Args:
+            tenant_id: Azure AD tenant ID
+            blueprint_app_id: Blueprint application ID
+            blueprint_client_secret: Blueprint client secret (None if blueprint_credential is set)
+            agent_identity_app_ids: Agent identity application IDs under the Blueprint
+            mcp_server_app_id: MCP server application ID (optional)
+            refresh_skew: Seconds before expiry at which tokens are refreshed
+            max_entries: Maximum number of cached T2 tokens
+            max_concurrency: Maximum number of token requests in flight during a wave
+            blueprint_credential: Credential used for T1 instead of the client secret
+            app_only: Mint app-only tokens for the agent identities (no user token)
+            shared_cache_path: SQLite token cache shared with other replicas
+        """
+        self.agent_identity_app_ids = list(dict.fromkeys(agent_identity_app_ids))
+        self.mcp_server_app_id = mcp_server_app_id
+        self.max_concurrency = max_concurrency
+        self.app_only = app_only
+        self.metrics = TokenMetrics()
+        
+        self._manager = MultiUserOBOTokenManager(
+            tenant_id=tenant_id,
+            blueprint_app_id=blueprint_app_id,
+            blueprint_client_secret=blueprint_client_secret,
+            blueprint_credential=blueprint_credential,
+            refresh_skew=refresh_skew,
+            max_entries=max_entries,
+            metrics=self.metrics,
+            token_store=create_token_store(shared_cache_path),
+        )
+        self._user_token: Optional[str] = None
+        self._initialized = False
+    
+    @property
+    def scopes(self) -> list[str]:
+        """Scopes acquired for every agent identity by warm_up()."""
+        scopes = [AZURE_COGNITIVE_SERVICES_SCOPE]
+        if self.mcp_server_app_id:
+            scopes.append(f"api://{self.mcp_server_app_id}/.default")
+        return scopes
+    
+    def initialize(self, user_token: Optional[str] = None) -> bool:
+        """Initialize with the user's token (Tc).
+        
+        Args:
+            user_token: User's access token with Blueprint audience (ignored if app_only)
+            
+        Returns:
+            True if successful
+        """
+        if not self.app_only and not user_token:
+            console.print("[red]MultiAgentTokenProvider requires a user token unless app_only is set[/red]")
+            return False
+        self._user_token = None if self.app_only else user_token
+        self._initialized = True
+        console.print(
+            f"[green]✓ MultiAgentTokenProvider initialized ({len(self.agent_identity_app_ids)} agent identities)[/green]"
+        )
+        return True
+    
+    def update_user_token(self, user_token: str) -> None:
+        """Use a renewed user token (Tc) for subsequent OBO exchanges.
+        
+        Args:
+            user_token: User's renewed access token (Tc) with Blueprint audience
+        """
+        if not self.app_only:
+            self._user_token = user_token
+    
+    def get_token(self, agent_identity_app_id: str, scope: str) -> Optional[str]:
+        """Get a T2 token for an agent identity and scope.
+        
+        Args:
+            agent_identity_app_id: Agent identity application ID
+            scope: Target resource scope
+            
+        Returns:
+            Access token string if successful, None otherwise
+        """
+        if not self._initialized:
+            console.print("[red]MultiAgentTokenProvider not initialized[/red]")
+            return None
+        if self._user_token:
+            token = self._manager.get_token_for_scope(self._user_token, agent_identity_app_id, scope)
+        else:
+            token = self._manager.get_app_token(agent_identity_app_id, scope)
+        return token.access_token if token else None
+    
+    def get_tokens(self, requests: list[tuple[str, str]]) -> dict[tuple[str, str], Optional[str]]:
+        """Get T2 tokens for many (agent identity, scope) pairs in parallel.
+        
+        Args:
+            requests: (agent identity application ID, scope) pairs
+            
+        Returns:
+            Dict of (agent identity, scope) -> access token (None where it failed)
+        """
+        if not self._initialized:
+            console.print("[red]MultiAgentTokenProvider not initialized[/red]")
+            return {pair: None for pair in requests}
+        tokens = self._manager.get_tokens(requests, self._user_token, self.max_concurrency)
+        return {pair: token.access_token if token else None for pair, token in tokens.items()}
+    
+    def warm_up(self, scopes: Optional[list[str]] = None) -> dict[tuple[str, str], Optional[str]]:
+        """Acquire T1 and T2 tokens for every agent identity in one parallel wave.
+        
+        Args:
+            scopes: Scopes to acquire for each identity (defaults to Azure OpenAI and MCP)
+            
+        Returns:
+            Dict of (agent identity, scope) -> access token (None where it failed)
+        """
+        scopes = scopes or self.scopes
+        return self.get_tokens([
+            (agent_id, scope) for agent_id in self.agent_identity_app_ids for scope in scopes
+        ])
+    
+    def for_agent(self, agent_identity_app_id: str) -> "AgentIdentityTokenProvider":
+        """Get a TokenProvider bound to one agent identity.
+        
+        Args:
+            agent_identity_app_id: Agent identity application ID
+            
+        Returns:
+            AgentIdentityTokenProvider sharing this provider's cache and credential
+        """
+        return AgentIdentityTokenProvider(self, agent_identity_app_id)
+    
+    def stats(self) -> dict:
+        """Get T1/T2 acquisition statistics for all agent identities."""
+        return self.metrics.snapshot()
+    
+    def clear_cache(self) -> None:
+        """Clear cached tokens for all agent identities."""
+        self._manager.clear_cache()
+    
+    def close(self) -> None:
+        """Clear cached tokens and close the token store."""
+        self._manager.close()
+
+
+class AgentIdentityTokenProvider:
+    """TokenProvider view of a MultiAgentTokenProvider for one agent identity."""
+    
+    def __init__(self, parent: MultiAgentTokenProvider, agent_identity_app_id: str):
+        """Bind to an agent identity.
+        
+        Args:
+            parent: Multi-agent provider holding the shared cache
+            agent_identity_app_id: Agent identity application ID
+        """
+        self.parent = parent
+        self.agent_identity_app_id = agent_identity_app_id
+    
+    def initialize(self, user_token: str) -> bool:
+        """Initialize the shared provider with the user's token (Tc)."""
+        return self.parent.initialize(user_token)
+    
+    def update_user_token(self, user_token: str) -> None:
+        """Pass a renewed user token (Tc) to the shared provider."""
+        self.parent.update_user_token(user_token)
+    
+    def get_openai_token(self) -> Optional[str]:
+        """Get a T2 for Azure OpenAI for this agent identity."""
+        return self.parent.get_token(self.agent_identity_app_id, AZURE_COGNITIVE_SERVICES_SCOPE)
+    
+    def get_mcp_token(self) -> Optional[str]:
+        """Get a T2 for the MCP server for this agent identity."""
+        if not self.parent.mcp_server_app_id:
+            console.print("[dim]No MCP_SERVER_APP_ID configured, skipping MCP token[/dim]")
+            return None
+        return self.parent.get_token(self.agent_identity_app_id, f"api://{self.parent.mcp_server_app_id}/.default")
+    
+    def stats(self) -> dict:
+        """Get statistics of the shared provider."""
+        return self.parent.stats()
+
+
+@runtime_checkable
+class AsyncTokenProvider(Protocol):
+    """Protocol for asyncio-native token acquisition strategies."""
+    
+    async def initialize(self, user_token: str) -> bool:
+        """Initialize the provider with the user's token (Tc)."""
+        ...
+    
+    def update_user_token(self, user_token: str) -> None:
+        """Replace the user's token (Tc) after it has been renewed."""
+        ...
+    
+    async def get_openai_token(self) -> Optional[str]:
+        """Get an OBO token (T2) for Azure OpenAI / Cognitive Services."""
+        ...
+    
+    async def get_mcp_token(self) -> Optional[str]:
+        """Get an OBO token (T2) for MCP server."""
+        ...
+    
+    def stats(self) -> dict:
+        """Get token acquisition statistics (see TokenMetrics.snapshot)."""
+        ...
+
+
+class AsyncDirectTokenProvider:
+    """Asyncio-native token provider using direct OBO exchange.
+    
+    Wraps AsyncOBOTokenManager, so concurrent callers needing the same
+    token share a single in-flight exchange with Entra.
+    """
+    
+    def __init__(
+        self,
+        tenant_id: str,
+        blueprint_app_id: str,
+        blueprint_client_secret: Optional[str],
+        agent_identity_app_id: str,
+        mcp_server_app_id: Optional[str] = None,
+        refresh_skew: int = DEFAULT_REFRESH_SKEW_SECONDS,
+        blueprint_credential: Optional[ClientCredential] = None,
+    ):
+        """Initialize async direct token provider.
+        
+        Args:
+            tenant_id: Azure AD tenant ID
+            blueprint_app_id: Blueprint application ID
+            blueprint_client_secret: Blueprint client secret (None if blueprint_credential is set)
+            agent_identity_app_id: Agent identity application ID
+            mcp_server_app_id: MCP server application ID (optional)
+            refresh_skew: Seconds before expiry at which tokens are refreshed
+            blueprint_credential: Credential used for T1 instead of the client secret
+        """
+        self.tenant_id = tenant_id
+        self.blueprint_app_id = blueprint_app_id
+        self.blueprint_client_secret = blueprint_client_secret
+        self.blueprint_credential = blueprint_credential
+        self.agent_identity_app_id = agent_identity_app_id
+        self.mcp_server_app_id = mcp_server_app_id
+        self.refresh_skew = refresh_skew
+        self.metrics = TokenMetrics()
+        
+        self._obo_manager: Optional[AsyncOBOTokenManager] = None
+    
+    async def initialize(self, user_token: str) -> bool:
+        """Initialize with user token and create the async OBO manager.
+        
+        Args:
+            user_token: User's access token (Tc) with Blueprint audience
+            
+        Returns:
+            True if successful
+        """
+        if self._obo_manager:
+            await self._obo_manager.aclose()
+        self._obo_manager = AsyncOBOTokenManager(
+            tenant_id=self.tenant_id,
+            blueprint_app_id=self.blueprint_app_id,
+            blueprint_client_secret=self.blueprint_client_secret,
+            blueprint_credential=self.blueprint_credential,
+            agent_identity_app_id=self.agent_identity_app_id,
+            user_token=user_token,
+            refresh_skew=self.refresh_skew,
+            metrics=self.metrics,
+        )
+        console.print("[green]✓ AsyncDirectTokenProvider initialized[/green]")
+        return True
+    
+    def update_user_token(self, user_token: str) -> None:
+        """Use a renewed user token (Tc) for subsequent OBO exchanges.
+        
+        Args:
+            user_token: User's renewed access token (Tc) with Blueprint audience
+        """
+        if self._obo_manager:
+            self._obo_manager.update_user_token(user_token)
+    
+    async def get_openai_token(self) -> Optional[str]:
+        """Get OBO token for Azure OpenAI using direct exchange.
+        
+        Returns:
+            Access token string if successful, None otherwise
+        """
+        if not self._obo_manager:
+            console.print("[red]AsyncDirectTokenProvider not initialized[/red]")
+            return None
+        
+        token = await self._obo_manager.get_azure_openai_token()
+        return token.access_token if token else None
+    
+    async def get_mcp_token(self) -> Optional[str]:
+        """Get OBO token for MCP server using direct exchange.
+        
+        Returns:
+            Access token string if successful, None otherwise
+        """
+        if not self._obo_manager:
+            console.print("[red]AsyncDirectTokenProvider not initialized[/red]")
+            return None
+        
+        if not self.mcp_server_app_id:
+            return None
+        
+        token = await self._obo_manager.get_token_for_scope(f"api://{self.mcp_server_app_id}/.default")
+        return token.access_token if token else None
+    
+    def stats(self) -> dict:
+        """Get T1/T2 acquisition statistics (see TokenMetrics.snapshot)."""
+        return self.metrics.snapshot()
+    
     def clear_cache(self) -> None:
         """Clear cached tokens."""
         if self._obo_manager:
             self._obo_manager.clear_cache()
+    
+    async def aclose(self) -> None:
+        """Clear cached tokens and release the HTTP client."""
+        if self._obo_manager:
+            await self._obo_manager.aclose()
+            self._obo_manager = None
 
 
 class SidecarTokenProvider:
@@ -153,6 +583,8 @@ class SidecarTokenProvider:
     
     This calls the sidecar's HTTP API to perform token exchange,
     offloading the T1/T2 exchange logic to the sidecar container.
+    Tokens are cached per downstream API using the JWT ``exp`` claim and
+    refreshed ahead of expiry over a long-lived keep-alive connection.
     
     Requires:
         - SIDECAR_URL
@@ -167,6 +599,9 @@ class SidecarTokenProvider:
         openai_api_name: str = "openai",
         mcp_api_name: str = "mcp",
         agent_identity_app_id: Optional[str] = None,
+        refresh_skew: int = DEFAULT_REFRESH_SKEW_SECONDS,
+        background_refresh: bool = True,
+        stale_while_revalidate: bool = True,
     ):
         """Initialize sidecar token provider.
         
@@ -175,18 +610,40 @@ class SidecarTokenProvider:
             openai_api_name: Name of the OpenAI downstream API in sidecar config
             mcp_api_name: Name of the MCP downstream API in sidecar config
             agent_identity_app_id: Optional agent identity to pass to sidecar
+            refresh_skew: Seconds before expiry at which tokens are refreshed
+            background_refresh: Refresh tokens in the background before they expire
+            stale_while_revalidate: Serve tokens due for refresh while refreshing them asynchronously
         """
         self.sidecar_url = sidecar_url.rstrip("/")
         self.openai_api_name = openai_api_name
         self.mcp_api_name = mcp_api_name
         self.agent_identity_app_id = agent_identity_app_id
+        self.stale_while_revalidate = stale_while_revalidate
+        self.metrics = TokenMetrics()
         
         self._user_token: Optional[str] = None
         self._initialized = False
+        self._client: Optional[httpx.Client] = None
         
-        # Cache tokens to avoid repeated sidecar calls
-        self._openai_token: Optional[str] = None
-        self._mcp_token: Optional[str] = None
+        # Cache tokens by API name to avoid repeated sidecar calls
+        self._cache = ExpiringTokenCache(refresh_skew=refresh_skew)
+        self._refresher: Optional[BackgroundRefresher] = None
+        if background_refresh:
+            self._refresher = BackgroundRefresher(
+                self._cache,
+                self._refresh_api,
+                name="sidecar-token-refresher",
+            )
+    
+    def _get_client(self) -> httpx.Client:
+        """Get the long-lived HTTP client for sidecar calls."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.Client(
+                base_url=self.sidecar_url,
+                timeout=30,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._client
     
     def initialize(self, user_token: str) -> bool:
         """Initialize with user token.
@@ -201,24 +658,37 @@ class SidecarTokenProvider:
         
         # Verify sidecar is reachable
         try:
-            with httpx.Client(timeout=10) as client:
-                response = client.get(f"{self.sidecar_url}/healthz")
-                if response.status_code == 200:
-                    self._initialized = True
-                    console.print(f"[green]✓ SidecarTokenProvider initialized (sidecar at {self.sidecar_url})[/green]")
-                    return True
-                else:
-                    console.print(f"[red]Sidecar health check failed: HTTP {response.status_code}[/red]")
-                    return False
+            response = self._get_client().get("/healthz", timeout=10)
+            if response.status_code == 200:
+                self._initialized = True
+                console.print(f"[green]✓ SidecarTokenProvider initialized (sidecar at {self.sidecar_url})[/green]")
+                return True
+            else:
+                console.print(f"[red]Sidecar health check failed: HTTP {response.status_code}[/red]")
+                return False
         except httpx.RequestError as e:
             console.print(f"[red]Failed to connect to sidecar at {self.sidecar_url}: {e}[/red]")
             return False
     
-    def _get_authorization_header(self, api_name: str) -> Optional[str]:
+    def update_user_token(self, user_token: str) -> None:
+        """Send a renewed user token (Tc) with subsequent sidecar calls.
+        
+        Cached tokens stay valid for the same user; they are dropped if the
+        new token belongs to a different user.
+        
+        Args:
+            user_token: User's renewed access token (Tc) with Blueprint audience
+        """
+        if self._user_token and user_cache_key(user_token) != user_cache_key(self._user_token):
+            self._cache.clear()
+        self._user_token = user_token
+    
+    def _get_authorization_header(self, api_name: str, verbose: bool = True) -> Optional[str]:
         """Call sidecar to get authorization header for a downstream API.
         
         Args:
             api_name: Name of the downstream API in sidecar config
+            verbose: Print progress messages
             
         Returns:
             Access token string (without "Bearer " prefix) if successful, None otherwise
@@ -228,7 +698,7 @@ class SidecarTokenProvider:
             return None
         
         # Build URL with query parameters
-        url = f"{self.sidecar_url}/AuthorizationHeader/{api_name}"
+        url = f"/AuthorizationHeader/{api_name}"
         params = {
             "optionsOverride.RequestAppToken": "false",  # Explicitly request OBO flow
         }
@@ -242,49 +712,97 @@ class SidecarTokenProvider:
         }
         
         try:
-            console.print(f"[dim]Calling sidecar: GET /AuthorizationHeader/{api_name}[/dim]")
+            if verbose:
+                console.print(f"[dim]Calling sidecar: GET /AuthorizationHeader/{api_name}[/dim]")
             
-            with httpx.Client(timeout=30) as client:
-                response = client.get(url, params=params, headers=headers)
+            start = time.perf_counter()
+            try:
+                response = self._get_client().get(url, params=params, headers=headers)
+            finally:
+                self.metrics.record_latency("sidecar", api_name, time.perf_counter() - start)
+            
+            if response.status_code == 200:
+                # Response is JSON: {"authorizationHeader": "Bearer <token>"}
+                try:
+                    data = response.json()
+                    auth_header = data.get("authorizationHeader", "")
+                except Exception:
+                    # Fallback: treat as plain text if not JSON
+                    auth_header = response.text.strip()
                 
-                if response.status_code == 200:
-                    # Response is JSON: {"authorizationHeader": "Bearer <token>"}
-                    try:
-                        data = response.json()
-                        auth_header = data.get("authorizationHeader", "")
-                    except Exception:
-                        # Fallback: treat as plain text if not JSON
-                        auth_header = response.text.strip()
-                    
-                    # Strip "Bearer " prefix if present
-                    if auth_header.lower().startswith("bearer "):
-                        token = auth_header[7:]  # Remove "Bearer " prefix
-                    else:
-                        token = auth_header
-                    
-                    console.print(f"[green]✓ Got token from sidecar for {api_name}[/green]")
-                    return token
+                # Strip "Bearer " prefix if present
+                if auth_header.lower().startswith("bearer "):
+                    token = auth_header[7:]  # Remove "Bearer " prefix
                 else:
-                    error_text = response.text[:200] if response.text else "No error details"
-                    console.print(f"[red]Sidecar request failed: HTTP {response.status_code}[/red]")
-                    console.print(f"[red]Error: {error_text}[/red]")
-                    return None
-                    
+                    token = auth_header
+                
+                if verbose:
+                    console.print(f"[green]✓ Got token from sidecar for {api_name}[/green]")
+                return token
+            else:
+                error_text = response.text[:200] if response.text else "No error details"
+                console.print(f"[red]Sidecar request failed: HTTP {response.status_code}[/red]")
+                console.print(f"[red]Error: {error_text}[/red]")
+                self.metrics.record_failure("sidecar", error_code(response))
+                return None
+                
         except httpx.RequestError as e:
             console.print(f"[red]Failed to call sidecar: {e}[/red]")
+            self.metrics.record_failure("sidecar", error_code(exc=e))
             return None
     
+    def _fetch_token(self, api_name: str, verbose: bool = True) -> Optional[TokenResult]:
+        """Get a token for an API from the sidecar and cache it.
+        
+        The sidecar does not return the token lifetime, so expiry is
+        read from the JWT ``exp`` claim. Tokens without one (opaque tokens)
+        are cached for UNKNOWN_EXPIRY_TTL_SECONDS, since a token that never
+        expires would be served and never refreshed.
+        """
+        access_token = self._get_authorization_header(api_name, verbose=verbose)
+        if not access_token:
+            return None
+        
+        # The exp claim takes precedence over expires_in when present
+        token = TokenResult(access_token=access_token, expires_in=UNKNOWN_EXPIRY_TTL_SECONDS)
+        self._cache.put(api_name, token)
+        if self._refresher:
+            self._refresher.start()
+            self._refresher.wake()
+        return token
+    
+    def _refresh_api(self, api_name: str) -> Optional[TokenResult]:
+        """Re-acquire a cached token (called by the background refresher)."""
+        self.metrics.record_cache(api_name, CACHE_REFRESH)
+        with self._cache.lock(api_name):
+            return self._fetch_token(api_name, verbose=False)
+    
+    def _get_token(self, api_name: str) -> Optional[str]:
+        """Get a token for an API from cache, calling the sidecar on a miss."""
+        serve_stale = bool(self._refresher and self._refresher.is_running)
+        missed = False
+        
+        def fetch() -> Optional[TokenResult]:
+            nonlocal missed
+            missed = True
+            return self._fetch_token(api_name)
+        
+        if self.stale_while_revalidate and not serve_stale:
+            token = self._cache.get_or_revalidate(api_name, fetch, self._refresh_api)
+        else:
+            token = self._cache.get_or_fetch(api_name, fetch, serve_stale=serve_stale)
+        
+        self.metrics.record_cache(api_name, CACHE_MISS if missed else CACHE_HIT)
+        self.metrics.record_use(api_name, token)
+        return token.access_token if token else None
+    
     def get_openai_token(self) -> Optional[str]:
         """Get OBO token for Azure OpenAI via sidecar.
         
         Returns:
             Access token string if successful, None otherwise
         """
-        if self._openai_token:
-            return self._openai_token
-        
-        self._openai_token = self._get_authorization_header(self.openai_api_name)
-        return self._openai_token
+        return self._get_token(self.openai_api_name)
     
     def get_mcp_token(self) -> Optional[str]:
         """Get OBO token for MCP server via sidecar.
@@ -292,16 +810,24 @@ class SidecarTokenProvider:
         Returns:
             Access token string if successful, None otherwise
         """
-        if self._mcp_token:
-            return self._mcp_token
-        
-        self._mcp_token = self._get_authorization_header(self.mcp_api_name)
-        return self._mcp_token
+        return self._get_token(self.mcp_api_name)
+    
+    def stats(self) -> dict:
+        """Get sidecar call statistics (see TokenMetrics.snapshot)."""
+        return self.metrics.snapshot()
     
     def clear_cache(self) -> None:
         """Clear cached tokens."""
-        self._openai_token = None
-        self._mcp_token = None
+        self._cache.clear()
+    
+    def close(self) -> None:
+        """Stop background refresh, clear cached tokens and close the sidecar connection."""
+        if self._refresher:
+            self._refresher.stop()
+        self.clear_cache()
+        if self._client is not None:
+            self._client.close()
+            self._client = None
 
 
 def create_token_provider(
@@ -312,6 +838,12 @@ def create_token_provider(
     blueprint_client_secret: Optional[str] = None,
     agent_identity_app_id: Optional[str] = None,
     mcp_server_app_id: Optional[str] = None,
+    refresh_skew: int = DEFAULT_REFRESH_SKEW_SECONDS,
+    background_refresh: bool = True,
+    persistent_cache: bool = False,
+    blueprint_credential: Optional[ClientCredential] = None,
+    stale_while_revalidate: bool = True,
+    shared_cache_path: Optional[str] = None,
     # Sidecar mode parameters
     sidecar_url: str = "http://localhost:5000",
     sidecar_openai_api_name: str = "openai",
@@ -326,6 +858,12 @@ def create_token_provider(
         blueprint_client_secret: Blueprint client secret (direct mode)
         agent_identity_app_id: Agent identity application ID (both modes)
         mcp_server_app_id: MCP server application ID (direct mode)
+        refresh_skew: Seconds before expiry at which tokens are refreshed
+        background_refresh: Refresh tokens in the background
+        persistent_cache: Reuse tokens from an encrypted on-disk cache (direct mode)
+        blueprint_credential: Credential used instead of the client secret (direct mode)
+        stale_while_revalidate: Serve tokens due for refresh while refreshing them asynchronously
+        shared_cache_path: SQLite token cache shared with other replicas (direct mode)
         sidecar_url: Sidecar URL (sidecar mode)
         sidecar_openai_api_name: OpenAI API name in sidecar config (sidecar mode)
         sidecar_mcp_api_name: MCP API name in sidecar config (sidecar mode)
@@ -337,10 +875,10 @@ def create_token_provider(
         ValueError: If mode is invalid or required parameters are missing
     """
     if mode == "direct":
-        if not all([tenant_id, blueprint_app_id, blueprint_client_secret, agent_identity_app_id]):
+        if not all([tenant_id, blueprint_app_id, blueprint_client_secret or blueprint_credential, agent_identity_app_id]):
             raise ValueError(
                 "Direct mode requires: tenant_id, blueprint_app_id, "
-                "blueprint_client_secret, agent_identity_app_id"
+                "blueprint_client_secret (or blueprint_credential), agent_identity_app_id"
             )
         
         console.print("[bold blue]Using DirectTokenProvider (direct OBO exchange)[/bold blue]")
@@ -350,6 +888,12 @@ def create_token_provider(
             blueprint_client_secret=blueprint_client_secret,
             agent_identity_app_id=agent_identity_app_id,
             mcp_server_app_id=mcp_server_app_id,
+            refresh_skew=refresh_skew,
+            background_refresh=background_refresh,
+            persistent_cache=persistent_cache,
+            blueprint_credential=blueprint_credential,
+            stale_while_revalidate=stale_while_revalidate,
+            shared_cache_path=shared_cache_path,
         )
     
     elif mode == "sidecar":
@@ -359,6 +903,9 @@ def create_token_provider(
             openai_api_name=sidecar_openai_api_name,
             mcp_api_name=sidecar_mcp_api_name,
             agent_identity_app_id=agent_identity_app_id,
+            refresh_skew=refresh_skew,
+            background_refresh=background_refresh,
+            stale_while_revalidate=stale_while_revalidate,
         )
     
     else:
@@ -0,0 +1,228 @@
+"""Local token vending server compatible with the Entra SDK sidecar API."""
+
+import json
+import time
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from rich.console import Console
+
+from .auth import MultiUserOBOTokenManager, hash_user_token
+from .token_validation import UserTokenValidator
+
+
+console = Console()
+
+# Seconds between sweeps of expired tokens from the shared cache
+PURGE_INTERVAL_SECONDS = 60
+
+# Route prefix of the sidecar's authorization header endpoint (case-insensitive)
+AUTHORIZATION_HEADER_PATH = "/authorizationheader/"
+
+
+@dataclass(frozen=True)
+class DownstreamApi:
+    """A named downstream API, mirroring the sidecar's ``DownstreamApis`` config.
+    
+    Attributes:
+        name: API name used in ``/AuthorizationHeader/{name}``
+        scopes: Scopes requested for the API
+        request_app_token: Issue an app-only token instead of an OBO token
+            unless the request overrides it
+    """
+    
+    name: str
+    scopes: tuple[str, ...]
+    request_app_token: bool = False
+
+
+def parse_downstream_api(spec: str, request_app_token: bool = False) -> DownstreamApi:
+    """Parse a ``NAME=SCOPE[,SCOPE...]`` downstream API definition.
+    
+    Args:
+        spec: API definition, e.g. ``mcp=api://<app-id>/.default``
+        request_app_token: Issue app-only tokens for this API by default
+        
+    Returns:
+        DownstreamApi
+        
+    Raises:
+        ValueError: If the definition has no name or no scopes
+    """
+    name, _, scopes = spec.partition("=")
+    scope_list = tuple(s for s in scopes.replace(",", " ").split() if s)
+    if not name.strip() or not scope_list:
+        raise ValueError(f"Invalid downstream API '{spec}', expected NAME=SCOPE[,SCOPE...]")
+    return DownstreamApi(name=name.strip(), scopes=scope_list, request_app_token=request_app_token)
+
+
+def _problem(status: HTTPStatus, detail: str) -> tuple[int, dict]:
+    """Build an RFC 7807 problem response like the sidecar's error responses."""
+    return status.value, {"title": status.phrase, "status": status.value, "detail": detail}
+
+
+def _bearer_token(authorization: Optional[str]) -> Optional[str]:
+    """Extract the token from an ``Authorization: Bearer`` header."""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+class TokenVendingServer(ThreadingHTTPServer):
+    """Serves ``/AuthorizationHeader/{apiName}`` and ``/healthz`` like the sidecar.
+    
+    All callers on the node share one MultiUserOBOTokenManager, so T1 is
+    acquired once per agent identity and each (user, agent identity, scope)
+    T2 once per lifetime. Clients such as SidecarTokenProvider can point
+    SIDECAR_URL at this server instead of the .NET sidecar.
+    
+    Supported query parameters: ``AgentIdentity``,
+    ``optionsOverride.RequestAppToken`` and ``optionsOverride.Scopes``.
+    
+    With a ``user_token_validator``, bearer tokens are rejected unless their
+    signature, audience and expiry verify, and cached T2 tokens are keyed by
+    the verified user. Without one, T2 tokens are keyed by a SHA-256 of the
+    full bearer token so that forged claims cannot select another user's token.
+    """
+    
+    daemon_threads = True
+    
+    # Accept bursts of new connections from many clients without SYN drops
+    request_queue_size = 128
+    
+    def __init__(
+        self,
+        address: tuple[str, int],
+        manager: MultiUserOBOTokenManager,
+        apis: list[DownstreamApi],
+        default_agent_identity: Optional[str] = None,
+        verbose: bool = False,
+        user_token_validator: Optional[UserTokenValidator] = None,
+    ):
+        """Initialize and bind the server.
+        
+        Args:
+            address: (host, port) to listen on
+            manager: Shared token manager performing the T1/T2 exchanges
+            apis: Downstream APIs that tokens can be requested for
+            default_agent_identity: Agent identity used when a request has no
+                ``AgentIdentity`` parameter
+            verbose: Log every request
+            user_token_validator: Validates bearer tokens before any cache lookup
+        """
+        self.manager = manager
+        self.apis = {api.name.lower(): api for api in apis}
+        self.default_agent_identity = default_agent_identity
+        self.verbose = verbose
+        self.user_token_validator = user_token_validator
+        self._last_purge = time.monotonic()
+        super().__init__(address, _TokenRequestHandler)
+    
+    def service_actions(self) -> None:
+        """Periodically drop expired tokens (called by serve_forever)."""
+        if time.monotonic() - self._last_purge >= PURGE_INTERVAL_SECONDS:
+            self._last_purge = time.monotonic()
+            self.manager.purge_expired()
+    
+    def authorization_header(
+        self,
+        api_name: str,
+        query: dict[str, list[str]],
+        authorization: Optional[str],
+    ) -> tuple[int, dict]:
+        """Acquire a token for a downstream API.
+        
+        Args:
+            api_name: Downstream API name from the request path
+            query: Parsed query string
+            authorization: Incoming ``Authorization`` header (the user's Tc)
+            
+        Returns:
+            Tuple of (HTTP status, JSON body). On success the body is
+            ``{"authorizationHeader": "Bearer <token>"}``.
+        """
+        api = self.apis.get(api_name.lower())
+        if api is None:
+            return _problem(HTTPStatus.NOT_FOUND, f"Downstream API '{api_name}' is not configured")
+        
+        params = {key.lower(): values for key, values in query.items()}
+        agent_identity = (params.get("agentidentity") or [self.default_agent_identity])[0]
+        if not agent_identity:
+            return _problem(HTTPStatus.BAD_REQUEST, "AgentIdentity is required")
+        
+        request_app_token = api.request_app_token
+        override = params.get("optionsoverride.requestapptoken")
+        if override:
+            request_app_token = override[0].lower() == "true"
+        scope = " ".join(params.get("optionsoverride.scopes") or api.scopes)
+        
+        if request_app_token:
+            token = self.manager.get_app_token(agent_identity, scope)
+        else:
+            user_token = _bearer_token(authorization)
+            if not user_token:
+                return _problem(HTTPStatus.UNAUTHORIZED, "A bearer user token is required for OBO")
+            user_key = self._user_key(user_token)
+            if user_key is None:
+                return _problem(HTTPStatus.UNAUTHORIZED, "The bearer user token is not valid")
+            token = self.manager.get_token_for_scope(user_token, agent_identity, scope, user_key=user_key)
+        
+        if token is None:
+            return _problem(HTTPStatus.BAD_GATEWAY, f"Token acquisition failed for '{api.name}'")
+        return HTTPStatus.OK.value, {"authorizationHeader": f"Bearer {token.access_token}"}
+    
+    def _user_key(self, user_token: str) -> Optional[str]:
+        """Cache key of the caller's user, or None if the token is rejected."""
+        if self.user_token_validator is None:
+            return hash_user_token(user_token)
+        claims = self.user_token_validator.validate(user_token)
+        if claims is None:
+            return None
+        return f"{claims.get('oid') or claims['sub']}.{claims['tid']}"
+
+
+class _TokenRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler for TokenVendingServer."""
+    
+    server: TokenVendingServer
+    
+    # Keep connections alive for clients with pooled connections; headers
+    # and body are separate writes, so disable Nagle to avoid delayed-ACK stalls
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        path = url.path.lower()
+        
+        if path.rstrip("/") == "/healthz":
+            self._send(HTTPStatus.OK.value, b"Healthy", "text/plain")
+        elif path.startswith(AUTHORIZATION_HEADER_PATH):
+            api_name = unquote(url.path[len(AUTHORIZATION_HEADER_PATH):]).strip("/")
+            status, body = self.server.authorization_header(
+                api_name,
+                parse_qs(url.query),
+                self.headers.get("Authorization"),
+            )
+            self._send(status, json.dumps(body).encode(), "application/json")
+        else:
+            status, body = _problem(HTTPStatus.NOT_FOUND, f"No route for {url.path}")
+            self._send(status, json.dumps(body).encode(), "application/json")
+    
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        """Write a complete response."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            console.print(f"[dim]{self.address_string()} - {format % args}[/dim]")
@@ -0,0 +1,615 @@
+"""Persistent OBO token caches: per-process encrypted file and shared SQLite."""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import ContextManager, Iterator, Optional, Protocol, runtime_checkable
+
+from rich.console import Console
+
+from .models import TokenResult
+from .msal_cache import atomic_write, file_lock
+from .token_cache import KeyedLocks
+from .transport import max_token_request_seconds
+
+
+console = Console()
+
+# Encrypted OBO token cache (next to the MSAL cache ~/.ai-agent-cli-tokens.json)
+OBO_TOKEN_STORE_PATH = Path.home() / ".ai-agent-cli-obo-tokens.bin"
+
+# Symmetric key for the OBO token cache (generated on first use, mode 0600)
+OBO_TOKEN_STORE_KEY_PATH = Path.home() / ".ai-agent-cli-obo-tokens.key"
+
+# Environment variable that supplies the key instead of the key file
+OBO_TOKEN_STORE_KEY_ENV = "TOKEN_PERSISTENT_CACHE_KEY"
+
+# Lease after which a lock held by a crashed replica can be taken over; live
+# holders renew it every third of the lease for as long as they fetch
+DEFAULT_LOCK_LEASE_SECONDS = 30.0
+
+# Longest a replica waits for another replica's lock before fetching itself
+MAX_LOCK_TIMEOUT_SECONDS = 2 * DEFAULT_LOCK_LEASE_SECONDS
+
+# How long an SQLite statement waits for the database file lock
+SQLITE_BUSY_TIMEOUT_SECONDS = 10.0
+
+
+def default_lock_timeout() -> float:
+    """Get how long a replica waits for another replica's acquisition of a key.
+    
+    The holder may fetch T1 and then T2 under one lock, each a token request
+    with retries, so wait for two worst-case requests (see
+    max_token_request_seconds), but at most MAX_LOCK_TIMEOUT_SECONDS: a
+    crashed holder is handled by the lease, and after that a waiter fetches
+    the token itself rather than block the caller for minutes.
+    """
+    return min(2 * max_token_request_seconds(), MAX_LOCK_TIMEOUT_SECONDS)
+
+
+@runtime_checkable
+class TokenStore(Protocol):
+    """Backend for persisted T1/T2 tokens, keyed by (user, agent identity, scope).
+    
+    ``lock`` serializes acquisitions of one key across every process that
+    shares the backend, so only one replica calls Entra for it while the
+    others wait and then read the stored result. A Redis-like store maps
+    onto this directly: GET / SET with a PX expiry for tokens, and
+    ``SET lock:<key> <owner> NX PX <lease>`` plus a compare-and-delete for
+    the lock.
+    """
+    
+    def get(self, user: str, agent_identity: str, scope: str) -> Optional[TokenResult]:
+        """Get a stored token if it has not expired."""
+        ...
+    
+    def put(self, user: str, agent_identity: str, scope: str, token: TokenResult) -> None:
+        """Store a token."""
+        ...
+    
+    def lock(self, user: str, agent_identity: str, scope: str) -> ContextManager[bool]:
+        """Hold the acquisition lock for a key.
+        
+        Yields:
+            True if the lock was acquired, False if it timed out (callers
+            then proceed without it rather than fail)
+        """
+        ...
+    
+    def clear(self) -> None:
+        """Delete all stored tokens."""
+        ...
+    
+    def close(self) -> None:
+        """Release connections and background resources."""
+        ...
+
+
+def load_fernet(key_path: Optional[Path]):
+    """Get a Fernet cipher for the token caches.
+    
+    The key comes from ``TOKEN_PERSISTENT_CACHE_KEY`` if set, otherwise from
+    ``key_path`` (created with owner-only permissions on first use). The
+    key file is created exclusively, so processes starting at the same time
+    all end up with the first one's key.
+    
+    Args:
+        key_path: Key file used when no key is set in the environment (None
+            to require the environment key)
+        
+    Returns:
+        Fernet instance, or None if 'cryptography' or the key is unavailable
+    """
+    try:
+        from cryptography.fernet import Fernet
+    except ImportError:
+        console.print("[dim]Persistent token cache requires 'cryptography', skipping[/dim]")
+        return None
+    
+    key = os.getenv(OBO_TOKEN_STORE_KEY_ENV)
+    try:
+        if not key:
+            if key_path is None:
+                raise ValueError(f"{OBO_TOKEN_STORE_KEY_ENV} is not set")
+            try:
+                key = key_path.read_text().strip()
+            except FileNotFoundError:
+                key = _create_key_file(key_path, Fernet.generate_key())
+        return Fernet(key.encode() if isinstance(key, str) else key)
+    except (OSError, ValueError) as e:
+        console.print(f"[dim]Warning: Could not load token cache key: {e}[/dim]")
+        return None
+
+
+def _create_key_file(path: Path, key: bytes) -> str:
+    """Create a key file unless another process got there first.
+    
+    The key is written to a private temporary file and hard-linked into
+    place, which fails if the file exists; the loser reads the winner's
+    key, which is complete because the link is only made after the write.
+    
+    Returns:
+        The key in the file
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            return path.read_text().strip()
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return key.decode()
+
+
+def _entry(token: TokenResult) -> dict:
+    """Serialize a token for storage."""
+    return {
+        "access_token": token.access_token,
+        "token_type": token.token_type,
+        "expires_in": token.expires_in,
+        "acquired_at": token.acquired_at,
+    }
+
+
+def _to_token(entry: dict) -> TokenResult:
+    """Rebuild a TokenResult from a stored entry."""
+    return TokenResult(
+        access_token=entry["access_token"],
+        token_type=entry.get("token_type", "Bearer"),
+        expires_in=entry.get("expires_in", 0),
+        acquired_at=entry.get("acquired_at", 0),
+    )
+
+
+class EncryptedTokenStore:
+    """Persistent T1/T2 token cache encrypted with Fernet (AES-128-CBC + HMAC).
+    
+    Entries are keyed by (user, agent identity, scope) and looked up before
+    any network exchange, so a restarted CLI or pod reuses tokens that are
+    still valid instead of repeating the T1 + T2 round trips. Expired
+    entries are dropped whenever the file is rewritten.
+    
+    Several CLI processes can share the file: each put re-reads it under an
+    exclusive file lock, merges the new entry and writes it back atomically
+    (like PersistentMsalCache), and lookups reload it when another process
+    has changed it.
+    
+    The key comes from ``TOKEN_PERSISTENT_CACHE_KEY`` if set, otherwise from
+    a key file created with owner-only permissions. Requires the
+    'cryptography' package (installed with msal).
+    """
+    
+    def __init__(
+        self,
+        path: Path = OBO_TOKEN_STORE_PATH,
+        key_path: Path = OBO_TOKEN_STORE_KEY_PATH,
+    ):
+        """Initialize the store.
+        
+        Args:
+            path: Encrypted cache file
+            key_path: Key file used when no key is set in the environment
+        """
+        self.path = path
+        self.key_path = key_path
+        self.lock_path = path.with_name(f"{path.name}.lock")
+        self._fernet = None
+        self._entries: dict[str, dict] = {}
+        self._signature: Optional[tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self._key_locks = KeyedLocks()
+    
+    @staticmethod
+    def _entry_key(user: str, agent_identity: str, scope: str) -> str:
+        """Flatten a (user, agent identity, scope) key for JSON storage."""
+        return "|".join((user, agent_identity, scope))
+    
+    def _get_fernet(self):
+        """Get (or lazily create) the Fernet cipher, or None if unavailable."""
+        if self._fernet is None:
+            self._fernet = load_fernet(self.key_path)
+        return self._fernet
+    
+    def _file_signature(self) -> Optional[tuple[int, int]]:
+        """Get (mtime_ns, size) of the cache file, or None if it does not exist."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _load(self) -> dict[str, dict]:
+        """Decrypt the cache file if it changed since it was last read or written.
+        
+        Caller holds ``_lock``.
+        """
+        signature = self._file_signature()
+        if signature == self._signature:
+            return self._entries
+        
+        self._entries = {}
+        self._signature = signature
+        fernet = self._get_fernet()
+        if fernet is None or signature is None:
+            return self._entries
+        
+        try:
+            from cryptography.fernet import InvalidToken
+            
+            data = fernet.decrypt(self.path.read_bytes())
+            self._entries = json.loads(data)
+        except (OSError, ValueError, InvalidToken) as e:
+            console.print(f"[dim]Warning: Could not load persistent token cache: {e}[/dim]")
+        return self._entries
+    
+    def _save(self) -> None:
+        """Encrypt and write the cache, dropping expired entries.
+        
+        Caller holds ``_lock`` and the file lock.
+        """
+        fernet = self._get_fernet()
+        if fernet is None:
+            return
+        
+        self._entries = {
+            key: entry for key, entry in self._entries.items()
+            if not _to_token(entry).is_expired()
+        }
+        try:
+            atomic_write(self.path, fernet.encrypt(json.dumps(self._entries).encode()).decode())
+        except OSError as e:
+            console.print(f"[dim]Warning: Could not save persistent token cache: {e}[/dim]")
+        self._signature = self._file_signature()
+    
+    def get(self, user: str, agent_identity: str, scope: str) -> Optional[TokenResult]:
+        """Get a persisted token if it has not expired.
+        
+        Args:
+            user: User cache key (see user_cache_key), or "" for app-only tokens
+            agent_identity: Agent identity application ID
+            scope: Token scope (or "t1" for the Blueprint impersonation token)
+            
+        Returns:
+            TokenResult if persisted and still valid, None otherwise
+        """
+        with self._lock:
+            entry = self._load().get(self._entry_key(user, agent_identity, scope))
+        if entry is None:
+            return None
+        token = _to_token(entry)
+        return None if token.is_expired() else token
+    
+    def put(self, user: str, agent_identity: str, scope: str, token: TokenResult) -> None:
+        """Persist a token, merging it into the latest file contents.
+        
+        Args:
+            user: User cache key, or "" for app-only tokens
+            agent_identity: Agent identity application ID
+            scope: Token scope (or "t1" for the Blueprint impersonation token)
+            token: Token to persist
+        """
+        with self._lock:
+            try:
+                with file_lock(self.lock_path):
+                    self._load()[self._entry_key(user, agent_identity, scope)] = _entry(token)
+                    self._save()
+            except OSError as e:
+                console.print(f"[dim]Warning: Could not lock persistent token cache: {e}[/dim]")
+    
+    @contextmanager
+    def lock(self, user: str, agent_identity: str, scope: str) -> Iterator[bool]:
+        """Hold the acquisition lock for a key (this process only).
+        
+        Other CLI processes sharing the file are not serialized: two of them
+        may fetch the same key at once, which costs an extra exchange but
+        loses nothing, since puts are merged under the file lock.
+        """
+        with self._key_locks(self._entry_key(user, agent_identity, scope)):
+            yield True
+    
+    def clear(self) -> None:
+        """Delete all persisted tokens."""
+        with self._lock:
+            self._entries = {}
+            try:
+                with file_lock(self.lock_path):
+                    self.path.unlink(missing_ok=True)
+            except OSError as e:
+                console.print(f"[red]Failed to delete persistent token cache: {e}[/red]")
+            self._signature = None
+    
+    def close(self) -> None:
+        """Nothing to release; every put is written through to the file."""
+
+
+class SQLiteTokenStore:
+    """Token store shared by replicas through an SQLite file on a shared volume.
+    
+    Tokens are Fernet-encrypted and every replica must use the same key:
+    ``TOKEN_PERSISTENT_CACHE_KEY``, or an explicit ``key_path`` that is not
+    on the shared volume (a key stored next to the database would give
+    anyone who can read the volume both the ciphertext and the key).
+    
+    Per-key locks are leased rows in a ``locks`` table: a replica inserts
+    the row (or takes over one whose lease has expired), acquires the token
+    and deletes the row. While it holds locks, a background thread renews
+    their leases, so a slow acquisition is never taken over but a crashed
+    replica's lock expires after one lease. Other replicas poll until the
+    row is gone and then read the stored token instead of calling Entra
+    themselves. The volume must support POSIX advisory locks (SQLite's own
+    locking).
+    
+    Connections are pooled and shared by threads one at a time; call
+    close() to release them.
+    """
+    
+    def __init__(
+        self,
+        path: Path,
+        key_path: Optional[Path] = None,
+        lock_timeout: Optional[float] = None,
+        lock_lease: float = DEFAULT_LOCK_LEASE_SECONDS,
+    ):
+        """Initialize the store and create its schema.
+        
+        Args:
+            path: SQLite database file (created if missing)
+            key_path: Key file used when TOKEN_PERSISTENT_CACHE_KEY is not set;
+                keep it off the shared volume
+            lock_timeout: Seconds to wait for another replica's lock
+                (defaults to default_lock_timeout())
+            lock_lease: Seconds after which an unrenewed lock is taken over
+            
+        Raises:
+            ValueError: If neither TOKEN_PERSISTENT_CACHE_KEY nor key_path is set
+        """
+        if not key_path and not os.getenv(OBO_TOKEN_STORE_KEY_ENV):
+            raise ValueError(f"The shared token cache requires {OBO_TOKEN_STORE_KEY_ENV} or a key path")
+        self.path = Path(path)
+        self.key_path = Path(key_path) if key_path else None
+        self.lock_timeout = lock_timeout
+        self.lock_lease = lock_lease
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._fernet = None
+        self._key_locks = KeyedLocks()
+        self._pool: list[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._closed = False
+        self._held = 0
+        self._held_changed = threading.Condition(self._pool_lock)
+        self._renewer: Optional[threading.Thread] = None
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS tokens "
+                    "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS locks "
+                    "(key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+        except sqlite3.Error as e:
+            console.print(f"[dim]Warning: Could not initialize shared token cache: {e}[/dim]")
+    
+    @staticmethod
+    def _key(user: str, agent_identity: str, scope: str) -> str:
+        """Flatten a (user, agent identity, scope) key."""
+        return "|".join((user, agent_identity, scope))
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection, opening one if none is idle."""
+        with self._pool_lock:
+            conn = self._pool.pop() if self._pool else None
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=SQLITE_BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+        try:
+            yield conn
+        finally:
+            with self._pool_lock:
+                if self._closed:
+                    conn.close()
+                else:
+                    self._pool.append(conn)
+    
+    def _get_fernet(self):
+        """Get (or lazily create) the Fernet cipher, or None if unavailable."""
+        if self._fernet is None:
+            self._fernet = load_fernet(self.key_path)
+        return self._fernet
+    
+    def get(self, user: str, agent_identity: str, scope: str) -> Optional[TokenResult]:
+        """Get a stored token if it has not expired.
+        
+        Args:
+            user: User cache key (see user_cache_key), or "" for app-only tokens
+            agent_identity: Agent identity application ID
+            scope: Token scope (or "t1" for the Blueprint impersonation token)
+            
+        Returns:
+            TokenResult if stored and still valid, None otherwise
+        """
+        fernet = self._get_fernet()
+        if fernet is None:
+            return None
+        try:
+            from cryptography.fernet import InvalidToken
+            
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT value FROM tokens WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (self._key(user, agent_identity, scope), time.time()),
+                ).fetchone()
+            if row is None:
+                return None
+            token = _to_token(json.loads(fernet.decrypt(row[0])))
+        except (sqlite3.Error, ValueError, KeyError, InvalidToken) as e:
+            console.print(f"[dim]Warning: Could not read shared token cache: {e}[/dim]")
+            return None
+        return None if token.is_expired() else token
+    
+    def put(self, user: str, agent_identity: str, scope: str, token: TokenResult) -> None:
+        """Store a token, dropping expired ones.
+        
+        Args:
+            user: User cache key, or "" for app-only tokens
+            agent_identity: Agent identity application ID
+            scope: Token scope (or "t1" for the Blueprint impersonation token)
+            token: Token to store
+        """
+        fernet = self._get_fernet()
+        if fernet is None:
+            return
+        value = fernet.encrypt(json.dumps(_entry(token)).encode())
+        now = time.time()
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO tokens (key, value, expires_at) VALUES (?, ?, ?)",
+                    (self._key(user, agent_identity, scope), value, token.expires_at),
+                )
+                conn.execute("DELETE FROM tokens WHERE expires_at <= ?", (now,))
+        except sqlite3.Error as e:
+            console.print(f"[dim]Warning: Could not write shared token cache: {e}[/dim]")
+    
+    def _try_acquire(self, key: str) -> bool:
+        """Take the lock row for a key if it is free or its lease expired."""
+        now = time.time()
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO locks (key, owner, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                    "WHERE locks.expires_at <= ?",
+                    (key, self._owner, now + self.lock_lease, now),
+                )
+        except sqlite3.OperationalError:
+            # Database busy; retry on the next poll
+            return False
+        return cursor.rowcount == 1
+    
+    def _release(self, key: str) -> None:
+        """Delete the lock row for a key if this store still owns it."""
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM locks WHERE key = ? AND owner = ?", (key, self._owner))
+        except sqlite3.Error as e:
+            console.print(f"[dim]Warning: Could not release shared token cache lock: {e}[/dim]")
+    
+    def _renew_leases(self) -> None:
+        """Extend the leases of this store's locks while any are held."""
+        interval = self.lock_lease / 3
+        with self._pool_lock:
+            while self._held and not self._closed:
+                self._held_changed.wait(interval)
+                if not self._held or self._closed:
+                    break
+                self._pool_lock.release()
+                try:
+                    with self._connection() as conn:
+                        conn.execute(
+                            "UPDATE locks SET expires_at = ? WHERE owner = ?",
+                            (time.time() + self.lock_lease, self._owner),
+                        )
+                except sqlite3.Error as e:
+                    console.print(f"[dim]Warning: Could not renew shared token cache locks: {e}[/dim]")
+                finally:
+                    self._pool_lock.acquire()
+            self._renewer = None
+    
+    def _hold(self, delta: int) -> None:
+        """Track held locks, starting the lease renewer for the first one."""
+        with self._pool_lock:
+            self._held += delta
+            if self._held and self._renewer is None and not self._closed:
+                self._renewer = threading.Thread(target=self._renew_leases, name="token-lock-renewer", daemon=True)
+                self._renewer.start()
+            self._held_changed.notify_all()
+    
+    @contextmanager
+    def lock(self, user: str, agent_identity: str, scope: str) -> Iterator[bool]:
+        """Hold the acquisition lock for a key across all replicas.
+        
+        Threads of one process queue on an in-process lock first, so only
+        one of them polls the database.
+        
+        Yields:
+            True if the lock was acquired, False if ``lock_timeout`` elapsed
+        """
+        key = self._key(user, agent_identity, scope)
+        with self._key_locks(key):
+            timeout = self.lock_timeout if self.lock_timeout is not None else default_lock_timeout()
+            deadline = time.monotonic() + timeout
+            delay = 0.01
+            acquired = self._try_acquire(key)
+            while not acquired and time.monotonic() < deadline:
+                time.sleep(delay)
+                delay = min(delay * 2, 0.2)
+                acquired = self._try_acquire(key)
+            if acquired:
+                self._hold(1)
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    self._hold(-1)
+                    self._release(key)
+    
+    def clear(self) -> None:
+        """Delete all stored tokens and locks."""
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM tokens")
+                conn.execute("DELETE FROM locks")
+        except sqlite3.Error as e:
+            console.print(f"[red]Failed to clear shared token cache: {e}[/red]")
+    
+    def close(self) -> None:
+        """Stop renewing leases and close all idle connections.
+        
+        Connections in use are closed when they are returned.
+        """
+        with self._pool_lock:
+            self._closed = True
+            self._held_changed.notify_all()
+            pool, self._pool = self._pool, []
+        for conn in pool:
+            conn.close()
+
+
+def create_token_store(shared_cache_path: Optional[str] = None, persistent: bool = False) -> Optional[TokenStore]:
+    """Create the token store selected by configuration.
+    
+    Args:
+        shared_cache_path: SQLite file shared by replicas (takes precedence)
+        persistent: Use the per-process encrypted file cache
+        
+    Returns:
+        SQLiteTokenStore, EncryptedTokenStore, or None for in-memory caching only
+    """
+    if shared_cache_path:
+        try:
+            return SQLiteTokenStore(Path(shared_cache_path).expanduser())
+        except ValueError as e:
+            console.print(f"[red]{e}; using an in-memory token cache[/red]")
+            return None
+    if persistent:
+        return EncryptedTokenStore()
+    return None
@@ -0,0 +1,116 @@
+"""Validation of incoming user tokens (Tc) against the tenant's signing keys."""
+
+import threading
+import time
+from typing import Optional
+
+import httpx
+import jwt
+from rich.console import Console
+
+from .transport import get_token_http_client, get_token_transport_settings
+
+
+console = Console()
+
+# Seconds a fetched signing key set is used before it is refreshed
+JWKS_REFRESH_SECONDS = 24 * 3600
+
+# Minimum seconds between refetches triggered by an unknown key ID
+JWKS_MIN_REFETCH_SECONDS = 60
+
+# Clock skew tolerated for exp/nbf/iat
+CLOCK_SKEW_SECONDS = 60
+
+
+class UserTokenValidator:
+    """Validates user tokens before they are trusted as cache keys.
+    
+    Checks the RS256 signature against the tenant's JWKS
+    (``{authority}/{tenant}/discovery/v2.0/keys``, fetched over the pooled
+    token endpoint client and cached), the audience (the Blueprint),
+    expiry, the tenant and the issuer. A token that fails any check must
+    not be used to look up cached OBO tokens.
+    """
+    
+    def __init__(self, tenant_id: str, blueprint_app_id: str):
+        """Initialize the validator.
+        
+        Args:
+            tenant_id: Azure AD tenant ID the tokens must be issued by
+            blueprint_app_id: Blueprint application ID (the tokens' audience)
+        """
+        self.tenant_id = tenant_id
+        self.audiences = [blueprint_app_id, f"api://{blueprint_app_id}"]
+        self._jwks: Optional[jwt.PyJWKSet] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+    
+    @property
+    def jwks_url(self) -> str:
+        """Signing key endpoint of the tenant."""
+        authority = get_token_transport_settings().authority_host.rstrip("/")
+        return f"{authority}/{self.tenant_id}/discovery/v2.0/keys"
+    
+    @property
+    def issuers(self) -> list[str]:
+        """Accepted issuers (v1 and v2 access tokens)."""
+        authority = get_token_transport_settings().authority_host.rstrip("/")
+        return [f"https://sts.windows.net/{self.tenant_id}/", f"{authority}/{self.tenant_id}/v2.0"]
+    
+    def _get_jwks(self, refresh: bool = False) -> Optional[jwt.PyJWKSet]:
+        """Get the cached key set, fetching it when stale or on request."""
+        with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if self._jwks is not None and age < JWKS_REFRESH_SECONDS:
+                if not refresh or age < JWKS_MIN_REFETCH_SECONDS:
+                    return self._jwks
+            try:
+                response = get_token_http_client().get(self.jwks_url)
+                response.raise_for_status()
+                self._jwks = jwt.PyJWKSet.from_dict(response.json())
+            except (httpx.HTTPError, ValueError, jwt.PyJWKSetError) as e:
+                console.print(f"[red]Failed to fetch signing keys: {e}[/red]")
+                return self._jwks
+            self._fetched_at = time.monotonic()
+            return self._jwks
+    
+    def _signing_key(self, kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        """Find the signing key for a key ID, refetching once for unknown IDs."""
+        for refresh in (False, True):
+            jwks = self._get_jwks(refresh=refresh)
+            if jwks is None:
+                return None
+            for key in jwks.keys:
+                if key.key_id == kid:
+                    return key
+        return None
+    
+    def validate(self, token: str) -> Optional[dict]:
+        """Validate a user token.
+        
+        Args:
+            token: User access token (Tc)
+            
+        Returns:
+            The verified claims, or None if the token is not valid
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+            key = self._signing_key(header.get("kid"))
+            if key is None:
+                return None
+            claims = jwt.decode(
+                token,
+                key=key.key,
+                algorithms=["RS256"],
+                audience=self.audiences,
+                issuer=self.issuers,
+                leeway=CLOCK_SKEW_SECONDS,
+                options={"require": ["exp", "aud", "iss", "tid"]},
+            )
+        except jwt.PyJWTError:
+            return None
+        if claims.get("tid") != self.tenant_id or not (claims.get("oid") or claims.get("sub")):
+            return None
+        return claims
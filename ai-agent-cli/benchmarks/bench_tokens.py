@@ -0,0 +1,309 @@
+"""Token-exchange benchmarks against the local mock Entra endpoint.
+
+Measures cold (T1 + T2 exchange) and warm (cached) latency of
+OBOTokenManager, DirectTokenProvider and SidecarTokenProvider (through the
+local TokenVendingServer), plus throughput and cache hit rate of
+MultiUserOBOTokenManager under concurrent multi-user load.
+
+Run from the ai-agent-cli directory::
+
+    python -m benchmarks.bench_tokens
+    python -m benchmarks.bench_tokens --latency 0.05 --throttle-rate 0.05
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from agent_cli import auth, token_providers, token_server, transport
+from agent_cli.auth import AZURE_COGNITIVE_SERVICES_SCOPE, MultiUserOBOTokenManager, OBOTokenManager
+from agent_cli.token_providers import DirectTokenProvider, SidecarTokenProvider
+from agent_cli.token_server import DownstreamApi, TokenVendingServer
+from agent_cli.token_validation import UserTokenValidator
+from agent_cli.transport import close_token_http_client, configure_token_transport
+
+from .mock_entra import FaultInjection, MockEntraServer
+
+
+console = Console()
+
+TENANT_ID = "00000000-0000-0000-0000-00000000beef"
+BLUEPRINT_APP_ID = "11111111-1111-1111-1111-111111111111"
+BLUEPRINT_SECRET = "mock-secret"
+AGENT_IDENTITY_APP_ID = "22222222-2222-2222-2222-222222222222"
+MCP_SERVER_APP_ID = "33333333-3333-3333-3333-333333333333"
+
+
+@dataclass
+class BenchResult:
+    """Latency samples and endpoint usage for one scenario."""
+    
+    name: str
+    cold: list[float] = field(default_factory=list)
+    warm: list[float] = field(default_factory=list)
+    calls: int = 0
+    errors: int = 0
+    endpoint_requests: int = 0
+    elapsed: float = 0.0
+    
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of calls served without an OBO/app token request."""
+        if not self.calls:
+            return 0.0
+        return max(self.calls - self.endpoint_requests, 0) / self.calls
+
+
+def percentile(samples: list[float], pct: float) -> Optional[float]:
+    """Get a nearest-rank percentile of the samples (None if empty)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _ms(value: Optional[float]) -> str:
+    """Format seconds as milliseconds."""
+    return "-" if value is None else f"{value * 1000:.3f}"
+
+
+def _timed(fn: Callable[[], Optional[object]], result: BenchResult, samples: list[float]) -> None:
+    """Time one call, recording the sample or an error."""
+    start = time.perf_counter()
+    value = fn()
+    samples.append(time.perf_counter() - start)
+    result.calls += 1
+    if value is None:
+        result.errors += 1
+
+
+def _token_requests(mock: MockEntraServer) -> int:
+    """Number of T2 (OBO or app token) requests served by the mock."""
+    return mock.stats["obo"] + mock.stats["app"]
+
+
+def bench_obo_manager(mock: MockEntraServer, rounds: int, warm_calls: int) -> BenchResult:
+    """Benchmark OBOTokenManager.get_azure_openai_token."""
+    result = BenchResult("OBOTokenManager")
+    mock.reset_stats()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        manager = OBOTokenManager(
+            tenant_id=TENANT_ID,
+            blueprint_app_id=BLUEPRINT_APP_ID,
+            blueprint_client_secret=BLUEPRINT_SECRET,
+            agent_identity_app_id=AGENT_IDENTITY_APP_ID,
+            user_token=mock.issue_user_token(BLUEPRINT_APP_ID, tenant_id=TENANT_ID),
+            background_refresh=False,
+        )
+        _timed(manager.get_azure_openai_token, result, result.cold)
+        for _ in range(warm_calls):
+            _timed(manager.get_azure_openai_token, result, result.warm)
+        manager.close()
+    result.elapsed = time.perf_counter() - start
+    result.endpoint_requests = _token_requests(mock)
+    return result
+
+
+def bench_direct_provider(mock: MockEntraServer, rounds: int, warm_calls: int) -> BenchResult:
+    """Benchmark DirectTokenProvider.get_openai_token / get_mcp_token."""
+    result = BenchResult("DirectTokenProvider")
+    mock.reset_stats()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        provider = DirectTokenProvider(
+            tenant_id=TENANT_ID,
+            blueprint_app_id=BLUEPRINT_APP_ID,
+            blueprint_client_secret=BLUEPRINT_SECRET,
+            agent_identity_app_id=AGENT_IDENTITY_APP_ID,
+            mcp_server_app_id=MCP_SERVER_APP_ID,
+            background_refresh=False,
+        )
+        provider.initialize(mock.issue_user_token(BLUEPRINT_APP_ID, tenant_id=TENANT_ID))
+        _timed(provider.get_openai_token, result, result.cold)
+        _timed(provider.get_mcp_token, result, result.cold)
+        for i in range(warm_calls):
+            _timed(provider.get_mcp_token if i % 2 else provider.get_openai_token, result, result.warm)
+        provider.close()
+    result.elapsed = time.perf_counter() - start
+    result.endpoint_requests = _token_requests(mock)
+    return result
+
+
+def bench_sidecar_provider(mock: MockEntraServer, rounds: int, warm_calls: int) -> BenchResult:
+    """Benchmark SidecarTokenProvider against a local TokenVendingServer."""
+    result = BenchResult("SidecarTokenProvider")
+    manager = MultiUserOBOTokenManager(
+        tenant_id=TENANT_ID,
+        blueprint_app_id=BLUEPRINT_APP_ID,
+        blueprint_client_secret=BLUEPRINT_SECRET,
+    )
+    server = TokenVendingServer(
+        ("127.0.0.1", 0),
+        manager,
+        [
+            DownstreamApi("openai", (AZURE_COGNITIVE_SERVICES_SCOPE,)),
+            DownstreamApi("mcp", (f"api://{MCP_SERVER_APP_ID}/.default",)),
+        ],
+        default_agent_identity=AGENT_IDENTITY_APP_ID,
+        user_token_validator=UserTokenValidator(TENANT_ID, BLUEPRINT_APP_ID),
+    )
+    host, port = server.server_address[:2]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    mock.reset_stats()
+    start = time.perf_counter()
+    try:
+        for _ in range(rounds):
+            provider = SidecarTokenProvider(
+                sidecar_url=f"http://{host}:{port}",
+                agent_identity_app_id=AGENT_IDENTITY_APP_ID,
+                background_refresh=False,
+            )
+            provider.initialize(mock.issue_user_token(BLUEPRINT_APP_ID, tenant_id=TENANT_ID))
+            _timed(provider.get_openai_token, result, result.cold)
+            for _ in range(warm_calls):
+                _timed(provider.get_openai_token, result, result.warm)
+            provider.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    result.elapsed = time.perf_counter() - start
+    result.endpoint_requests = _token_requests(mock)
+    return result
+
+
+def bench_concurrent(
+    mock: MockEntraServer,
+    users: int,
+    requests: int,
+    concurrency: int,
+    max_entries: int,
+) -> BenchResult:
+    """Benchmark MultiUserOBOTokenManager with many users and worker threads."""
+    result = BenchResult(f"MultiUser x{users} users")
+    manager = MultiUserOBOTokenManager(
+        tenant_id=TENANT_ID,
+        blueprint_app_id=BLUEPRINT_APP_ID,
+        blueprint_client_secret=BLUEPRINT_SECRET,
+        max_entries=max_entries,
+    )
+    user_tokens = [mock.issue_user_token(BLUEPRINT_APP_ID, tenant_id=TENANT_ID) for _ in range(users)]
+    scopes = [AZURE_COGNITIVE_SERVICES_SCOPE, f"api://{MCP_SERVER_APP_ID}/.default"]
+    
+    def one_request(_: int) -> tuple[float, bool]:
+        user_token = random.choice(user_tokens)
+        scope = random.choice(scopes)
+        start = time.perf_counter()
+        token = manager.get_token_for_scope(user_token, AGENT_IDENTITY_APP_ID, scope)
+        return time.perf_counter() - start, token is not None
+    
+    mock.reset_stats()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency, ok in pool.map(one_request, range(requests)):
+            result.warm.append(latency)
+            result.calls += 1
+            result.errors += 0 if ok else 1
+    result.elapsed = time.perf_counter() - start
+    result.endpoint_requests = _token_requests(mock)
+    return result
+
+
+def render(results: list[BenchResult], mock: MockEntraServer) -> None:
+    """Print benchmark results as a table."""
+    table = Table(title="Token exchange benchmarks (ms)")
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Cold p50", justify="right")
+    table.add_column("Cold p95", justify="right")
+    table.add_column("Warm p50", justify="right")
+    table.add_column("Warm p95", justify="right")
+    table.add_column("Warm p99", justify="right")
+    table.add_column("Calls/s", justify="right")
+    table.add_column("Hit rate", justify="right")
+    table.add_column("Errors", justify="right")
+    for result in results:
+        throughput = result.calls / result.elapsed if result.elapsed else 0.0
+        table.add_row(
+            result.name,
+            str(result.calls),
+            _ms(percentile(result.cold, 50)),
+            _ms(percentile(result.cold, 95)),
+            _ms(percentile(result.warm, 50)),
+            _ms(percentile(result.warm, 95)),
+            _ms(percentile(result.warm, 99)),
+            f"{throughput:,.0f}",
+            f"{result.hit_rate:.1%}",
+            str(result.errors),
+        )
+    console.print(table)
+    faults = mock.faults
+    console.print(
+        f"[dim]Mock endpoint: latency={faults.latency * 1000:g}ms jitter={faults.jitter * 1000:g}ms "
+        f"throttle={faults.throttle_rate:.0%} failures={faults.failure_rate:.0%}[/dim]"
+    )
+
+
+def main(
+    rounds: int = typer.Option(20, "--rounds", help="Cold starts per single-user scenario"),
+    warm_calls: int = typer.Option(200, "--warm-calls", help="Cached calls after each cold start"),
+    users: int = typer.Option(200, "--users", help="Distinct users in the concurrent scenario"),
+    requests: int = typer.Option(5000, "--requests", help="Total calls in the concurrent scenario"),
+    concurrency: int = typer.Option(16, "--concurrency", "-c", help="Worker threads in the concurrent scenario"),
+    max_entries: int = typer.Option(10000, "--max-entries", help="T2 cache bound in the concurrent scenario"),
+    latency: float = typer.Option(0.0, "--latency", help="Mock endpoint latency per request (seconds)"),
+    jitter: float = typer.Option(0.0, "--jitter", help="Random extra mock latency (seconds)"),
+    throttle_rate: float = typer.Option(0.0, "--throttle-rate", help="Fraction of mock requests answered with 429"),
+    retry_after: float = typer.Option(0.1, "--retry-after", help="Retry-After sent with 429 responses (seconds)"),
+    failure_rate: float = typer.Option(0.0, "--failure-rate", help="Fraction of mock requests answered with 503"),
+    token_lifetime: int = typer.Option(3600, "--token-lifetime", help="Lifetime of mock tokens (seconds)"),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Random seed for reproducible runs"),
+) -> None:
+    """Run the token-exchange benchmarks."""
+    if seed is not None:
+        random.seed(seed)
+    mock = MockEntraServer(
+        token_lifetime=token_lifetime,
+        faults=FaultInjection(
+            latency=latency,
+            jitter=jitter,
+            throttle_rate=throttle_rate,
+            retry_after=retry_after,
+            failure_rate=failure_rate,
+        ),
+        client_secret=BLUEPRINT_SECRET,
+    ).start()
+    configure_token_transport(authority_host=mock.authority_host, backoff_base=0.05)
+    
+    # Per-exchange progress and retry output would dominate the timings
+    for module in (auth, token_providers, token_server, transport):
+        module.console.quiet = True
+    
+    try:
+        results = [
+            bench_obo_manager(mock, rounds, warm_calls),
+            bench_direct_provider(mock, rounds, warm_calls),
+            bench_sidecar_provider(mock, rounds, warm_calls),
+            bench_concurrent(mock, users, requests, concurrency, max_entries),
+        ]
+    finally:
+        for module in (auth, token_providers, token_server, transport):
+            module.console.quiet = False
+        close_token_http_client()
+        mock.stop()
+    
+    render(results, mock)
+    console.print(f"[dim]Concurrent scenario: {concurrency} threads, endpoint requests {dict(mock.stats)}[/dim]")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,406 @@
+"""Local stand-in for the Microsoft Entra v2.0 token endpoint.
+
+Understands the grant shapes used by agent_cli.auth:
+
+- client_credentials + fmi_path (Blueprint -> T1)
+- client_credentials + T1 client_assertion (agent identity app token)
+- jwt-bearer + requested_token_use=on_behalf_of (Tc + T1 -> OBO T2)
+
+Tokens are RS256-signed JWTs with realistic ``iat``/``nbf``/``exp``
+claims. Latency, throttling (429 + Retry-After) and server errors can be
+injected to exercise retries, caching and the circuit breaker.
+
+Run standalone with ``python -m benchmarks.mock_entra --port 8400`` and
+set ``AZURE_AUTHORITY_HOST=http://127.0.0.1:8400``.
+"""
+
+import base64
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs
+
+import typer
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from rich.console import Console
+
+
+console = Console()
+
+JWT_BEARER_GRANT = "urn:ietf:params:oauth:grant-type:jwt-bearer"
+JWT_BEARER_ASSERTION_TYPE = "urn:ietf:params:oauth:client-assertion-type:jwt-bearer"
+TOKEN_EXCHANGE_AUDIENCE = "api://AzureADTokenExchange"
+
+
+def _b64url(data: bytes) -> str:
+    """Base64url-encode without padding."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64url_decode(data: str) -> bytes:
+    """Decode base64url with or without padding."""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+@dataclass
+class FaultInjection:
+    """Faults applied to token requests.
+    
+    Attributes:
+        latency: Fixed delay in seconds added to every request
+        jitter: Extra random delay of up to this many seconds
+        throttle_rate: Fraction of requests answered with 429
+        retry_after: Retry-After seconds sent with 429 responses
+        failure_rate: Fraction of requests answered with 503
+    """
+    
+    latency: float = 0.0
+    jitter: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    failure_rate: float = 0.0
+
+
+class MockEntraServer(ThreadingHTTPServer):
+    """Mock ``/{tenant}/oauth2/v2.0/token`` endpoint issuing signed JWTs."""
+    
+    daemon_threads = True
+    
+    # The socketserver default backlog of 5 drops SYNs when many pooled
+    # connections open at once, adding 1s retransmit stalls to the timings
+    request_queue_size = 128
+    
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 0),
+        token_lifetime: int = 3600,
+        faults: Optional[FaultInjection] = None,
+        client_secret: Optional[str] = None,
+    ):
+        """Initialize and bind the server.
+        
+        Args:
+            address: (host, port) to listen on (port 0 picks a free port)
+            token_lifetime: Lifetime in seconds of issued tokens
+            faults: Faults to inject (none by default)
+            client_secret: Accepted Blueprint secret (any non-empty secret if None)
+        """
+        self.token_lifetime = token_lifetime
+        self.faults = faults or FaultInjection()
+        self.client_secret = client_secret
+        self.kid = uuid.uuid4().hex
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._lock = threading.Lock()
+        self.stats: Counter[str] = Counter()
+        super().__init__(address, _TokenEndpointHandler)
+    
+    @property
+    def authority_host(self) -> str:
+        """Base URL to use as the authority host."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "MockEntraServer":
+        """Serve requests in a daemon thread."""
+        threading.Thread(target=self.serve_forever, name="mock-entra", daemon=True).start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        self.shutdown()
+        self.server_close()
+    
+    def count(self, name: str) -> None:
+        """Increment a request counter."""
+        with self._lock:
+            self.stats[name] += 1
+    
+    def reset_stats(self) -> None:
+        """Reset all request counters."""
+        with self._lock:
+            self.stats.clear()
+    
+    def issue_token(self, claims: dict, lifetime: Optional[int] = None) -> tuple[str, int]:
+        """Sign a JWT.
+        
+        Args:
+            claims: Claims to include (iat/nbf/exp/iss/jti are added)
+            lifetime: Token lifetime in seconds (defaults to token_lifetime)
+            
+        Returns:
+            Tuple of (token, lifetime)
+        """
+        lifetime = lifetime or self.token_lifetime
+        now = int(time.time())
+        tenant_id = claims.get("tid", "mock-tenant")
+        payload = {
+            "iss": f"https://sts.windows.net/{tenant_id}/",
+            "iat": now,
+            "nbf": now,
+            "exp": now + lifetime,
+            "uti": uuid.uuid4().hex,
+            **claims,
+        }
+        header = {"alg": "RS256", "typ": "JWT", "kid": self.kid}
+        signing_input = (
+            f"{_b64url(json.dumps(header, separators=(',', ':')).encode())}."
+            f"{_b64url(json.dumps(payload, separators=(',', ':')).encode())}"
+        )
+        signature = self._key.sign(signing_input.encode(), padding.PKCS1v15(), hashes.SHA256())
+        return f"{signing_input}.{_b64url(signature)}", lifetime
+    
+    def issue_user_token(
+        self,
+        blueprint_app_id: str,
+        oid: Optional[str] = None,
+        tenant_id: str = "mock-tenant",
+        lifetime: Optional[int] = None,
+    ) -> str:
+        """Issue a user token (Tc) with the Blueprint as audience.
+        
+        Args:
+            blueprint_app_id: Blueprint application ID
+            oid: User object ID (random if omitted)
+            tenant_id: Tenant ID claim
+            lifetime: Token lifetime in seconds
+            
+        Returns:
+            Signed user token
+        """
+        token, _ = self.issue_token(
+            {
+                "aud": f"api://{blueprint_app_id}",
+                "oid": oid or str(uuid.uuid4()),
+                "sub": uuid.uuid4().hex,
+                "tid": tenant_id,
+                "scp": "access_as_user",
+            },
+            lifetime,
+        )
+        return token
+    
+    def jwks(self) -> dict:
+        """Public signing key as a JWK set, like ``/{tenant}/discovery/v2.0/keys``."""
+        numbers = self._key.public_key().public_numbers()
+        return {"keys": [{
+            "kty": "RSA",
+            "use": "sig",
+            "alg": "RS256",
+            "kid": self.kid,
+            "n": _b64url(numbers.n.to_bytes((numbers.n.bit_length() + 7) // 8, "big")),
+            "e": _b64url(numbers.e.to_bytes((numbers.e.bit_length() + 7) // 8, "big")),
+        }]}
+    
+    def verify(self, token: str) -> Optional[dict]:
+        """Verify a token issued by this server.
+        
+        Returns:
+            The token's claims, or None if the signature is invalid or it expired
+        """
+        try:
+            header, payload, signature = token.split(".")
+            self._key.public_key().verify(
+                _b64url_decode(signature),
+                f"{header}.{payload}".encode(),
+                padding.PKCS1v15(),
+                hashes.SHA256(),
+            )
+            claims = json.loads(_b64url_decode(payload))
+        except Exception:
+            return None
+        return claims if claims.get("exp", 0) > time.time() else None
+
+
+class _TokenEndpointHandler(BaseHTTPRequestHandler):
+    """HTTP handler for MockEntraServer."""
+    
+    server: MockEntraServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def do_GET(self) -> None:
+        parts = self.path.split("?")[0].strip("/").split("/")
+        if len(parts) == 4 and parts[1:] == ["discovery", "v2.0", "keys"]:
+            self.server.count("jwks")
+            self._send(HTTPStatus.OK, self.server.jwks())
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": "not_found"})
+    
+    def do_POST(self) -> None:
+        parts = self.path.split("?")[0].strip("/").split("/")
+        length = int(self.headers.get("Content-Length") or 0)
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+        if len(parts) != 4 or parts[1:] != ["oauth2", "v2.0", "token"]:
+            self._send(HTTPStatus.NOT_FOUND, {"error": "not_found"})
+            return
+        
+        faults = self.server.faults
+        delay = faults.latency + random.uniform(0, faults.jitter)
+        if delay:
+            time.sleep(delay)
+        if random.random() < faults.throttle_rate:
+            self.server.count("throttled")
+            self._send(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                {"error": "temporarily_unavailable", "error_description": "AADSTS50196: throttled (mock)"},
+                {"Retry-After": f"{faults.retry_after:g}"},
+            )
+            return
+        if random.random() < faults.failure_rate:
+            self.server.count("failed")
+            self._send(
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                {"error": "temporarily_unavailable", "error_description": "AADSTS90033: transient error (mock)"},
+            )
+            return
+        
+        status, body = self._exchange(parts[0], form)
+        self._send(status, body)
+    
+    def _exchange(self, tenant_id: str, form: dict) -> tuple[HTTPStatus, dict]:
+        """Validate a token request and issue the matching token."""
+        grant_type = form.get("grant_type")
+        client_id = form.get("client_id")
+        if not client_id:
+            return self._error("invalid_request", "AADSTS900144: client_id is missing")
+        
+        if grant_type == "client_credentials" and "fmi_path" in form:
+            if not self._blueprint_authenticated(form):
+                return self._error("invalid_client", "AADSTS7000215: invalid client secret", HTTPStatus.UNAUTHORIZED)
+            self.server.count("t1")
+            return self._token_response({
+                "aud": TOKEN_EXCHANGE_AUDIENCE,
+                "appid": client_id,
+                "sub": form["fmi_path"],
+                "tid": tenant_id,
+                "idtyp": "app",
+            })
+        
+        if grant_type == "client_credentials":
+            t1_claims = self._verify_t1(form)
+            if t1_claims is None:
+                return self._error("invalid_client", "AADSTS700211: invalid client assertion", HTTPStatus.UNAUTHORIZED)
+            self.server.count("app")
+            return self._token_response({
+                "aud": form.get("scope", "").split("/.default")[0],
+                "appid": client_id,
+                "oid": client_id,
+                "sub": client_id,
+                "tid": tenant_id,
+                "idtyp": "app",
+            })
+        
+        if grant_type == JWT_BEARER_GRANT and form.get("requested_token_use") == "on_behalf_of":
+            if self._verify_t1(form) is None:
+                return self._error("invalid_client", "AADSTS700211: invalid client assertion", HTTPStatus.UNAUTHORIZED)
+            user_claims = self.server.verify(form.get("assertion", ""))
+            if user_claims is None:
+                return self._error("invalid_grant", "AADSTS50013: assertion is invalid or expired")
+            self.server.count("obo")
+            return self._token_response({
+                "aud": form.get("scope", "").split("/.default")[0],
+                "appid": client_id,
+                "oid": user_claims.get("oid"),
+                "sub": user_claims.get("sub"),
+                "tid": user_claims.get("tid", tenant_id),
+                "scp": "user_impersonation",
+            })
+        
+        return self._error("unsupported_grant_type", f"AADSTS70003: unsupported grant_type {grant_type}")
+    
+    def _blueprint_authenticated(self, form: dict) -> bool:
+        """Check the Blueprint's client secret or client assertion."""
+        if form.get("client_assertion_type") == JWT_BEARER_ASSERTION_TYPE:
+            # Federated / certificate assertions are accepted without verification
+            return bool(form.get("client_assertion"))
+        secret = form.get("client_secret")
+        if self.server.client_secret is None:
+            return bool(secret)
+        return secret == self.server.client_secret
+    
+    def _verify_t1(self, form: dict) -> Optional[dict]:
+        """Verify that the client assertion is a T1 for the requesting agent identity."""
+        if form.get("client_assertion_type") != JWT_BEARER_ASSERTION_TYPE:
+            return None
+        claims = self.server.verify(form.get("client_assertion", ""))
+        if claims is None or claims.get("aud") != TOKEN_EXCHANGE_AUDIENCE:
+            return None
+        if claims.get("sub") != form.get("client_id"):
+            return None
+        return claims
+    
+    def _token_response(self, claims: dict) -> tuple[HTTPStatus, dict]:
+        """Issue a token and build the token endpoint response."""
+        token, lifetime = self.server.issue_token(claims)
+        return HTTPStatus.OK, {
+            "token_type": "Bearer",
+            "expires_in": lifetime,
+            "ext_expires_in": lifetime,
+            "access_token": token,
+        }
+    
+    def _error(
+        self,
+        error: str,
+        description: str,
+        status: HTTPStatus = HTTPStatus.BAD_REQUEST,
+    ) -> tuple[HTTPStatus, dict]:
+        """Build an OAuth2 error response."""
+        self.server.count("rejected")
+        return status, {"error": error, "error_description": description}
+    
+    def _send(self, status: HTTPStatus, body: dict, headers: Optional[dict] = None) -> None:
+        """Write a JSON response."""
+        data = json.dumps(body).encode()
+        self.send_response(status.value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def main(
+    host: str = typer.Option("127.0.0.1", "--host", help="Address to listen on"),
+    port: int = typer.Option(8400, "--port", "-p", help="Port to listen on"),
+    token_lifetime: int = typer.Option(3600, "--token-lifetime", help="Lifetime of issued tokens (seconds)"),
+    latency: float = typer.Option(0.0, "--latency", help="Added latency per request (seconds)"),
+    jitter: float = typer.Option(0.0, "--jitter", help="Random extra latency up to this many seconds"),
+    throttle_rate: float = typer.Option(0.0, "--throttle-rate", help="Fraction of requests answered with 429"),
+    failure_rate: float = typer.Option(0.0, "--failure-rate", help="Fraction of requests answered with 503"),
+) -> None:
+    """Run the mock Entra token endpoint."""
+    server = MockEntraServer(
+        (host, port),
+        token_lifetime=token_lifetime,
+        faults=FaultInjection(
+            latency=latency,
+            jitter=jitter,
+            throttle_rate=throttle_rate,
+            failure_rate=failure_rate,
+        ),
+    )
+    console.print(f"[bold]Mock Entra token endpoint on {server.authority_host}[/bold]")
+    console.print(f"[dim]Set AZURE_AUTHORITY_HOST={server.authority_host}[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print(f"\n[dim]Requests: {dict(server.stats)}[/dim]")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,50 @@
+"""Tests for assembling streamed tool calls."""
+
+from typing import Optional
+
+from openai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall, ChoiceDeltaToolCallFunction
+
+from agent_cli.agent import merge_tool_call_deltas
+
+
+def _delta(index: int, arguments: str, id: Optional[str] = None, name: Optional[str] = None) -> ChoiceDeltaToolCall:
+    return ChoiceDeltaToolCall(
+        index=index,
+        id=id,
+        type="function" if id else None,
+        function=ChoiceDeltaToolCallFunction(name=name, arguments=arguments),
+    )
+
+
+def test_interleaved_fragments_are_assembled_by_index():
+    chunks = [
+        [_delta(0, "", id="call_a", name="get_weather")],
+        [_delta(0, '{"city": '), _delta(1, "", id="call_b", name="search")],
+        [_delta(1, '{"q": "rain"}')],
+        [_delta(0, '"Oslo"}')],
+    ]
+    tool_calls: dict[int, dict] = {}
+    for deltas in chunks:
+        merge_tool_call_deltas(tool_calls, deltas)
+    
+    assert [tool_calls[i] for i in sorted(tool_calls)] == [
+        {"id": "call_a", "type": "function", "function": {"name": "get_weather", "arguments": '{"city": "Oslo"}'}},
+        {"id": "call_b", "type": "function", "function": {"name": "search", "arguments": '{"q": "rain"}'}},
+    ]
+
+
+def test_later_fragments_without_id_or_name_keep_the_first_ones():
+    tool_calls: dict[int, dict] = {}
+    merge_tool_call_deltas(tool_calls, [_delta(0, "{", id="call_a", name="lookup")])
+    merge_tool_call_deltas(tool_calls, [_delta(0, "}")])
+    
+    assert tool_calls[0]["id"] == "call_a"
+    assert tool_calls[0]["function"] == {"name": "lookup", "arguments": "{}"}
+
+
+def test_chunks_without_tool_calls_are_ignored():
+    tool_calls: dict[int, dict] = {}
+    merge_tool_call_deltas(tool_calls, None)
+    merge_tool_call_deltas(tool_calls, [])
+    
+    assert tool_calls == {}
@@ -0,0 +1,91 @@
+"""Tests for token-budgeted conversation compaction."""
+
+import re
+
+from agent_cli.history import SUMMARY_PREFIX, HistoryManager
+from agent_cli.models import ChatMessage
+
+
+def _turn(n: int, tool_output: str = "sunny") -> list[ChatMessage]:
+    """A user turn in which the assistant calls one tool and then answers."""
+    call_id = f"call_{n}"
+    return [
+        ChatMessage(role="user", content=f"question {n}"),
+        ChatMessage(
+            role="assistant",
+            tool_calls=[{"id": call_id, "type": "function", "function": {"name": "weather", "arguments": "{}"}}],
+        ),
+        ChatMessage(role="tool", content=tool_output, tool_call_id=call_id, name="weather"),
+        ChatMessage(role="assistant", content=f"answer {n}"),
+    ]
+
+
+def _conversation(turns: int, tool_output: str = "sunny " * 100) -> list[ChatMessage]:
+    conversation = [ChatMessage(role="system", content="You are helpful.")]
+    for n in range(turns):
+        conversation.extend(_turn(n, tool_output))
+    return conversation
+
+
+def _assert_tool_results_follow_their_calls(conversation: list[ChatMessage]) -> None:
+    called = set()
+    for message in conversation:
+        for tool_call in message.tool_calls or []:
+            called.add(tool_call["id"])
+        if message.role == "tool":
+            assert message.tool_call_id in called
+            called.discard(message.tool_call_id)
+    assert not called
+
+
+def test_compaction_drops_whole_turns():
+    manager = HistoryManager(token_budget=400, keep_recent_turns=2, tool_output_limit=10_000)
+    conversation = _conversation(6)
+    
+    assert manager.compact(conversation)
+    
+    assert not manager.over_budget(conversation)
+    assert conversation[0].role == "system"
+    assert conversation[1].role == "user"
+    assert conversation[-4:] == _conversation(6)[-4:]
+    _assert_tool_results_follow_their_calls(conversation)
+
+
+def test_summarizer_receives_whole_turns():
+    manager = HistoryManager(token_budget=400, keep_recent_turns=2, tool_output_limit=10_000)
+    conversation = _conversation(6)
+    summarized = []
+    
+    def summarize(messages: list[ChatMessage]) -> str:
+        summarized.append(messages)
+        return "earlier weather questions"
+    
+    assert manager.compact(conversation, summarize)
+    
+    [messages] = summarized
+    assert messages[0].role == "user"
+    assert messages[-1] == ChatMessage(role="assistant", content=messages[-1].content)
+    _assert_tool_results_follow_their_calls(messages)
+    assert conversation[1] == ChatMessage(role="system", content=SUMMARY_PREFIX + "earlier weather questions")
+    assert conversation[2].role == "user"
+    _assert_tool_results_follow_their_calls(conversation)
+
+
+def test_old_tool_outputs_are_truncated_once():
+    manager = HistoryManager(token_budget=300, keep_recent_turns=1, tool_output_limit=200)
+    conversation = _conversation(1, tool_output="x" * 5000) + _turn(1)
+    
+    assert manager.compact(conversation)
+    
+    truncated = conversation[3]
+    assert truncated.role == "tool" and truncated.tool_call_id == "call_0"
+    assert len(truncated.content) <= 200
+    kept, omitted = re.fullmatch(r"(x*)\n\[\.\.\. (\d+) characters of tool output omitted\]", truncated.content).groups()
+    assert len(kept) + int(omitted) == 5000
+    assert len(conversation) == 9
+    
+    # A later, tighter limit leaves the note (and its omitted count) intact
+    manager.tool_output_limit = 100
+    assert not manager._truncate_tool_outputs(conversation, len(conversation) - 4)
+    assert conversation[3] is truncated
+    assert not manager.compact(conversation)
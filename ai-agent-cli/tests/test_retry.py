@@ -0,0 +1,127 @@
+"""Tests for the token endpoint circuit breaker."""
+
+import asyncio
+from dataclasses import replace
+
+import httpx
+import pytest
+
+from agent_cli import transport
+from agent_cli.retry import CircuitBreaker
+
+URL = "https://login.example/tenant/oauth2/v2.0/token"
+
+
+def _raise_redirects(request: httpx.Request) -> httpx.Response:
+    raise httpx.TooManyRedirects("redirect loop", request=request)
+
+
+def _open_breaker(monkeypatch: pytest.MonkeyPatch) -> CircuitBreaker:
+    """Install an open breaker that allows a trial immediately."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    monkeypatch.setattr(transport, "_breaker", breaker)
+    return breaker
+
+
+def _use_client(monkeypatch: pytest.MonkeyPatch, handler) -> list[httpx.Request]:
+    """Route token requests to a handler without retry delays; returns the requests seen."""
+    requests = []
+    
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+    
+    client = httpx.Client(transport=httpx.MockTransport(record))
+    monkeypatch.setattr(transport, "get_token_http_client", lambda: client)
+    monkeypatch.setattr(transport, "_settings", replace(transport._settings, max_attempts=3, backoff_base=0.0))
+    return requests
+
+
+def test_retries_count_as_one_breaker_failure(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+    monkeypatch.setattr(transport, "_breaker", breaker)
+    requests = _use_client(monkeypatch, lambda request: httpx.Response(503))
+    
+    assert transport.post_token_request(URL, data={}).status_code == 503
+    
+    assert len(requests) == 3
+    assert breaker.state == CircuitBreaker.CLOSED
+    transport.post_token_request(URL, data={})
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_throttling_with_retry_after_does_not_open_breaker(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    monkeypatch.setattr(transport, "_breaker", breaker)
+    _use_client(monkeypatch, lambda request: httpx.Response(429, headers={"Retry-After": "0"}))
+    
+    for _ in range(3):
+        assert transport.post_token_request(URL, data={}).status_code == 429
+    
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_trial_retries_within_one_request(monkeypatch):
+    breaker = _open_breaker(monkeypatch)
+    responses = iter([httpx.Response(503), httpx.Response(200)])
+    requests = _use_client(monkeypatch, lambda request: next(responses))
+    
+    assert transport.post_token_request(URL, data={}).status_code == 200
+    
+    assert len(requests) == 2
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_trial_released_after_non_transport_error(monkeypatch):
+    breaker = _open_breaker(monkeypatch)
+    client = httpx.Client(transport=httpx.MockTransport(_raise_redirects))
+    monkeypatch.setattr(transport, "get_token_http_client", lambda: client)
+    
+    with pytest.raises(httpx.TooManyRedirects):
+        transport.post_token_request(URL, data={})
+    
+    assert breaker.allow_request()
+
+
+def test_trial_released_after_async_non_transport_error(monkeypatch):
+    breaker = _open_breaker(monkeypatch)
+    
+    async def run() -> None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_raise_redirects)) as client:
+            await transport.post_token_request_async(client, URL, data={})
+    
+    with pytest.raises(httpx.TooManyRedirects):
+        asyncio.run(run())
+    
+    assert breaker.allow_request()
+
+
+def test_trial_released_after_cancellation(monkeypatch):
+    breaker = _open_breaker(monkeypatch)
+    
+    async def hang(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(60)
+        return httpx.Response(200)
+    
+    async def run() -> None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(hang)) as client:
+            task = asyncio.create_task(transport.post_token_request_async(client, URL, data={}))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+    
+    asyncio.run(run())
+    
+    assert breaker.allow_request()
+
+
+def test_release_trial_frees_half_open_slot():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.release_trial()
+    assert breaker.allow_request()
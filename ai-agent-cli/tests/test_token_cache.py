@@ -0,0 +1,185 @@
+"""Tests for the expiry-aware token cache and its background refresh."""
+
+import threading
+import time
+
+import pytest
+
+from agent_cli import token_cache
+from agent_cli.models import TokenResult
+from agent_cli.token_cache import BackgroundRefresher, ExpiringTokenCache, KeyedLocks
+
+
+def _token(name: str, expires_in: int = 3600, age: float = 0.0) -> TokenResult:
+    """Build an opaque token acquired ``age`` seconds ago."""
+    return TokenResult(access_token=name, expires_in=expires_in, acquired_at=time.time() - age)
+
+
+def _wait_for(condition, timeout: float = 2.0) -> None:
+    """Poll until a condition holds (background threads finish their bookkeeping)."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _stale_cache() -> ExpiringTokenCache:
+    """Cache holding one token inside its refresh window but not yet expired."""
+    cache = ExpiringTokenCache(refresh_skew=300)
+    cache.put("k", _token("stale", expires_in=900, age=700))
+    return cache
+
+
+def test_get_or_revalidate_serves_stale_token_while_refreshing():
+    cache = _stale_cache()
+    refreshed = threading.Event()
+    release = threading.Event()
+    
+    def refresh(key):
+        release.wait(2)
+        token = _token("fresh")
+        cache.put(key, token)
+        refreshed.set()
+        return token
+    
+    def fetch():
+        raise AssertionError("a stale token must not block on fetch")
+    
+    assert cache.get_or_revalidate("k", fetch, refresh).access_token == "stale"
+    # Only one revalidation runs per key
+    assert not cache.revalidate("k", refresh)
+    release.set()
+    assert refreshed.wait(2)
+    assert cache.get_or_revalidate("k", fetch, refresh).access_token == "fresh"
+
+
+def test_failed_revalidation_is_not_retried_immediately():
+    cache = _stale_cache()
+    calls = []
+    
+    def failing(key):
+        calls.append(key)
+        raise RuntimeError("token endpoint down")
+    
+    assert cache.revalidate("k", failing)
+    _wait_for(lambda: "k" not in cache._revalidating)
+    assert not cache.revalidate("k", failing)
+    assert cache.get_or_revalidate("k", lambda: None, failing).access_token == "stale"
+    assert calls == ["k"]
+
+
+def test_failed_revalidation_is_retried_after_the_retry_interval(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(token_cache, "DEFAULT_REFRESH_RETRY_SECONDS", 0)
+    cache = _stale_cache()
+    
+    def failing(key):
+        raise RuntimeError("token endpoint down")
+    
+    def refresh(key):
+        cache.put(key, _token("fresh"))
+        return cache.get(key)
+    
+    assert cache.revalidate("k", failing)
+    _wait_for(lambda: "k" not in cache._revalidating)
+    assert cache.get_or_revalidate("k", lambda: None, refresh).access_token == "stale"
+    _wait_for(lambda: cache.get_fresh("k") is not None)
+    assert cache.get_fresh("k").access_token == "fresh"
+
+
+def test_bounded_cache_purges_expired_entries_before_evicting():
+    cache = ExpiringTokenCache(max_entries=2)
+    cache.put("expired", _token("a", expires_in=10, age=60))
+    cache.put("b", _token("b"))
+    cache.put("c", _token("c"))
+    
+    assert set(cache.keys()) == {"b", "c"}
+    assert cache.expirations == 1
+    assert cache.evictions == 0
+
+
+def test_bounded_cache_evicts_least_recently_used():
+    cache = ExpiringTokenCache(max_entries=2)
+    cache.put("a", _token("a"))
+    cache.put("b", _token("b"))
+    assert cache.get("a") is not None
+    cache.put("c", _token("c"))
+    
+    assert set(cache.keys()) == {"a", "c"}
+    assert cache.evictions == 1
+    assert cache.expirations == 0
+
+
+def test_keyed_locks_are_released_by_their_last_user():
+    locks = KeyedLocks()
+    waiter_done = threading.Event()
+    
+    def wait_for_lock():
+        with locks("k"):
+            pass
+        waiter_done.set()
+    
+    with locks("k"):
+        assert len(locks) == 1
+        waiter = threading.Thread(target=wait_for_lock)
+        waiter.start()
+        time.sleep(0.05)
+        # Still referenced by the waiting thread
+        assert len(locks) == 1
+        assert not waiter_done.is_set()
+    
+    waiter.join(2)
+    assert waiter_done.is_set()
+    assert len(locks) == 0
+
+
+def test_keyed_lock_is_released_when_the_body_raises():
+    locks = KeyedLocks()
+    with pytest.raises(RuntimeError):
+        with locks("k"):
+            raise RuntimeError("fetch failed")
+    assert len(locks) == 0
+
+
+def test_background_refresher_refreshes_due_entries():
+    cache = _stale_cache()
+    refreshed = threading.Event()
+    
+    def refresh(key):
+        token = _token("fresh")
+        cache.put(key, token)
+        refreshed.set()
+        return token
+    
+    refresher = BackgroundRefresher(cache, refresh)
+    refresher.start()
+    try:
+        assert refreshed.wait(2)
+        assert cache.get_fresh("k").access_token == "fresh"
+    finally:
+        refresher.stop()
+    assert not refresher.is_running
+
+
+def test_background_refresher_retries_failed_refreshes():
+    cache = _stale_cache()
+    calls = []
+    refreshed = threading.Event()
+    
+    def refresh(key):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return None
+        token = _token("fresh")
+        cache.put(key, token)
+        refreshed.set()
+        return token
+    
+    refresher = BackgroundRefresher(cache, refresh, retry_interval=0.1)
+    refresher.start()
+    try:
+        assert refreshed.wait(2)
+    finally:
+        refresher.stop()
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.09
+    assert cache.get_fresh("k").access_token == "fresh"
@@ -0,0 +1,104 @@
+"""Tests for the shared SQLite token store and its cross-replica locks."""
+
+import threading
+import time
+
+import pytest
+from cryptography.fernet import Fernet
+
+from agent_cli.models import TokenResult
+from agent_cli.token_store import OBO_TOKEN_STORE_KEY_ENV, SQLiteTokenStore
+
+SCOPE = "api://mcp/.default"
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(OBO_TOKEN_STORE_KEY_ENV, Fernet.generate_key().decode())
+    return tmp_path / "tokens.db"
+
+
+@pytest.fixture
+def stores(db_path):
+    """Factory for replicas sharing one database; closes them afterwards."""
+    created = []
+    
+    def make(**kwargs) -> SQLiteTokenStore:
+        store = SQLiteTokenStore(db_path, **kwargs)
+        created.append(store)
+        return store
+    
+    yield make
+    for store in created:
+        store.close()
+
+
+def test_requires_a_key_outside_the_database(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv(OBO_TOKEN_STORE_KEY_ENV, raising=False)
+    with pytest.raises(ValueError):
+        SQLiteTokenStore(tmp_path / "tokens.db")
+
+
+def test_replicas_share_tokens(stores):
+    first, second = stores(), stores()
+    first.put("user", "agent", SCOPE, TokenResult(access_token="t2", expires_in=3600))
+    
+    assert second.get("user", "agent", SCOPE).access_token == "t2"
+    assert second.get("other", "agent", SCOPE) is None
+
+
+def test_second_replica_waits_for_the_lock_holder(stores):
+    holder, waiter = stores(), stores(lock_timeout=2.0)
+    acquired = threading.Event()
+    
+    def hold():
+        with holder.lock("user", "agent", SCOPE) as got:
+            assert got
+            acquired.set()
+            time.sleep(0.2)
+            holder.put("user", "agent", SCOPE, TokenResult(access_token="t2", expires_in=3600))
+    
+    thread = threading.Thread(target=hold)
+    thread.start()
+    assert acquired.wait(2)
+    started = time.monotonic()
+    with waiter.lock("user", "agent", SCOPE) as got:
+        waited = time.monotonic() - started
+        assert got
+        assert waiter.get("user", "agent", SCOPE).access_token == "t2"
+    thread.join()
+    assert waited >= 0.1
+
+
+def test_lock_wait_gives_up_after_the_timeout(stores):
+    holder, waiter = stores(), stores(lock_timeout=0.2)
+    with holder.lock("user", "agent", SCOPE) as got:
+        assert got
+        started = time.monotonic()
+        with waiter.lock("user", "agent", SCOPE) as got_waiter:
+            assert not got_waiter
+        assert time.monotonic() - started >= 0.2
+
+
+def test_held_lock_is_renewed_past_its_lease(stores):
+    holder, waiter = stores(lock_lease=0.3), stores(lock_lease=0.3, lock_timeout=0.6)
+    with holder.lock("user", "agent", SCOPE) as got:
+        assert got
+        with waiter.lock("user", "agent", SCOPE) as got_waiter:
+            assert not got_waiter
+
+
+def test_expired_lease_of_a_crashed_replica_is_taken_over(stores):
+    crashed, waiter = stores(lock_lease=0.3), stores(lock_lease=0.3, lock_timeout=2.0)
+    # Take the lock row without holding it, as a replica that died mid-acquisition
+    key = SQLiteTokenStore._key("user", "agent", SCOPE)
+    assert crashed._try_acquire(key)
+    assert not waiter._try_acquire(key)
+    
+    started = time.monotonic()
+    with waiter.lock("user", "agent", SCOPE) as got:
+        assert got
+    waited = time.monotonic() - started
+    assert 0.2 <= waited < 2.0
+    # The lock row is gone once the new owner releases it
+    assert crashed._try_acquire(key)
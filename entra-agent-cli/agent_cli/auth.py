@@ -6,10 +6,13 @@ from pathlib import Path
 from typing import Optional
 
 import httpx
-from msal import PublicClientApplication, SerializableTokenCache
+from msal import PublicClientApplication
 from rich.console import Console
 
+from .credentials import ClientCredential
 from .models import TokenResult
+from .msal_cache import PersistentMsalCache, atomic_write
+from .transport import post_token_request, token_endpoint_url, token_error_message
 
 
 console = Console()
@@ -21,6 +24,9 @@ GRAPH_POWERSHELL_CLIENT_ID = "14d82eec-204b-4c2f-b7e8-296a70dab67e"
 # Token cache file location
 TOKEN_CACHE_PATH = Path.home() / ".agent-identity-cli-tokens.json"
 
+# Last-used account (home_account_id) per tenant and scope set
+ACCOUNT_INDEX_PATH = Path.home() / ".agent-identity-cli-accounts.json"
+
 # Required scopes for blueprint operations
 BLUEPRINT_SCOPES = [
     "AgentIdentityBlueprint.AddRemoveCreds.All",
@@ -39,10 +45,15 @@ READ_ONLY_SCOPES = [
 
 
 class TokenCache:
-    """Persistent token cache for MSAL."""
+    """Persistent token cache for MSAL.
+    
+    Changes are written through to disk atomically under an advisory file
+    lock, and the file is reloaded when another process updates it, so
+    concurrent CLI processes share refresh tokens safely.
+    """
     
     _instance: Optional["TokenCache"] = None
-    _cache: Optional[SerializableTokenCache] = None
+    _cache: Optional[PersistentMsalCache] = None
     
     @classmethod
     def get_instance(cls) -> "TokenCache":
@@ -53,46 +64,33 @@ class TokenCache:
     
     def __init__(self):
         """Initialize token cache."""
-        self._cache = SerializableTokenCache()
-        self._load()
-        # Register save on exit
+        self._cache = PersistentMsalCache(TOKEN_CACHE_PATH)
+        # Safety net for changes made outside MSAL's add/modify hooks
         atexit.register(self._save)
     
     def _load(self) -> None:
-        """Load cache from disk."""
-        if TOKEN_CACHE_PATH.exists():
-            try:
-                with open(TOKEN_CACHE_PATH, "r") as f:
-                    self._cache.deserialize(f.read())
-            except (json.JSONDecodeError, IOError) as e:
-                console.print(f"[dim]Warning: Could not load token cache: {e}[/dim]")
+        """Reload cache from disk if another process changed it."""
+        self._cache.reload()
     
     def _save(self) -> None:
         """Save cache to disk if modified."""
-        if self._cache.has_state_changed:
-            try:
-                TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-                with open(TOKEN_CACHE_PATH, "w") as f:
-                    f.write(self._cache.serialize())
-            except IOError as e:
-                console.print(f"[dim]Warning: Could not save token cache: {e}[/dim]")
+        try:
+            self._cache.flush()
+        except OSError as e:
+            console.print(f"[dim]Warning: Could not save token cache: {e}[/dim]")
     
     @property
-    def cache(self) -> SerializableTokenCache:
+    def cache(self) -> PersistentMsalCache:
         """Get the underlying MSAL cache."""
         return self._cache
     
     def clear(self) -> None:
         """Clear the token cache."""
-        # Create a new empty cache
-        self._cache = SerializableTokenCache()
-        # Delete the cache file
-        if TOKEN_CACHE_PATH.exists():
-            try:
-                TOKEN_CACHE_PATH.unlink()
-                console.print("[green]✓ Token cache cleared[/green]")
-            except IOError as e:
-                console.print(f"[red]Failed to delete token cache: {e}[/red]")
+        try:
+            self._cache.delete()
+            console.print("[green]✓ Token cache cleared[/green]")
+        except OSError as e:
+            console.print(f"[red]Failed to delete token cache: {e}[/red]")
 
 
 def get_msal_app(
@@ -118,22 +116,98 @@ def get_msal_app(
     )
 
 
+def _account_index_key(tenant_id: str, scopes: list[str]) -> str:
+    """Build the account index key for a tenant and scope set."""
+    return f"{tenant_id}|{' '.join(sorted(scopes))}"
+
+
+def _load_account_index() -> dict[str, str]:
+    """Load the last-used account index from disk."""
+    if not ACCOUNT_INDEX_PATH.exists():
+        return {}
+    try:
+        with open(ACCOUNT_INDEX_PATH, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+
+
+def _remember_account(tenant_id: str, scopes: list[str], home_account_id: Optional[str]) -> None:
+    """Record the account used for a tenant and scope set."""
+    if not home_account_id:
+        return
+    index = _load_account_index()
+    key = _account_index_key(tenant_id, scopes)
+    if index.get(key) == home_account_id:
+        return
+    index[key] = home_account_id
+    try:
+        atomic_write(ACCOUNT_INDEX_PATH, json.dumps(index, indent=2))
+    except IOError as e:
+        console.print(f"[dim]Warning: Could not save account index: {e}[/dim]")
+
+
+def _home_account_id(result: dict) -> Optional[str]:
+    """Derive the MSAL home_account_id (oid.tid) from a token response."""
+    claims = result.get("id_token_claims") or {}
+    if claims.get("oid") and claims.get("tid"):
+        return f"{claims['oid']}.{claims['tid']}"
+    return None
+
+
+def _select_cached_accounts(
+    app: PublicClientApplication,
+    tenant_id: str,
+    scopes: list[str],
+    account_hint: Optional[str] = None,
+) -> list[dict]:
+    """Choose which cached accounts to try for silent acquisition.
+    
+    Args:
+        app: MSAL application
+        tenant_id: Azure AD tenant ID
+        scopes: Scopes being requested
+        account_hint: Username or home_account_id requested by the user
+        
+    Returns:
+        The hinted account, else the last-used account for this tenant and
+        scope set, else all cached accounts
+    """
+    accounts = app.get_accounts()
+    if account_hint:
+        hint = account_hint.lower()
+        return [
+            account for account in accounts
+            if hint in (account.get("username", "").lower(), account.get("home_account_id", "").lower())
+        ]
+    
+    last_used = _load_account_index().get(_account_index_key(tenant_id, scopes))
+    for account in accounts:
+        if account.get("home_account_id") == last_used:
+            return [account]
+    return accounts
+
+
 def get_device_code_token(
     tenant_id: str,
     scopes: Optional[list[str]] = None,
     client_id: str = GRAPH_POWERSHELL_CLIENT_ID,
     force_refresh: bool = False,
+    account_hint: Optional[str] = None,
 ) -> Optional[TokenResult]:
     """Acquire a token using device code flow with caching.
     
     First attempts to get a cached token silently. If that fails,
-    falls back to device code flow.
+    falls back to device code flow. Only the hinted account, or else the
+    account last used for this tenant and scope set, is tried silently;
+    other cached accounts are tried only when neither is known.
     
     Args:
         tenant_id: Azure AD tenant ID
         scopes: Scopes to request (defaults to BLUEPRINT_SCOPES)
         client_id: Client ID to use (defaults to Graph PowerShell client)
         force_refresh: If True, skip cache and force new authentication
+        account_hint: Username or home_account_id of the cached account to use
         
     Returns:
         TokenResult if successful, None otherwise
@@ -145,14 +219,15 @@ def get_device_code_token(
     
     # Try to get token silently from cache first
     if not force_refresh:
-        accounts = app.get_accounts()
+        accounts = _select_cached_accounts(app, tenant_id, scopes, account_hint)
         if accounts:
-            console.print(f"[dim]Found {len(accounts)} cached account(s), attempting silent token acquisition...[/dim]")
+            console.print(f"[dim]Found {len(accounts)} matching cached account(s), attempting silent token acquisition...[/dim]")
             
             for account in accounts:
                 result = app.acquire_token_silent(scopes=scopes, account=account)
                 if result and "access_token" in result:
                     console.print(f"[green]✓ Using cached token for {account.get('username', 'unknown')}[/green]")
+                    _remember_account(tenant_id, scopes, account.get("home_account_id"))
                     return TokenResult(
                         access_token=result["access_token"],
                         token_type=result.get("token_type", "Bearer"),
@@ -177,6 +252,7 @@ def get_device_code_token(
     if "access_token" in result:
         # Cache is automatically updated by MSAL
         console.print("[green]✓ Authentication successful, token cached for future use[/green]")
+        _remember_account(tenant_id, scopes, _home_account_id(result))
         return TokenResult(
             access_token=result["access_token"],
             token_type=result.get("token_type", "Bearer"),
@@ -210,54 +286,63 @@ def get_cached_accounts(tenant_id: str) -> list[dict]:
 def get_client_credentials_token(
     tenant_id: str,
     client_id: str,
-    client_secret: str,
+    client_secret: Optional[str],
     scope: str = "https://graph.microsoft.com/.default",
+    credential: Optional[ClientCredential] = None,
 ) -> Optional[TokenResult]:
     """Acquire a token using client credentials flow.
     
     Args:
         tenant_id: Azure AD tenant ID
         client_id: Application (client) ID
-        client_secret: Client secret
+        client_secret: Client secret (ignored if credential is given)
         scope: Scope to request
+        credential: Client credential (e.g. a certificate) to use instead of the secret
         
     Returns:
         TokenResult if successful, None otherwise
     """
-    token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
-    
-    data = {
-        "client_id": client_id,
-        "scope": scope,
-        "grant_type": "client_credentials",
-        "client_secret": client_secret,
-    }
+    token_url = token_endpoint_url(tenant_id)
+    
+    try:
+        data = {
+            "client_id": client_id,
+            "scope": scope,
+            "grant_type": "client_credentials",
+            **(credential.client_auth_fields() if credential else {"client_secret": client_secret}),
+        }
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Token request failed: could not load client credential: {e}[/red]")
+        return None
     
-    with httpx.Client() as client:
-        response = client.post(
+    try:
+        response = post_token_request(
             token_url,
             data=data,
             headers={"Content-Type": "application/x-www-form-urlencoded"},
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return TokenResult(
-                access_token=result["access_token"],
-                token_type=result.get("token_type", "Bearer"),
-                expires_in=result.get("expires_in", 0),
-            )
-        else:
-            error = response.json()
-            console.print(f"[red]Token request failed: {error.get('error_description', error.get('error', 'Unknown error'))}[/red]")
-            return None
+    except httpx.HTTPError as e:
+        console.print(f"[red]Token request failed: {e}[/red]")
+        return None
+    
+    if response.status_code == 200:
+        result = response.json()
+        return TokenResult(
+            access_token=result["access_token"],
+            token_type=result.get("token_type", "Bearer"),
+            expires_in=result.get("expires_in", 0),
+        )
+    else:
+        console.print(f"[red]Token request failed: {token_error_message(response)}[/red]")
+        return None
 
 
 def get_blueprint_token_with_fmi_path(
     tenant_id: str,
     blueprint_app_id: str,
-    client_secret: str,
+    client_secret: Optional[str],
     agent_identity_app_id: str,
+    credential: Optional[ClientCredential] = None,
 ) -> Optional[TokenResult]:
     """Get T1 token: Blueprint token with fmi_path pointing to agent identity.
     
@@ -266,40 +351,47 @@ def get_blueprint_token_with_fmi_path(
     Args:
         tenant_id: Azure AD tenant ID
         blueprint_app_id: Blueprint application ID
-        client_secret: Blueprint client secret
+        client_secret: Blueprint client secret (ignored if credential is given)
         agent_identity_app_id: Agent identity application ID (used as fmi_path)
+        credential: Client credential (e.g. a certificate) to use instead of the secret
         
     Returns:
         TokenResult (T1) if successful, None otherwise
     """
-    token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
-    
-    data = {
-        "client_id": blueprint_app_id,
-        "scope": "api://AzureADTokenExchange/.default",
-        "grant_type": "client_credentials",
-        "client_secret": client_secret,
-        "fmi_path": agent_identity_app_id,
-    }
+    token_url = token_endpoint_url(tenant_id)
+    
+    try:
+        data = {
+            "client_id": blueprint_app_id,
+            "scope": "api://AzureADTokenExchange/.default",
+            "grant_type": "client_credentials",
+            **(credential.client_auth_fields() if credential else {"client_secret": client_secret}),
+            "fmi_path": agent_identity_app_id,
+        }
+    except (OSError, ValueError) as e:
+        console.print(f"[red]T1 token request failed: could not load client credential: {e}[/red]")
+        return None
     
-    with httpx.Client() as client:
-        response = client.post(
+    try:
+        response = post_token_request(
             token_url,
             data=data,
             headers={"Content-Type": "application/x-www-form-urlencoded"},
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return TokenResult(
-                access_token=result["access_token"],
-                token_type=result.get("token_type", "Bearer"),
-                expires_in=result.get("expires_in", 0),
-            )
-        else:
-            error = response.json()
-            console.print(f"[red]T1 token request failed: {error.get('error_description', error.get('error', 'Unknown error'))}[/red]")
-            return None
+    except httpx.HTTPError as e:
+        console.print(f"[red]T1 token request failed: {e}[/red]")
+        return None
+    
+    if response.status_code == 200:
+        result = response.json()
+        return TokenResult(
+            access_token=result["access_token"],
+            token_type=result.get("token_type", "Bearer"),
+            expires_in=result.get("expires_in", 0),
+        )
+    else:
+        console.print(f"[red]T1 token request failed: {token_error_message(response)}[/red]")
+        return None
 
 
 def exchange_token_for_agent_identity(
@@ -319,7 +411,7 @@ def exchange_token_for_agent_identity(
     Returns:
         TokenResult (T2) if successful, None otherwise
     """
-    token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
+    token_url = token_endpoint_url(tenant_id)
     
     data = {
         "client_id": agent_identity_app_id,
@@ -329,33 +421,36 @@ def exchange_token_for_agent_identity(
         "client_assertion": t1_token,
     }
     
-    with httpx.Client() as client:
-        response = client.post(
+    try:
+        response = post_token_request(
             token_url,
             data=data,
             headers={"Content-Type": "application/x-www-form-urlencoded"},
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return TokenResult(
-                access_token=result["access_token"],
-                token_type=result.get("token_type", "Bearer"),
-                expires_in=result.get("expires_in", 0),
-            )
-        else:
-            error = response.json()
-            console.print(f"[red]T2 token request failed: {error.get('error_description', error.get('error', 'Unknown error'))}[/red]")
-            return None
+    except httpx.HTTPError as e:
+        console.print(f"[red]T2 token request failed: {e}[/red]")
+        return None
+    
+    if response.status_code == 200:
+        result = response.json()
+        return TokenResult(
+            access_token=result["access_token"],
+            token_type=result.get("token_type", "Bearer"),
+            expires_in=result.get("expires_in", 0),
+        )
+    else:
+        console.print(f"[red]T2 token request failed: {token_error_message(response)}[/red]")
+        return None
 
 
 def get_agent_identity_token(
     tenant_id: str,
     blueprint_app_id: str,
-    client_secret: str,
+    client_secret: Optional[str],
     agent_identity_app_id: str,
     scope: str = "https://graph.microsoft.com/.default",
     show_intermediate: bool = True,
+    credential: Optional[ClientCredential] = None,
 ) -> tuple[Optional[TokenResult], Optional[TokenResult], Optional[TokenResult]]:
     """Get an access token for an agent identity using the two-step exchange.
     
@@ -371,6 +466,7 @@ def get_agent_identity_token(
         agent_identity_app_id: Agent identity application ID
         scope: Scope for the final token
         show_intermediate: Whether to display intermediate tokens
+        credential: Client credential (e.g. a certificate) to use instead of the secret
         
     Returns:
         Tuple of (blueprint_token, t1_token, t2_token)
@@ -384,6 +480,7 @@ def get_agent_identity_token(
             client_id=blueprint_app_id,
             client_secret=client_secret,
             scope="https://graph.microsoft.com/.default",
+            credential=credential,
         )
         if blueprint_token:
             console.print("[green]✓ Got blueprint access token[/green]")
@@ -395,6 +492,7 @@ def get_agent_identity_token(
         blueprint_app_id=blueprint_app_id,
         client_secret=client_secret,
         agent_identity_app_id=agent_identity_app_id,
+        credential=credential,
     )
     
     if not t1_token:
@@ -421,6 +519,7 @@ def get_user_token_for_blueprint(
     tenant_id: str,
     blueprint_app_id: str,
     force_refresh: bool = False,
+    account_hint: Optional[str] = None,
 ) -> Optional[TokenResult]:
     """Get a user token with the Blueprint as the audience.
     
@@ -431,6 +530,7 @@ def get_user_token_for_blueprint(
         tenant_id: Azure AD tenant ID
         blueprint_app_id: Blueprint application ID (used as audience)
         force_refresh: If True, skip cache and force new authentication
+        account_hint: Username or home_account_id of the cached account to use
         
     Returns:
         TokenResult (Tc) if successful, None otherwise
@@ -442,6 +542,7 @@ def get_user_token_for_blueprint(
         tenant_id=tenant_id,
         scopes=scopes,
         force_refresh=force_refresh,
+        account_hint=account_hint,
     )
 
 
@@ -470,7 +571,7 @@ def perform_obo_exchange(
     Returns:
         TokenResult (T2 - OBO token) if successful, None otherwise
     """
-    token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
+    token_url = token_endpoint_url(tenant_id)
     
     data = {
         "client_id": agent_identity_app_id,
@@ -482,33 +583,36 @@ def perform_obo_exchange(
         "requested_token_use": "on_behalf_of",
     }
     
-    with httpx.Client() as client:
-        response = client.post(
+    try:
+        response = post_token_request(
             token_url,
             data=data,
             headers={"Content-Type": "application/x-www-form-urlencoded"},
         )
-        
-        if response.status_code == 200:
-            result = response.json()
-            return TokenResult(
-                access_token=result["access_token"],
-                token_type=result.get("token_type", "Bearer"),
-                expires_in=result.get("expires_in", 0),
-            )
-        else:
-            error = response.json()
-            console.print(f"[red]OBO exchange failed: {error.get('error_description', error.get('error', 'Unknown error'))}[/red]")
-            return None
+    except httpx.HTTPError as e:
+        console.print(f"[red]OBO exchange failed: {e}[/red]")
+        return None
+    
+    if response.status_code == 200:
+        result = response.json()
+        return TokenResult(
+            access_token=result["access_token"],
+            token_type=result.get("token_type", "Bearer"),
+            expires_in=result.get("expires_in", 0),
+        )
+    else:
+        console.print(f"[red]OBO exchange failed: {token_error_message(response)}[/red]")
+        return None
 
 
 def get_obo_token(
     tenant_id: str,
     blueprint_app_id: str,
-    client_secret: str,
+    client_secret: Optional[str],
     agent_identity_app_id: str,
     user_token: str,
     scope: str = "https://graph.microsoft.com/.default",
+    credential: Optional[ClientCredential] = None,
 ) -> tuple[Optional[TokenResult], Optional[TokenResult]]:
     """Get an OBO token for an agent identity acting on behalf of a user.
     
@@ -523,6 +627,7 @@ def get_obo_token(
         agent_identity_app_id: Agent identity application ID
         user_token: User token with Blueprint audience (Tc)
         scope: Target resource scope for the OBO token
+        credential: Client credential (e.g. a certificate) to use instead of the secret
         
     Returns:
         Tuple of (t1_token, t2_obo_token)
@@ -534,6 +639,7 @@ def get_obo_token(
         blueprint_app_id=blueprint_app_id,
         client_secret=client_secret,
         agent_identity_app_id=agent_identity_app_id,
+        credential=credential,
     )
     
     if not t1_token:
@@ -0,0 +1,155 @@
+"""Client credentials used by the Blueprint to authenticate token requests."""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Protocol, runtime_checkable
+
+from .models import TokenResult
+from .transport import token_endpoint_url
+
+
+# client_assertion_type for JWT client assertions
+JWT_BEARER_ASSERTION_TYPE = "urn:ietf:params:oauth:client-assertion-type:jwt-bearer"
+
+# Re-sign assertions this many seconds before they expire
+DEFAULT_ASSERTION_REFRESH_SKEW_SECONDS = 60
+
+# Lifetime of assertions signed with a certificate
+DEFAULT_ASSERTION_LIFETIME_SECONDS = 600
+
+
+def _b64url(data: bytes) -> str:
+    """Base64url-encode without padding (JWT encoding)."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+@runtime_checkable
+class ClientCredential(Protocol):
+    """Source of client authentication fields for a token request."""
+    
+    def client_auth_fields(self) -> dict:
+        """Get the form fields that authenticate the client.
+        
+        Returns:
+            Either ``client_secret`` or ``client_assertion_type`` + ``client_assertion``
+        """
+        ...
+
+
+class CertificateCredential:
+    """Authenticates with a JWT client assertion signed by a certificate key.
+    
+    The PEM file must contain the private key and the certificate registered
+    on the application. The key is loaded once, and each signed assertion is
+    reused until shortly before it expires, so RSA signing happens once per
+    assertion lifetime rather than once per token request.
+    """
+    
+    def __init__(
+        self,
+        tenant_id: str,
+        client_id: str,
+        certificate_path: str,
+        password: Optional[str] = None,
+        lifetime: int = DEFAULT_ASSERTION_LIFETIME_SECONDS,
+        refresh_skew: int = DEFAULT_ASSERTION_REFRESH_SKEW_SECONDS,
+    ):
+        """Initialize the credential.
+        
+        Args:
+            tenant_id: Azure AD tenant ID (the assertion audience is its token endpoint)
+            client_id: Application (client) ID, used as issuer and subject
+            certificate_path: PEM file with the private key and certificate
+            password: Password of the private key, if encrypted
+            lifetime: Seconds each signed assertion is valid for
+            refresh_skew: Seconds before expiry at which a new assertion is signed
+        """
+        self.tenant_id = tenant_id
+        self.client_id = client_id
+        self.certificate_path = Path(certificate_path)
+        self.password = password
+        self.lifetime = lifetime
+        self.refresh_skew = refresh_skew
+        self._private_key = None
+        self._thumbprint: Optional[str] = None
+        self._assertion: Optional[TokenResult] = None
+        self._lock = threading.Lock()
+    
+    def _load_certificate(self) -> None:
+        """Load the private key and certificate thumbprint (once)."""
+        if self._private_key is not None:
+            return
+        from cryptography import x509
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        
+        pem = self.certificate_path.read_bytes()
+        try:
+            private_key = serialization.load_pem_private_key(
+                pem,
+                password=self.password.encode() if self.password else None,
+            )
+        except TypeError as e:
+            # Raised for a missing or unexpected password
+            raise ValueError(str(e)) from e
+        if not isinstance(private_key, rsa.RSAPrivateKey):
+            raise ValueError(f"Certificate key must be an RSA key: {self.certificate_path}")
+        certificate = x509.load_pem_x509_certificate(pem)
+        der = certificate.public_bytes(serialization.Encoding.DER)
+        self._thumbprint = _b64url(hashlib.sha1(der).digest())
+        self._private_key = private_key
+    
+    def _sign(self) -> TokenResult:
+        """Sign a new client assertion (RS256 with x5t header)."""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+        
+        now = int(time.time())
+        header = {"alg": "RS256", "typ": "JWT", "x5t": self._thumbprint}
+        payload = {
+            "aud": token_endpoint_url(self.tenant_id),
+            "iss": self.client_id,
+            "sub": self.client_id,
+            "jti": str(uuid.uuid4()),
+            "nbf": now,
+            "iat": now,
+            "exp": now + self.lifetime,
+        }
+        signing_input = (
+            f"{_b64url(json.dumps(header, separators=(',', ':')).encode())}."
+            f"{_b64url(json.dumps(payload, separators=(',', ':')).encode())}"
+        )
+        signature = self._private_key.sign(signing_input.encode(), padding.PKCS1v15(), hashes.SHA256())
+        return TokenResult(
+            access_token=f"{signing_input}.{_b64url(signature)}",
+            expires_in=self.lifetime,
+            acquired_at=now,
+        )
+    
+    def get_assertion(self) -> str:
+        """Get a signed client assertion, reusing the current one while valid.
+        
+        Returns:
+            Signed JWT assertion
+            
+        Raises:
+            OSError: If the certificate file cannot be read
+            ValueError: If the key or certificate cannot be loaded
+        """
+        with self._lock:
+            if self._assertion is None or self._assertion.is_expired(self.refresh_skew):
+                self._load_certificate()
+                self._assertion = self._sign()
+            return self._assertion.access_token
+    
+    def client_auth_fields(self) -> dict:
+        """Get the client_assertion form fields."""
+        return {
+            "client_assertion_type": JWT_BEARER_ASSERTION_TYPE,
+            "client_assertion": self.get_assertion(),
+        }
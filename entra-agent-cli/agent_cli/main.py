@@ -1,6 +1,7 @@
 """Agent Identity Blueprint CLI - Main entry point."""
 
 import json
+import os
 from typing import Optional
 
 import typer
@@ -21,6 +22,8 @@ from .auth import (
     TOKEN_CACHE_PATH,
 )
 from .config import get_config
+from .credentials import CertificateCredential
+from .models import BlueprintInfo
 from .graph_client import (
     GraphClient,
     create_full_blueprint,
@@ -54,6 +57,32 @@ def require_tenant_id(tenant_id: Optional[str]) -> str:
     return tid
 
 
+def create_blueprint_credential(
+    tenant_id: str,
+    blueprint: BlueprintInfo,
+    certificate: Optional[str],
+) -> Optional[CertificateCredential]:
+    """Create a certificate credential for the Blueprint if one was given.
+    
+    Args:
+        tenant_id: Azure AD tenant ID
+        blueprint: Blueprint the certificate is registered on
+        certificate: PEM file with private key and certificate (--certificate)
+        
+    Returns:
+        CertificateCredential, or None to use the stored client secret
+    """
+    if not certificate:
+        return None
+    console.print(f"[dim]Using certificate for Blueprint: {certificate}[/dim]")
+    return CertificateCredential(
+        tenant_id=tenant_id,
+        client_id=blueprint.app_id,
+        certificate_path=certificate,
+        password=os.getenv("BLUEPRINT_CERTIFICATE_PASSWORD"),
+    )
+
+
 def display_token_claims(token_name: str, claims: dict) -> None:
     """Display token claims in a formatted panel."""
     claims_json = json.dumps(claims, indent=2)
@@ -66,6 +95,7 @@ def list_blueprints(
     tenant_id: Optional[str] = typer.Option(None, "--tenant-id", "-t", help="Azure AD tenant ID"),
     from_graph: bool = typer.Option(False, "--from-graph", "-g", help="Fetch from Graph API (requires auth)"),
     force_refresh: bool = typer.Option(False, "--force-refresh", "-f", help="Force re-authentication (ignore cached token)"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
 ) -> None:
     """List all Agent Identity Blueprints.
     
@@ -79,7 +109,7 @@ def list_blueprints(
         tid = require_tenant_id(tenant_id)
         console.print("[bold blue]Authenticating to fetch blueprints from Graph API...[/bold blue]")
         
-        token = get_device_code_token(tid, scopes=READ_ONLY_SCOPES, force_refresh=force_refresh)
+        token = get_device_code_token(tid, scopes=READ_ONLY_SCOPES, force_refresh=force_refresh, account_hint=account)
         if not token:
             raise typer.Exit(1)
         
@@ -142,6 +172,7 @@ def create_new_blueprint(
     tenant_id: Optional[str] = typer.Option(None, "--tenant-id", "-t", help="Azure AD tenant ID"),
     save: bool = typer.Option(True, "--save/--no-save", help="Save blueprint to local config"),
     force_refresh: bool = typer.Option(False, "--force-refresh", "-f", help="Force re-authentication (ignore cached token)"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
 ) -> None:
     """Create a new Agent Identity Blueprint.
     
@@ -165,7 +196,7 @@ def create_new_blueprint(
     
     # Authenticate
     console.print("[bold blue]Step 1: Authenticate with device code flow[/bold blue]")
-    token = get_device_code_token(tid, force_refresh=force_refresh)
+    token = get_device_code_token(tid, force_refresh=force_refresh, account_hint=account)
     if not token:
         raise typer.Exit(1)
     
@@ -199,6 +230,7 @@ def list_agent_identities(
     tenant_id: Optional[str] = typer.Option(None, "--tenant-id", "-t", help="Azure AD tenant ID"),
     from_graph: bool = typer.Option(False, "--from-graph", "-g", help="Fetch from Graph API (requires auth)"),
     force_refresh: bool = typer.Option(False, "--force-refresh", "-f", help="Force re-authentication (ignore cached token)"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
 ) -> None:
     """List all Agent Identities.
     
@@ -211,7 +243,7 @@ def list_agent_identities(
         tid = require_tenant_id(tenant_id)
         console.print("[bold blue]Authenticating to fetch agent identities from Graph API...[/bold blue]")
         
-        token = get_device_code_token(tid, scopes=READ_ONLY_SCOPES, force_refresh=force_refresh)
+        token = get_device_code_token(tid, scopes=READ_ONLY_SCOPES, force_refresh=force_refresh, account_hint=account)
         if not token:
             raise typer.Exit(1)
         
@@ -357,6 +389,7 @@ def get_access_token(
     tenant_id: Optional[str] = typer.Option(None, "--tenant-id", "-t", help="Azure AD tenant ID"),
     show_claims: bool = typer.Option(True, "--show-claims/--hide-claims", help="Display decoded token claims"),
     output_token: bool = typer.Option(False, "--output-token", "-o", help="Output the final token value"),
+    certificate: Optional[str] = typer.Option(None, "--certificate", help="PEM file (key + certificate) to sign Blueprint assertions instead of the secret"),
 ) -> None:
     """Get an access token for an Agent Identity.
     
@@ -407,6 +440,7 @@ def get_access_token(
         agent_identity_app_id=agent.app_id,
         scope=scope,
         show_intermediate=True,
+        credential=create_blueprint_credential(tid, blueprint, certificate),
     )
     
     # Display tokens
@@ -444,6 +478,8 @@ def get_obo_access_token(
     show_claims: bool = typer.Option(True, "--show-claims/--hide-claims", help="Display decoded token claims"),
     output_token: bool = typer.Option(False, "--output-token", "-o", help="Output the final token value"),
     force_refresh: bool = typer.Option(False, "--force-refresh", "-f", help="Force re-authentication for user token"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
+    certificate: Optional[str] = typer.Option(None, "--certificate", help="PEM file (key + certificate) to sign Blueprint assertions instead of the secret"),
 ) -> None:
     """Get an OBO (On-Behalf-Of) token for an Agent Identity acting on behalf of a user.
     
@@ -505,6 +541,7 @@ def get_obo_access_token(
             tenant_id=tid,
             blueprint_app_id=blueprint.app_id,
             force_refresh=force_refresh,
+            account_hint=account,
         )
         if not tc_token:
             console.print("[red]Failed to get user token.[/red]")
@@ -520,6 +557,7 @@ def get_obo_access_token(
         agent_identity_app_id=agent.app_id,
         user_token=tc_token.access_token,
         scope=scope,
+        credential=create_blueprint_credential(tid, blueprint, certificate),
     )
     
     # Display tokens
@@ -621,6 +659,7 @@ def create_mcp_server_app_cmd(
     graph_permissions: str = typer.Option("User.Read", "--graph-permissions", "-g", help="Microsoft Graph permissions (comma-separated)"),
     tenant_id: Optional[str] = typer.Option(None, "--tenant-id", "-t", help="Azure AD tenant ID"),
     force_refresh: bool = typer.Option(False, "--force-refresh", "-f", help="Force re-authentication"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
 ) -> None:
     """Create an MCP Server app registration for OBO flows.
     
@@ -659,7 +698,7 @@ def create_mcp_server_app_cmd(
         "Application.ReadWrite.All",
         "DelegatedPermissionGrant.ReadWrite.All",
     ]
-    token = get_device_code_token(tid, scopes=required_scopes, force_refresh=force_refresh)
+    token = get_device_code_token(tid, scopes=required_scopes, force_refresh=force_refresh, account_hint=account)
     if not token:
         raise typer.Exit(1)
     
@@ -825,6 +864,7 @@ def add_federated_credential(
     blueprint_id: Optional[str] = typer.Option(None, "--blueprint-id", help="Blueprint client ID (instead of stored name)"),
     tenant_id: Optional[str] = typer.Option(None, "--tenant-id", "-t", help="Azure AD tenant ID"),
     force_refresh: bool = typer.Option(False, "--force-refresh", "-f", help="Force re-authentication"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
 ) -> None:
     """Add a Federated Identity Credential to a Blueprint for workload identity.
     
@@ -907,7 +947,8 @@ def add_federated_credential(
     token = get_device_code_token(
         tid, 
         scopes=["Application.ReadWrite.All"],
-        force_refresh=force_refresh
+        force_refresh=force_refresh,
+        account_hint=account,
     )
     if not token:
         raise typer.Exit(1)
@@ -968,6 +1009,7 @@ def list_federated_credentials(
     blueprint_id: Optional[str] = typer.Option(None, "--blueprint-id", help="Blueprint client ID (instead of stored name)"),
     tenant_id: Optional[str] = typer.Option(None, "--tenant-id", "-t", help="Azure AD tenant ID"),
     force_refresh: bool = typer.Option(False, "--force-refresh", "-f", help="Force re-authentication"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
 ) -> None:
     """List Federated Identity Credentials on a Blueprint.
     
@@ -1015,7 +1057,8 @@ def list_federated_credentials(
     token = get_device_code_token(
         tid, 
         scopes=["Application.Read.All"],
-        force_refresh=force_refresh
+        force_refresh=force_refresh,
+        account_hint=account,
     )
     if not token:
         raise typer.Exit(1)
@@ -1197,6 +1240,7 @@ def list_applications_cmd(
     starts_with: bool = typer.Option(False, "--starts-with", "-s", help="Use startsWith filter instead of search"),
     tenant_id: Optional[str] = typer.Option(None, "--tenant-id", "-t", help="Azure AD tenant ID"),
     force_refresh: bool = typer.Option(False, "--force-refresh", help="Force re-authentication"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
 ) -> None:
     """List application registrations, optionally filtering by name.
     
@@ -1214,7 +1258,7 @@ def list_applications_cmd(
     tid = require_tenant_id(tenant_id)
     
     console.print("[bold blue]Authenticating...[/bold blue]")
-    token = get_device_code_token(tid, scopes=READ_ONLY_SCOPES, force_refresh=force_refresh)
+    token = get_device_code_token(tid, scopes=READ_ONLY_SCOPES, force_refresh=force_refresh, account_hint=account)
     if not token:
         raise typer.Exit(1)
     
@@ -1305,6 +1349,7 @@ def logout() -> None:
 def login(
     tenant_id: Optional[str] = typer.Option(None, "--tenant-id", "-t", help="Azure AD tenant ID"),
     force_refresh: bool = typer.Option(False, "--force-refresh", "-f", help="Force re-authentication (ignore cached token)"),
+    account: Optional[str] = typer.Option(None, "--account", help="Cached account (username) to authenticate as"),
 ) -> None:
     """Authenticate and cache tokens for future use.
     
@@ -1313,7 +1358,7 @@ def login(
     tid = require_tenant_id(tenant_id)
     
     console.print("[bold blue]Authenticating...[/bold blue]")
-    token = get_device_code_token(tid, force_refresh=force_refresh)
+    token = get_device_code_token(tid, force_refresh=force_refresh, account_hint=account)
     
     if token:
         console.print("[green]✓ Authentication successful, token cached for future use[/green]")
@@ -1,6 +1,10 @@
 """Data models for blueprints and agent identities."""
 
+import base64
+import json
+import time
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Optional
 
 
@@ -37,34 +41,111 @@ class MCPServerAppInfo:
     api_scope: str = ""  # e.g., api://{app_id}/access_as_user
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenResult:
-    """Result of a token acquisition."""
+    """Result of a token acquisition.
+    
+    JWT claims are decoded lazily on first access and memoized, so expiry
+    checks on the request path never re-parse the token.
+    """
     
     access_token: str
     token_type: str = "Bearer"
     expires_in: int = 0
+    acquired_at: float = field(default_factory=time.time)
+    _claims: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    _claims_token: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
-    def decoded_claims(self) -> dict:
-        """Decode and return JWT claims (without verification)."""
-        import base64
-        import json
-        
-        # Split the JWT
-        parts = self.access_token.split(".")
-        if len(parts) != 3:
-            return {}
+    @property
+    def claims(self) -> dict:
+        """Get the JWT claims (decoded once, without verification)."""
+        if self._claims_token is not self.access_token:
+            self._claims = _decode_jwt_claims(self.access_token)
+            self._claims_token = self.access_token
+        return self._claims
+    
+    @property
+    def expires_at(self) -> Optional[float]:
+        """Get the absolute expiry time (epoch seconds), if known.
         
-        # Decode the payload (middle part)
-        payload = parts[1]
-        # Add padding if needed
-        padding = 4 - len(payload) % 4
-        if padding != 4:
-            payload += "=" * padding
+        Prefers the JWT ``exp`` claim and falls back to ``expires_in``
+        relative to when the token was acquired.
+        """
+        exp = self.claims.get("exp")
+        if isinstance(exp, (int, float)):
+            return float(exp)
+        if self.expires_in:
+            return self.acquired_at + self.expires_in
+        return None
+    
+    @property
+    def expires_on(self) -> Optional[datetime]:
+        """Get the expiry instant as a UTC datetime, if known."""
+        expires_at = self.expires_at
+        if expires_at is None:
+            return None
+        return datetime.fromtimestamp(expires_at, tz=timezone.utc)
+    
+    @property
+    def remaining_lifetime(self) -> Optional[float]:
+        """Get the seconds until the token expires (negative if expired), if known."""
+        expires_at = self.expires_at
+        if expires_at is None:
+            return None
+        return expires_at - time.time()
+    
+    @property
+    def audience(self) -> Optional[str | list[str]]:
+        """Get the ``aud`` claim (a list when the token has several audiences)."""
+        return self.claims.get("aud")
+    
+    @property
+    def subject(self) -> Optional[str]:
+        """Get the ``sub`` claim."""
+        return self.claims.get("sub")
+    
+    @property
+    def object_id(self) -> Optional[str]:
+        """Get the ``oid`` claim (object ID of the user or service principal)."""
+        return self.claims.get("oid")
+    
+    @property
+    def tenant_id(self) -> Optional[str]:
+        """Get the ``tid`` claim."""
+        return self.claims.get("tid")
+    
+    def is_expired(self, skew: float = 0, now: Optional[float] = None) -> bool:
+        """Check whether the token expires within ``skew`` seconds.
         
-        try:
-            decoded = base64.urlsafe_b64decode(payload)
-            return json.loads(decoded)
-        except Exception:
-            return {}
+        Tokens with unknown expiry are never considered expired.
+        """
+        expires_at = self.expires_at
+        if expires_at is None:
+            return False
+        return (now if now is not None else time.time()) >= expires_at - skew
+    
+    def decoded_claims(self) -> dict:
+        """Decode and return JWT claims (without verification)."""
+        return self.claims
+
 
+def _decode_jwt_claims(token: str) -> dict:
+    """Decode the payload of a JWT (without verification)."""
+    # Split the JWT
+    parts = token.split(".")
+    if len(parts) != 3:
+        return {}
+    
+    # Decode the payload (middle part)
+    payload = parts[1]
+    # Add padding if needed
+    padding = 4 - len(payload) % 4
+    if padding != 4:
+        payload += "=" * padding
+    
+    try:
+        decoded = base64.urlsafe_b64decode(payload)
+        claims = json.loads(decoded)
+    except Exception:
+        return {}
+    return claims if isinstance(claims, dict) else {}
@@ -0,0 +1,174 @@
+"""Retry policy and circuit breaker for Microsoft Entra token endpoint calls."""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+
+# Status codes worth retrying: throttling and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling the token endpoint while the circuit is open."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Jittered exponential backoff that honours ``Retry-After``.
+    
+    Attributes:
+        max_attempts: Total attempts per request (1 disables retries)
+        backoff_base: Base delay in seconds for the first retry
+        backoff_max: Upper bound for a single computed backoff delay
+        max_retry_after: Longest ``Retry-After`` that is waited for; a longer
+            one is returned to the caller instead of blocking the request
+    """
+    
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    max_retry_after: float = 30.0
+    
+    def backoff(self, attempt: int) -> float:
+        """Get the "full jitter" delay before retry number ``attempt`` (1-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+    
+    def delay_for(self, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """Get the delay before the next attempt, or None if it should not be retried.
+        
+        Args:
+            attempt: Number of attempts made so far
+            response: Response of the last attempt (None after a transport error)
+            
+        Returns:
+            Seconds to wait, or None to give up
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if response is None:
+            return self.backoff(attempt)
+        if response.status_code not in RETRYABLE_STATUS_CODES:
+            return None
+        
+        retry_after = parse_retry_after(response)
+        if retry_after is None:
+            return self.backoff(attempt)
+        if retry_after > self.max_retry_after:
+            return None
+        # Spread replicas that were all told the same Retry-After
+        return retry_after + random.uniform(0, self.backoff_base)
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP-date).
+    
+    Args:
+        response: HTTP response
+        
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Fails fast while the token endpoint is unavailable.
+    
+    After ``failure_threshold`` consecutive failed requests (retries
+    exhausted on transport errors, 5xx or throttling without
+    ``Retry-After``) the circuit opens and requests are rejected for
+    ``reset_timeout`` seconds. Then a single trial request is let through:
+    success closes the circuit, failure opens it again.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize a closed circuit.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before allowing a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Get the current circuit state."""
+        with self._lock:
+            if self._opened_at is None:
+                return self.CLOSED
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self.OPEN
+    
+    def retry_in(self) -> float:
+        """Get the seconds until the circuit allows a trial request."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+    
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent now.
+        
+        In the half-open state only one caller is allowed through.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+    
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+    
+    def release_trial(self) -> None:
+        """Let another trial request through without recording an outcome.
+        
+        For requests abandoned without a result (e.g. cancelled), so that
+        the half-open slot is not held forever.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+    
+    def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        self.record_success()
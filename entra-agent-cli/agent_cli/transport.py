@@ -0,0 +1,268 @@
+"""Shared HTTP transport for Microsoft Entra token endpoint calls."""
+
+import atexit
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import httpx
+from rich.console import Console
+
+from .retry import RETRYABLE_STATUS_CODES, CircuitBreaker, CircuitOpenError, RetryPolicy, parse_retry_after
+
+
+console = Console()
+
+# Default Microsoft Entra authority host
+DEFAULT_AUTHORITY_HOST = "https://login.microsoftonline.com"
+
+
+@dataclass(frozen=True)
+class TokenTransportSettings:
+    """Connection settings for the token endpoint client."""
+    
+    timeout: float = 30.0
+    connect_timeout: float = 10.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+    authority_host: str = DEFAULT_AUTHORITY_HOST
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    max_retry_after: float = 30.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+
+
+_settings = TokenTransportSettings()
+_client: Optional[httpx.Client] = None
+_lock = threading.Lock()
+_breaker = CircuitBreaker(
+    failure_threshold=_settings.breaker_failure_threshold,
+    reset_timeout=_settings.breaker_reset_timeout,
+)
+
+
+def configure_token_transport(**overrides) -> TokenTransportSettings:
+    """Update the token endpoint transport settings.
+    
+    Any existing pooled client is closed and rebuilt on next use.
+    
+    Args:
+        **overrides: TokenTransportSettings fields to change (None values are ignored)
+        
+    Returns:
+        The effective settings
+    """
+    global _settings
+    changes = {k: v for k, v in overrides.items() if v is not None}
+    with _lock:
+        _settings = replace(_settings, **changes)
+        _breaker.failure_threshold = _settings.breaker_failure_threshold
+        _breaker.reset_timeout = _settings.breaker_reset_timeout
+    close_token_http_client()
+    return _settings
+
+
+def get_token_transport_settings() -> TokenTransportSettings:
+    """Get the current token endpoint transport settings."""
+    return _settings
+
+
+def token_endpoint_url(tenant_id: str) -> str:
+    """Get the OAuth2 v2.0 token endpoint URL for a tenant.
+    
+    Args:
+        tenant_id: Azure AD tenant ID
+        
+    Returns:
+        Token endpoint URL
+    """
+    return f"{_settings.authority_host.rstrip('/')}/{tenant_id}/oauth2/v2.0/token"
+
+
+def _http2_enabled(settings: TokenTransportSettings) -> bool:
+    """Check whether HTTP/2 is requested and the h2 package is available."""
+    if not settings.http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        console.print("[dim]HTTP/2 requested but 'h2' is not installed, using HTTP/1.1[/dim]")
+        return False
+    return True
+
+
+def _client_options(settings: TokenTransportSettings) -> dict:
+    """Build keyword arguments shared by sync and async clients."""
+    return {
+        "timeout": httpx.Timeout(settings.timeout, connect=settings.connect_timeout),
+        "limits": httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        "http2": _http2_enabled(settings),
+    }
+
+
+def get_token_http_client() -> httpx.Client:
+    """Get the shared, pooled HTTP client for token endpoint calls.
+    
+    The client keeps connections to the authority host alive so that
+    back-to-back exchanges (e.g. T1 then T2) reuse one TLS session.
+    
+    Returns:
+        Shared httpx.Client
+    """
+    global _client
+    client = _client
+    if client is not None and not client.is_closed:
+        return client
+    
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(**_client_options(_settings))
+        return _client
+
+
+def get_token_circuit_breaker() -> CircuitBreaker:
+    """Get the circuit breaker shared by all token endpoint calls."""
+    return _breaker
+
+
+def _retry_policy() -> RetryPolicy:
+    """Build the retry policy from the current settings."""
+    return RetryPolicy(
+        max_attempts=_settings.max_attempts,
+        backoff_base=_settings.backoff_base,
+        backoff_max=_settings.backoff_max,
+        max_retry_after=_settings.max_retry_after,
+    )
+
+
+def _check_circuit() -> None:
+    """Raise CircuitOpenError if the token endpoint is failing fast."""
+    if not _breaker.allow_request():
+        raise CircuitOpenError(
+            f"Token endpoint circuit open after repeated failures, "
+            f"retrying in {_breaker.retry_in():.0f}s"
+        )
+
+
+def _record_outcome(response: Optional[httpx.Response]) -> None:
+    """Record the final outcome of a request (after its retries) with the breaker.
+    
+    Throttling with a ``Retry-After`` is the endpoint pacing this client,
+    not an outage, so it neither opens nor closes the circuit.
+    """
+    if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+        _breaker.record_success()
+    elif response is not None and response.status_code == 429 and parse_retry_after(response) is not None:
+        _breaker.release_trial()
+    else:
+        _breaker.record_failure()
+
+
+def _next_delay(
+    policy: RetryPolicy,
+    attempt: int,
+    response: Optional[httpx.Response],
+) -> Optional[float]:
+    """Get the delay before the next attempt, or None (recording the outcome) if done."""
+    delay = policy.delay_for(attempt, response)
+    if delay is None:
+        _record_outcome(response)
+    else:
+        reason = f"HTTP {response.status_code}" if response is not None else "connection error"
+        console.print(f"[dim]Token endpoint returned {reason}, retrying in {delay:.1f}s...[/dim]")
+    return delay
+
+
+def post_token_request(url: str, data: dict, headers: Optional[dict] = None) -> httpx.Response:
+    """POST a token request with retries and circuit breaking.
+    
+    Throttling (429) and transient 5xx responses and connection errors are
+    retried with jittered exponential backoff, honouring ``Retry-After``.
+    While the circuit is open, requests fail immediately. The breaker counts
+    one failure per request whose retries are exhausted; a final 429 with
+    ``Retry-After`` does not count.
+    
+    Args:
+        url: Token endpoint URL
+        data: Form fields
+        headers: Request headers
+        
+    Returns:
+        Final HTTP response (may still be an error response)
+        
+    Raises:
+        CircuitOpenError: If the token endpoint circuit is open
+        httpx.TransportError: If the last attempt failed without a response
+        httpx.HTTPError: If the request failed otherwise (not retried)
+    """
+    policy = _retry_policy()
+    _check_circuit()
+    attempt = 0
+    recorded = False
+    try:
+        while True:
+            attempt += 1
+            try:
+                response = get_token_http_client().post(url, data=data, headers=headers)
+            except httpx.TransportError:
+                delay = _next_delay(policy, attempt, None)
+                if delay is None:
+                    recorded = True
+                    raise
+            else:
+                delay = _next_delay(policy, attempt, response)
+                if delay is None:
+                    return response
+            time.sleep(delay)
+    except Exception:
+        # Any other error (redirects, decoding, ...) ends the request too
+        if not recorded:
+            _breaker.record_failure()
+        raise
+    except BaseException:
+        # Cancelled: free the half-open trial without recording an outcome
+        if not recorded:
+            _breaker.release_trial()
+        raise
+
+
+def token_error_message(response: httpx.Response) -> str:
+    """Extract a readable error from a token endpoint error response.
+    
+    Falls back to the HTTP status when the body is not JSON (e.g. an HTML
+    error page from a gateway).
+    
+    Args:
+        response: Error response
+        
+    Returns:
+        Error description
+    """
+    try:
+        error = response.json()
+    except ValueError:
+        error = None
+    if isinstance(error, dict) and (error.get("error_description") or error.get("error")):
+        return error.get("error_description", error.get("error"))
+    return f"HTTP {response.status_code} {response.reason_phrase}".strip()
+
+
+def close_token_http_client() -> None:
+    """Close the shared token endpoint client and release its connections."""
+    global _client
+    with _lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+
+atexit.register(close_token_http_client)